@@ -10,13 +10,46 @@ A *position* is represented by an integer:
 
 The engine assumes *one trade at a time* (no pyramiding) and full‑balance
 allocation per trade for simplicity.
+
+Two modes produce identical results:
+    ``"vector"`` (default) → position is the forward‑filled signal series and
+                             equity / PnL are computed with array operations.
+    ``"loop"``             → the original bar‑by‑bar reference implementation.
+
+With ``effective_params`` (``leverage``, ``sl_pct``, ``tp_pct``,
+``expire_sec``) exits follow the live PositionManager instead of signal flips:
+intrabar SL / TP from bar high/low, or expiry (see :mod:`backtest.exits`).
+
+Trades are returned as a structured array with dtype :data:`TRADE_DTYPE`.
+
+``run()`` also returns a :class:`backtest.checkpoint.Checkpoint`; passing it
+to ``run(checkpoint=...)`` of an engine built over only the newer bars
+continues the same account (bar indices stay global), matching a full
+re‑run bar for bar.
 """
 from __future__ import annotations
 
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional
+import numpy as np
 import pandas as pd
 
-__all__ = ["BacktestEngine"]
+from backtest.checkpoint import Checkpoint
+from backtest.exits import EXIT_END, EXIT_SIGNAL, first_hits
+
+__all__ = ["BacktestEngine", "TRADE_DTYPE"]
+
+TRADE_DTYPE = np.dtype([
+    ("entry_idx", np.int64),
+    ("exit_idx", np.int64),
+    ("side", np.int8),
+    ("entry_price", np.float64),
+    ("exit_price", np.float64),
+    ("pnl", np.float64),
+    ("exit_type", np.int8),      # backtest.exits.EXIT_*
+])
+
+# Bars of history kept in a checkpoint when the strategy has no warmup_bars
+WARMUP_BARS = 1_000
 
 
 class BacktestEngine:  # pylint: disable=too-few-public-methods
@@ -25,6 +58,9 @@ class BacktestEngine:  # pylint: disable=too-few-public-methods
         data: pd.DataFrame,
         strategy,
         initial_balance: float = 1_000.0,
+        mode: str = "vector",
+        effective_params: Optional[Dict[str, Any]] = None,
+        timeframe: Optional[str] = None,
     ) -> None:
         """Create a new engine.
 
@@ -34,60 +70,235 @@ class BacktestEngine:  # pylint: disable=too-few-public-methods
             Must have datetime index and columns ['open', 'high', 'low', 'close', 'volume']
         strategy : BaseStrategy
             Object implementing ``generate_signals(df) -> pd.Series`` with the
-            signal convention detailed in this module docstring.
+            signal convention detailed in this module docstring. When it has
+            ``backtest_signals(df)`` (every BaseStrategy does) that is used
+            instead, so the instance's own parameters apply.
         initial_balance : float, default 1000.0
             Starting capital.
+        mode : {"vector", "loop"}, default "vector"
+            Array based engine or the bar‑by‑bar reference loop.
+        effective_params : dict, optional
+            Strategy ``effective_params``; enables SL / TP / expiry exits.
+        timeframe : str, optional
+            Bar size of ``data`` (e.g. ``"30m"``), used for ``expire_sec``.
         """
-        self.data = data.copy()
+        if mode not in ("vector", "loop"):
+            raise ValueError(f"unknown mode: {mode!r}")
+        self.data = data            # read‑only; neither mode mutates it
         self.strategy = strategy
         self.initial_balance = float(initial_balance)
+        self.mode = mode
+        self.effective_params = effective_params
+        self.timeframe = timeframe
 
     # ------------------------------------------------------------------
     # Public API
     # ------------------------------------------------------------------
-    def run(self) -> Dict[str, Any]:
-        df = self.data.copy()
-        signals: pd.Series = self.strategy.generate_signals(df).reindex(df.index)
+    def run(self, checkpoint: Optional[Checkpoint] = None) -> Dict[str, Any]:
+        """Back‑test ``data``; with ``checkpoint`` only bars after its
+        ``last_ts`` are traded, continuing that run's position and balance."""
+        st = checkpoint or Checkpoint(balance=self.initial_balance)
+        df = self.data
+        if st.last_ts is not None:
+            df = df[df.index > st.last_ts]
+            df.attrs = {}           # a slice must not reuse FRAME_MEMO entries
+        gen = getattr(self.strategy, "backtest_signals", self.strategy.generate_signals)
+        # Indicator state = the carried tail; signals of the new bars only.
+        src = pd.concat([st.tail, df]) if len(st.tail) else df
+        signals: pd.Series = gen(src).reindex(df.index)
+        if self.effective_params is not None:
+            res, end = self._run_exits(df, signals, st)
+        elif self.mode == "vector":
+            res, end = self._run_vector(df, signals, st)
+        else:
+            res, end = self._run_loop(df, signals, st)
+        res["checkpoint"] = self._checkpoint(src, st, end)
+        return res
+
+    def _checkpoint(self, src: pd.DataFrame, st: Checkpoint, end: tuple) -> Checkpoint:
+        n = len(src) - len(st.tail)
+        if n == 0:
+            return st
+        position, entry_price, entry_idx, balance = end
+        keep = getattr(self.strategy, "warmup_bars", WARMUP_BARS)
+        tail = src.iloc[-keep:].copy()
+        tail.attrs = {}
+        return Checkpoint(balance=float(balance), bars=st.bars + n, position=int(position),
+                          entry_price=float(entry_price) if position else 0.0,
+                          entry_idx=int(entry_idx) if position else -1,
+                          last_ts=src.index[-1], tail=tail)
+
+    # ------------------------------------------------------------------
+    # Vectorised engine
+    # ------------------------------------------------------------------
+    def _run_vector(self, df: pd.DataFrame, signals: pd.Series,
+                    st: Checkpoint) -> tuple:
+        price = df["close"].to_numpy(dtype=np.float64)
+        n = len(price)
+        if n == 0:
+            return self._empty(df, st)
+
+        # Position after each bar: NaN keeps the previous state, otherwise
+        # the signal itself is the new state (+1/0/−1 convention).
+        sig = signals.to_numpy(dtype=np.float64)
+        pos = pd.Series(sig).ffill().fillna(float(st.position)).to_numpy().astype(np.int8)
+
+        prev = np.empty_like(pos)
+        prev[0], prev[1:] = st.position, pos[:-1]
+        change = np.flatnonzero(pos != prev)
+        entries = change[pos[change] != 0]
+        exits = change[prev[change] != 0]
+
+        # Every exit closes the most recent entry; an open position is
+        # liquidated at the last close. A position carried in from a
+        # checkpoint is the first "entry".
+        open_end = pos[-1] != 0
+        exit_idx = np.append(exits, n - 1) if open_end else exits
+        side = pos[entries]
+        entry_price = price[entries]
+        entry_idx = entries + st.bars
+        if st.position:
+            side = np.r_[np.int8(st.position), side]
+            entry_price = np.r_[st.entry_price, entry_price]
+            entry_idx = np.r_[st.entry_idx, entry_idx]
+        exit_price = price[exit_idx]
+        pnl = np.where(side == 1, exit_price - entry_price, entry_price - exit_price)
+
+        trades = np.empty(len(side), dtype=TRADE_DTYPE)
+        trades["entry_idx"] = entry_idx
+        trades["exit_idx"] = exit_idx + st.bars
+        trades["side"] = side
+        trades["entry_price"] = entry_price
+        trades["exit_price"] = exit_price
+        trades["pnl"] = pnl
+        trades["exit_type"] = EXIT_SIGNAL
+        if open_end:
+            trades["exit_type"][-1] = EXIT_END
+
+        # Running balance in the same summation order as the loop engine.
+        balances = np.cumsum(np.concatenate(([st.balance], pnl)))
+        closed = np.searchsorted(exits, np.arange(n), side="right")
+        balance = balances[closed]
+
+        # Entry price carried forward over each holding period.
+        held = np.full(n, np.nan)
+        held[entries] = price[entries]
+        held = pd.Series(held).ffill().fillna(st.entry_price).to_numpy()
+        equity = np.where(pos == 1, balance + (price - held),
+                          np.where(pos == -1, balance + (held - price), balance))
+        end = (pos[-1], held[-1], entry_idx[-1] if open_end else -1,
+               balances[-2] if open_end else balances[-1])
+        if open_end:
+            equity[-1] = balances[-1]
+        return self._result(df, equity, trades, float(balances[-1])), end
+
+    # ------------------------------------------------------------------
+    # SL / TP / expiry exits
+    # ------------------------------------------------------------------
+    def _run_exits(self, df: pd.DataFrame, signals: pd.Series,
+                   st: Checkpoint) -> tuple:
+        o, h, l, price = (df[k].to_numpy(dtype=np.float64)
+                          for k in ("open", "high", "low", "close"))
+        n = len(price)
+        if n == 0:
+            return self._empty(df, st)
+        # A carried position has a negative local entry index, so its
+        # expiry still counts from the original entry bar.
+        carry = ((st.entry_idx - st.bars, st.position, st.entry_price)
+                 if st.position else None)
+        hits = first_hits(o, h, l, price, signals.to_numpy(dtype=np.float64),
+                          self.effective_params, self.timeframe, carry=carry)
+        entries, exits, side = hits["entry_idx"], hits["exit_idx"], hits["side"]
+        entry_price, exit_price = hits["entry_price"], hits["exit_price"]
+        pnl = np.where(side == 1, exit_price - entry_price, entry_price - exit_price)
+
+        trades = np.empty(len(entries), dtype=TRADE_DTYPE)
+        for name, arr in hits.items():
+            trades[name] = arr
+        trades["pnl"] = pnl
+        trades["entry_idx"] += st.bars
+        trades["exit_idx"] += st.bars
+
+        balances = np.cumsum(np.concatenate(([st.balance], pnl)))
+        balance = balances[np.searchsorted(exits, np.arange(n), side="right")]
+
+        # Held from the entry bar up to (excluding) the exit bar; a trade
+        # still open on the last bar is closed there (EXIT_END).
+        start = np.maximum(entries, 0)
+        step = np.zeros(n + 1, dtype=np.int64)
+        np.add.at(step, start, side)
+        np.add.at(step, exits, -side)
+        pos = np.cumsum(step[:n])
+        held = np.full(n, np.nan)
+        held[start] = entry_price
+        held = pd.Series(held).ffill().to_numpy()
+        equity = np.where(pos == 1, balance + (price - held),
+                          np.where(pos == -1, balance + (held - price), balance))
+
+        open_end = len(trades) and trades["exit_type"][-1] == EXIT_END
+        if open_end:
+            end = (side[-1], entry_price[-1], trades["entry_idx"][-1], balances[-2])
+        else:
+            end = (0, 0.0, -1, balances[-1])
+        return self._result(df, equity, trades, float(balances[-1])), end
 
-        balance: float = self.initial_balance
-        position: int = 0          # +1 long, −1 short, 0 flat
-        entry_price: float | None = None
+    def _empty(self, df, st: Checkpoint) -> tuple:
+        res = self._result(df, [], np.empty(0, dtype=TRADE_DTYPE), st.balance)
+        return res, (st.position, st.entry_price, st.entry_idx, st.balance)
+
+    def _result(self, df, equity, trades, balance) -> Dict[str, Any]:
+        return {
+            "equity_curve": pd.Series(equity, index=df.index, name="equity", dtype=float),
+            "trades": trades,
+            "final_balance": balance,
+        }
+
+    # ------------------------------------------------------------------
+    # Reference loop engine
+    # ------------------------------------------------------------------
+    def _run_loop(self, df: pd.DataFrame, signals: pd.Series,
+                  st: Checkpoint) -> tuple:
+
+        balance: float = st.balance
+        position: int = st.position          # +1 long, −1 short, 0 flat
+        entry_price: float | None = st.entry_price if position else None
 
         equity_curve: List[float] = []
-        trades: List[float] = []   # realised PnL per trade
+        trades: List[tuple] = []   # TRADE_DTYPE rows
+        entry_idx: int = st.entry_idx
 
-        for ts, price in df["close"].items():
-            sig = signals.loc[ts]
+        for i, (price, sig) in enumerate(zip(df["close"].to_numpy(dtype=np.float64),
+                                             signals.to_numpy()), start=st.bars):
 
             # --- Position management -----------------------------------
             if position == 0:
                 if sig == 1:  # open long
                     position = 1
-                    entry_price = price
+                    entry_price, entry_idx = price, i
                 elif sig == -1:  # open short
                     position = -1
-                    entry_price = price
+                    entry_price, entry_idx = price, i
             elif position == 1:  # currently long
                 if sig <= 0:  # close long (sig 0 or -1)
                     pnl = price - entry_price  # long profit
                     balance += pnl
-                    trades.append(pnl)
+                    trades.append((entry_idx, i, 1, entry_price, price, pnl, EXIT_SIGNAL))
                     position = 0
                     entry_price = None
                     # If signal == -1, open new short on next iteration
                     if sig == -1:
                         position = -1
-                        entry_price = price
+                        entry_price, entry_idx = price, i
             elif position == -1:  # currently short
                 if sig >= 0:  # close short (sig 0 or +1)
                     pnl = entry_price - price  # short profit
                     balance += pnl
-                    trades.append(pnl)
+                    trades.append((entry_idx, i, -1, entry_price, price, pnl, EXIT_SIGNAL))
                     position = 0
                     entry_price = None
                     if sig == 1:  # open new long immediately
                         position = 1
-                        entry_price = price
+                        entry_price, entry_idx = price, i
 
             # --- Equity curve -----------------------------------------
             if position == 1:  # unrealised long
@@ -97,18 +308,18 @@ class BacktestEngine:  # pylint: disable=too-few-public-methods
             else:
                 equity_curve.append(balance)
 
+        end = (position, entry_price, entry_idx, balance)
+
         # ------------------------------------------------------------------
         # Liquidate any open position at the last close price
         # ------------------------------------------------------------------
-        if position != 0 and entry_price is not None:
-            final_price = df["close"].iloc[-1]
+        if position != 0 and entry_price is not None and len(df):
+            final_price = float(df["close"].iloc[-1])
             pnl = (final_price - entry_price) if position == 1 else (entry_price - final_price)
             balance += pnl
-            trades.append(pnl)
+            trades.append((entry_idx, st.bars + len(df) - 1, position, entry_price,
+                           final_price, pnl, EXIT_END))
             equity_curve[-1] = balance
 
-        return {
-            "equity_curve": pd.Series(equity_curve, index=df.index, name="equity"),
-            "trades": trades,
-            "final_balance": balance,
-        }
+        return self._result(df, equity_curve, np.array(trades, dtype=TRADE_DTYPE),
+                            float(balance)), end
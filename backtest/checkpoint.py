@@ -0,0 +1,59 @@
+"""End‑of‑run state of :class:`BacktestEngine` for append‑only continuation.
+
+A run over bars ``[0, n)`` returns ``result["checkpoint"]``; a later run over
+only the bars after ``last_ts`` that is given this checkpoint continues the
+same account and yields exactly what a full re‑run over ``[0, n + m)``
+would have produced for the new bars.
+
+What is carried:
+    * the open position (side, entry price, global entry bar) *before* the
+      end‑of‑data liquidation, which is reported but not committed
+    * the realised balance
+    * a tail of the last ``warmup_bars`` OHLCV rows – the indicator state.
+      Signals are causal, so recomputing them over ``tail + new bars`` gives
+      the full‑history values once the recursions (EMA, Wilder) have
+      forgotten their seed; ``BaseStrategy.warmup_bars`` sets the length.
+
+    res = BacktestEngine(df_until_yesterday, strat).run()
+    save_checkpoint(res["checkpoint"], "ckpt/BTCUSDT_1h.pkl")
+    ...
+    ckpt = load_checkpoint("ckpt/BTCUSDT_1h.pkl")
+    res = BacktestEngine(todays_bars, strat).run(checkpoint=ckpt)
+"""
+from __future__ import annotations
+
+import os
+import pickle
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Optional
+
+import pandas as pd
+
+__all__ = ["Checkpoint", "save_checkpoint", "load_checkpoint"]
+
+
+@dataclass
+class Checkpoint:
+    balance: float                   # realised balance (open position not closed)
+    bars: int = 0                    # bars consumed so far = global index offset
+    position: int = 0                # +1 / −1 / 0
+    entry_price: float = 0.0
+    entry_idx: int = -1              # global bar index of the open entry
+    last_ts: Optional[pd.Timestamp] = None
+    tail: pd.DataFrame = field(default_factory=pd.DataFrame)
+
+
+def save_checkpoint(ckpt: Checkpoint, path) -> None:
+    """Atomic write: a crash leaves either the old or the new file."""
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_suffix(path.suffix + ".tmp")
+    with open(tmp, "wb") as f:
+        pickle.dump(ckpt, f, protocol=pickle.HIGHEST_PROTOCOL)
+    os.replace(tmp, path)
+
+
+def load_checkpoint(path) -> Checkpoint:
+    with open(path, "rb") as f:
+        return pickle.load(f)
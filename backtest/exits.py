@@ -0,0 +1,217 @@
+"""Intrabar SL / TP / expiry exit simulation.
+
+Mirrors how :class:`live.position_manager.PositionManager` exits a position:
+a stop‑market and a take‑profit order derived from ``sl_pct`` / ``tp_pct`` /
+``leverage`` plus a holding time limit ``expire_sec``.
+
+Rules (per trade):
+    * entry at the close of the signal bar; scanning starts on the next bar
+    * SL at ``entry * (1 ∓ sl_pct / leverage / 100)``, TP at
+      ``entry * (1 ± tp_pct / leverage / 100)`` (same formula as live)
+    * a bar whose low/high touches a barrier exits there; if the bar opens
+      beyond the barrier (gap) the fill is the open
+    * SL and TP inside the same bar → SL (the conservative assumption)
+    * expiry: the first bar close at least ``expire_sec`` after entry
+    * while a position is open further signals are ignored, as in live where
+      ``open_position`` refuses a second position per (symbol, strategy)
+
+The first‑hit search runs as one compiled loop over all trades (numba when
+available, see :mod:`utils.kernels`). Without numba, :func:`_scan_blocks`
+keeps only the per‑trade step in Python and finds each first hit with
+array ops over growing bar blocks, so the cost is one Python iteration per
+trade plus vectorized work proportional to the holding time.
+"""
+from __future__ import annotations
+
+import math
+from typing import Any, Dict, Optional
+
+import numpy as np
+
+from utils.kernels import HAVE_NUMBA, njit
+from utils.timeframes import TF_SEC
+
+__all__ = ["EXIT_SIGNAL", "EXIT_SL", "EXIT_TP", "EXIT_EXPIRE", "EXIT_END",
+           "EXIT_NAMES", "barrier_frac", "barrier_prices", "expire_bars", "first_hits"]
+
+EXIT_SIGNAL, EXIT_SL, EXIT_TP, EXIT_EXPIRE, EXIT_END = 0, 1, 2, 3, 4
+EXIT_NAMES = {EXIT_SIGNAL: "SIGNAL", EXIT_SL: "SL", EXIT_TP: "TP",
+              EXIT_EXPIRE: "EXPIRE", EXIT_END: "END"}
+
+
+def barrier_frac(pct, leverage) -> float:
+    """Price distance as a fraction of entry; NaN disables the barrier."""
+    if not pct:
+        return math.nan
+    return pct / leverage / 100
+
+
+def barrier_prices(entry, side, leverage, sl_pct, tp_pct):
+    """(sl, tp) for entry price(s) and side(s) (+1 long, −1 short)."""
+    sl_f, tp_f = barrier_frac(sl_pct, leverage), barrier_frac(tp_pct, leverage)
+    entry = np.asarray(entry, dtype=np.float64)
+    long_ = np.asarray(side) == 1
+    sl = np.where(long_, entry * (1 - sl_f), entry * (1 + sl_f))
+    tp = np.where(long_, entry * (1 + tp_f), entry * (1 - tp_f))
+    return sl, tp
+
+
+def expire_bars(expire_sec, timeframe: Optional[str]) -> int:
+    """Bars until expiry (0 = never); live checks expiry on bar close."""
+    if not expire_sec or timeframe is None:
+        return 0
+    return max(1, math.ceil(expire_sec / TF_SEC[timeframe]))
+
+
+@njit(cache=True)
+def _scan(o, h, l, c, sig_idx, sig_side, sig_px, sl_f, tp_f, max_bars,
+          entry_idx, exit_idx, side, entry_px, exit_px, kind):
+    n = len(c)
+    k = 0
+    # first bar a new entry may use; a carried entry (continuation) is < 0
+    free = sig_idx[0] if len(sig_idx) > 0 else 0
+    for s in range(len(sig_idx)):
+        i = sig_idx[s]
+        if i < free:
+            continue
+        d = sig_side[s]
+        e = sig_px[s]
+        if d == 1:
+            sl = e * (1 - sl_f)
+            tp = e * (1 + tp_f)
+        else:
+            sl = e * (1 + sl_f)
+            tp = e * (1 - tp_f)
+        last = n - 1
+        if max_bars > 0 and i + max_bars < last:
+            last = i + max_bars
+        xi = last
+        x = c[last]
+        typ = EXIT_END
+        if max_bars > 0 and last == i + max_bars:
+            typ = EXIT_EXPIRE
+        for t in range(max(i + 1, 0), last + 1):
+            if d == 1:
+                if l[t] <= sl:
+                    xi, typ = t, EXIT_SL
+                    x = o[t] if o[t] < sl else sl
+                    break
+                if h[t] >= tp:
+                    xi, typ = t, EXIT_TP
+                    x = o[t] if o[t] > tp else tp
+                    break
+            else:
+                if h[t] >= sl:
+                    xi, typ = t, EXIT_SL
+                    x = o[t] if o[t] > sl else sl
+                    break
+                if l[t] <= tp:
+                    xi, typ = t, EXIT_TP
+                    x = o[t] if o[t] < tp else tp
+                    break
+        entry_idx[k] = i
+        exit_idx[k] = xi
+        side[k] = d
+        entry_px[k] = e
+        exit_px[k] = x
+        kind[k] = typ
+        k += 1
+        free = xi + 1
+    return k
+
+
+def _scan_blocks(o, h, l, c, sig_idx, sig_side, sig_px, sl_f, tp_f, max_bars,
+                 entry_idx, exit_idx, side, entry_px, exit_px, kind, block=64):
+    """:func:`_scan` without numba; same arguments and results.
+
+    Trades stay sequential (an open position blocks new entries), but the
+    bars of a trade are tested a block at a time: the barrier masks over
+    ``block`` bars, ``argmax`` for the first touch, then a block twice as
+    large. Signals inside a trade are skipped with one ``searchsorted``.
+    """
+    n, m = len(c), len(sig_idx)
+    k = s = 0
+    while s < m:
+        i, d, e = int(sig_idx[s]), int(sig_side[s]), float(sig_px[s])
+        if d == 1:
+            sl, tp = e * (1 - sl_f), e * (1 + tp_f)
+        else:
+            sl, tp = e * (1 + sl_f), e * (1 - tp_f)
+        last = n - 1
+        if max_bars > 0 and i + max_bars < last:
+            last = i + max_bars
+        xi, x = last, c[last]
+        typ = EXIT_EXPIRE if max_bars > 0 and last == i + max_bars else EXIT_END
+        lo, size = max(i + 1, 0), block
+        while lo <= last:
+            hi = min(lo + size, last + 1)
+            if d == 1:
+                sl_hit, tp_hit = l[lo:hi] <= sl, h[lo:hi] >= tp
+            else:
+                sl_hit, tp_hit = h[lo:hi] >= sl, l[lo:hi] <= tp
+            hit = sl_hit | tp_hit
+            if hit.any():
+                j = int(hit.argmax())
+                xi = lo + j
+                if sl_hit[j]:                        # same bar → SL first
+                    typ = EXIT_SL
+                    x = min(o[xi], sl) if d == 1 else max(o[xi], sl)
+                else:
+                    typ = EXIT_TP
+                    x = max(o[xi], tp) if d == 1 else min(o[xi], tp)
+                break
+            lo, size = hi, size * 2
+        entry_idx[k], exit_idx[k], side[k] = i, xi, d
+        entry_px[k], exit_px[k], kind[k] = e, x, typ
+        k += 1
+        s = int(np.searchsorted(sig_idx, xi + 1))
+    return k
+
+
+def first_hits(o, h, l, c, signals, effective_params: Dict[str, Any],
+               timeframe: Optional[str] = None, carry: Optional[tuple] = None,
+               ) -> Dict[str, np.ndarray]:
+    """Simulate entries on non‑zero signals and their first SL/TP/expiry exit.
+
+    Parameters
+    ----------
+    o, h, l, c : array‑like
+        Bar prices.
+    signals : array‑like
+        +1 / −1 opens a position when flat; 0 / NaN does nothing.
+    effective_params : dict
+        ``leverage``, ``sl_pct``, ``tp_pct``, ``expire_sec`` as produced by
+        ``ConfigLoader.get_strategies``.
+    timeframe : str, optional
+        Bar size, needed to turn ``expire_sec`` into bars.
+    carry : (entry_idx, side, entry_price), optional
+        A position still open from an earlier run (checkpoint continuation);
+        ``entry_idx`` is negative, relative to the first bar given here.
+
+    Returns
+    -------
+    dict of equal length arrays: entry_idx, exit_idx, side, entry_price,
+    exit_price, exit_type.
+    """
+    o, h, l, c = (np.ascontiguousarray(a, dtype=np.float64) for a in (o, h, l, c))
+    sig = np.nan_to_num(np.asarray(signals, dtype=np.float64))
+    sig_idx = np.flatnonzero(sig).astype(np.int64)
+    sig_side = np.sign(sig[sig_idx]).astype(np.int64)
+    sig_px = c[sig_idx]
+    if carry is not None:
+        sig_idx = np.r_[np.int64(carry[0]), sig_idx]
+        sig_side = np.r_[np.int64(carry[1]), sig_side]
+        sig_px = np.r_[float(carry[2]), sig_px]
+
+    lev = effective_params.get("leverage") or 1
+    sl_f = barrier_frac(effective_params.get("sl_pct"), lev)
+    tp_f = barrier_frac(effective_params.get("tp_pct"), lev)
+    max_bars = expire_bars(effective_params.get("expire_sec"), timeframe)
+
+    m = len(sig_idx)
+    out = {"entry_idx": np.empty(m, np.int64), "exit_idx": np.empty(m, np.int64),
+           "side": np.empty(m, np.int64), "entry_price": np.empty(m),
+           "exit_price": np.empty(m), "exit_type": np.empty(m, np.int64)}
+    args = (sig_idx, sig_side, sig_px, sl_f, tp_f, max_bars, *out.values())
+    k = (_scan if HAVE_NUMBA else _scan_blocks)(o, h, l, c, *args)
+    return {name: arr[:k] for name, arr in out.items()}
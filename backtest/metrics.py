@@ -1,23 +1,52 @@
 # backtest/metrics.py
+import warnings
+
 import numpy as np
 import pandas as pd
 
-def sharpe_ratio(equity_curve, risk_free_rate=0.0):
+from utils.timeframes import TF_SEC
+
+# Yıllıklaştırma: timeframe verilmezse eski varsayılan (günlük, 252 işlem günü)
+DEFAULT_PERIODS = 252
+
+
+def periods_per_year(timeframe=None):
+    """
+    Yılda kaç bar: kripto 7/24 işlem gördüğü için 365 gün üzerinden
+    (ör. "1h" → 8760). timeframe None ise DEFAULT_PERIODS.
+    """
+    if timeframe is None:
+        return DEFAULT_PERIODS
+    return 365 * 86_400 / TF_SEC[timeframe]
+
+
+def trade_pnl(trades):
+    """
+    İşlem PnL listesi: BacktestEngine’in yapısal dizisi (TRADE_DTYPE) veya
+    düz PnL listesi kabul edilir.
+    """
+    if isinstance(trades, np.ndarray) and trades.dtype.names:
+        return trades["pnl"].tolist()
+    return list(trades)
+
+def sharpe_ratio(equity_curve, risk_free_rate=0.0, periods=DEFAULT_PERIODS):
     """
-    Equity curve'in (zaman serisi bakiye) günlük getirilerinden Sharpe oranını hesaplar.
+    Equity curve'in (zaman serisi bakiye) bar getirilerinden Sharpe oranını hesaplar.
     risk_free_rate: yıllık risksiz getiri (varsayılan 0 kabul ediliyor).
+    periods: yılda bar sayısı, bkz. periods_per_year.
     """
     returns = equity_curve.pct_change().dropna()
-    excess_returns = returns - (risk_free_rate/252)  # Günlük riskfreesiz
+    excess_returns = returns - (risk_free_rate/periods)  # Bar başına riskfreesiz
     if excess_returns.std() == 0:
         return np.nan
-    sharpe = np.sqrt(252) * (excess_returns.mean() / excess_returns.std())
+    sharpe = np.sqrt(periods) * (excess_returns.mean() / excess_returns.std())
     return sharpe
 
-def sortino_ratio(equity_curve, target=0.0):
+def sortino_ratio(equity_curve, target=0.0, periods=DEFAULT_PERIODS):
     """
     Sortino oranı hesaplar (ayrıca riski hedef altında kalma olarak alır).
     target: Hedef getiri (varsayılan 0).
+    periods: yılda bar sayısı, bkz. periods_per_year.
     """
     returns = equity_curve.pct_change().dropna()
     downside_returns = returns[returns < target]
@@ -27,7 +56,7 @@ def sortino_ratio(equity_curve, target=0.0):
     sigma_down = downside_returns.std()
     if sigma_down == 0:
         return np.nan
-    sortino = np.sqrt(252) * ((returns.mean() - target) / sigma_down)
+    sortino = np.sqrt(periods) * ((returns.mean() - target) / sigma_down)
     return sortino
 
 def max_drawdown(equity_curve):
@@ -43,6 +72,7 @@ def profit_factor(trades):
     """
     Profit Factor: kazançlı işlemlerin toplamı / zararlı işlemlerin toplamı (pozitif değerle)
     """
+    trades = trade_pnl(trades)
     if len(trades) == 0:
         return np.nan
     wins = [t for t in trades if t > 0]
@@ -56,6 +86,7 @@ def expectancy(trades):
     """
     Expectancy: Ortalama işlem getirisi * kazanma oranı - zarar oranı * ortalama zarar.
     """
+    trades = trade_pnl(trades)
     n = len(trades)
     if n == 0:
         return 0
@@ -68,16 +99,131 @@ def expectancy(trades):
     exp = (win_rate * avg_win) - (loss_rate * avg_loss)
     return exp
 
-def calculate_metrics(equity_series, trades):
+def calculate_metrics(equity_series, trades, timeframe=None):
     """
     Tüm metrikleri hesaplayıp bir sözlükte döndürür.
+    timeframe verilirse Sharpe / Sortino o bar boyuna göre yıllıklaştırılır.
     """
+    periods = periods_per_year(timeframe)
     metrics = {
-        'Sharpe': sharpe_ratio(equity_series),
-        'Sortino': sortino_ratio(equity_series),
+        'Sharpe': sharpe_ratio(equity_series, periods=periods),
+        'Sortino': sortino_ratio(equity_series, periods=periods),
         'MaxDrawdown': max_drawdown(equity_series),
         'ProfitFactor': profit_factor(trades),
         'Expectancy': expectancy(trades),
         'TotalProfit': equity_series.iloc[-1] - equity_series.iloc[0]
     }
     return metrics
+
+
+# ---------------------------------------------------------------------------
+# Toplu (batch) metrikler — parametre taramaları için
+# ---------------------------------------------------------------------------
+# equity: (eğri × zaman) matrisi; farklı uzunluktaki eğriler sonda NaN ile
+# doldurulabilir. İşlemler düzensiz (ragged) dizi: (düz PnL, ofsetler) ikilisi
+# ya da eğri başına bir işlem dizisi listesi. Sonuçlar tekil fonksiyonlarla
+# aynıdır (kayan nokta toplama sırası farkı dışında).
+
+def ragged(trades):
+    """
+    Eğri başına işlem listelerini (düz PnL, ofsetler) biçimine çevirir;
+    i. eğrinin PnL’leri pnl[offsets[i]:offsets[i + 1]].
+    """
+    if isinstance(trades, tuple):
+        pnl, offsets = trades
+        return np.asarray(pnl, dtype=np.float64), np.asarray(offsets, dtype=np.int64)
+    parts = [np.asarray(trade_pnl(t), dtype=np.float64) for t in trades]
+    offsets = np.zeros(len(parts) + 1, dtype=np.int64)
+    offsets[1:] = np.cumsum([len(p) for p in parts])
+    pnl = np.concatenate(parts) if parts else np.empty(0)
+    return pnl, offsets
+
+
+def _returns(equity):
+    equity = np.asarray(equity, dtype=np.float64)
+    return equity[:, 1:] / equity[:, :-1] - 1.0
+
+
+def _nanstd(x, axis=1):
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore", RuntimeWarning)
+        return np.nanstd(x, axis=axis, ddof=1)
+
+
+def sharpe_ratio_batch(equity, risk_free_rate=0.0, periods=DEFAULT_PERIODS):
+    """Her satır (eğri) için sharpe_ratio."""
+    excess = _returns(equity) - risk_free_rate / periods
+    sd = _nanstd(excess)
+    with np.errstate(invalid="ignore", divide="ignore"), warnings.catch_warnings():
+        warnings.simplefilter("ignore", RuntimeWarning)
+        out = np.sqrt(periods) * np.nanmean(excess, axis=1) / sd
+    return np.where(sd == 0, np.nan, out)
+
+
+def sortino_ratio_batch(equity, target=0.0, periods=DEFAULT_PERIODS):
+    """Her satır için sortino_ratio; aşağı yön oynaklığı maskeli std."""
+    r = _returns(equity)
+    down = np.where(r < target, r, np.nan)
+    sd = _nanstd(down)
+    with np.errstate(invalid="ignore", divide="ignore"), warnings.catch_warnings():
+        warnings.simplefilter("ignore", RuntimeWarning)
+        out = np.sqrt(periods) * (np.nanmean(r, axis=1) - target) / sd
+    return np.where(sd == 0, np.nan, out)
+
+
+def max_drawdown_batch(equity):
+    """Her satır için max_drawdown (NaN dolgu yok sayılır)."""
+    equity = np.asarray(equity, dtype=np.float64)
+    peak = np.fmax.accumulate(equity, axis=1)
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore", RuntimeWarning)
+        return np.abs(np.nanmin((equity - peak) / peak, axis=1))
+
+
+def _segment_sums(pnl, offsets):
+    m = len(offsets) - 1
+    seg = np.repeat(np.arange(m), np.diff(offsets))
+    wins = np.bincount(seg, weights=np.where(pnl > 0, pnl, 0.0), minlength=m)
+    losses = np.bincount(seg, weights=np.where(pnl < 0, -pnl, 0.0), minlength=m)
+    return wins, losses, np.diff(offsets)
+
+
+def profit_factor_batch(trades):
+    """Her eğri için profit_factor; trades ragged() girdisi."""
+    wins, losses, n = _segment_sums(*ragged(trades))
+    with np.errstate(invalid="ignore", divide="ignore"):
+        return np.where((n == 0) | (losses == 0), np.nan, wins / losses)
+
+
+def expectancy_batch(trades):
+    """
+    Her eğri için expectancy. win_rate·avg_win − loss_rate·avg_loss
+    = (Σkazanç − Σ|zarar|) / n, yani işlem başına ortalama PnL.
+    """
+    wins, losses, n = _segment_sums(*ragged(trades))
+    with np.errstate(invalid="ignore", divide="ignore"):
+        return np.where(n == 0, 0.0, (wins - losses) / n)
+
+
+def calculate_metrics_batch(equity, trades, timeframe=None, periods=None):
+    """
+    calculate_metrics’in matris sürümü: (eğri × zaman) equity ve ragged
+    işlemler → anahtar başına eğri sayısı uzunluğunda dizi.
+        pd.DataFrame(calculate_metrics_batch(E, trades, "1h"))
+    periods verilirse timeframe yerine o kullanılır (ör. işlem sıralı
+    eğrilerde periods=1 → yıllıklaştırılmamış, işlem başına oran).
+    """
+    equity = np.atleast_2d(np.asarray(equity, dtype=np.float64))
+    periods = periods_per_year(timeframe) if periods is None else periods
+    valid = ~np.isnan(equity)
+    first = np.argmax(valid, axis=1)
+    last = equity.shape[1] - 1 - np.argmax(valid[:, ::-1], axis=1)
+    rows = np.arange(len(equity))
+    return {
+        'Sharpe': sharpe_ratio_batch(equity, periods=periods),
+        'Sortino': sortino_ratio_batch(equity, periods=periods),
+        'MaxDrawdown': max_drawdown_batch(equity),
+        'ProfitFactor': profit_factor_batch(trades),
+        'Expectancy': expectancy_batch(trades),
+        'TotalProfit': equity[rows, last] - equity[rows, first],
+    }
@@ -0,0 +1,128 @@
+"""Monte Carlo robustness check on a back‑test's trade list.
+
+Resamples the trade PnLs of :meth:`BacktestEngine.run` into thousands of
+alternative equity paths at once and reports percentile bands for the path
+itself and for every :func:`backtest.metrics.calculate_metrics_batch` key.
+
+Methods:
+    ``"bootstrap"`` → trades drawn with replacement (same count per path);
+                      final balance and drawdown both vary
+    ``"shuffle"``   → the same trades in random order; final balance is
+                      fixed, only the path (drawdown) varies
+
+Paths are built as one ``(n_paths × n_trades)`` index draw plus a cumulative
+sum, in chunks of ``chunk`` paths. Each chunk is scored and reduced to its
+metric rows, final balances and percentile bands before the next one is
+drawn, so memory is bounded by ``chunk`` unless ``keep_paths`` is set. The
+reported bands are the path‑weighted mean of the per‑chunk percentiles
+(exact when ``chunk >= n_paths``).
+
+Paths are indexed by trade, not by bar, so Sharpe / Sortino are per‑trade
+ratios (``periods=1``), not annualized.
+
+    mc = monte_carlo(res["trades"], n_paths=10_000, seed=0)
+    mc["metrics"]          # percentile × metric, e.g. 95th MaxDrawdown
+    mc["bands"]            # percentile × trade number equity bands
+"""
+from __future__ import annotations
+
+from typing import Any, Dict, Optional, Sequence
+
+import numpy as np
+import pandas as pd
+
+from backtest.metrics import trade_pnl, calculate_metrics_batch
+
+__all__ = ["resample_paths", "monte_carlo"]
+
+PERCENTILES = (5, 25, 50, 75, 95)
+
+
+def resample_paths(pnl, n_paths: int, *, method: str = "bootstrap",
+                   initial_balance: float = 1_000.0,
+                   rng: Optional[np.random.Generator] = None) -> np.ndarray:
+    """
+    ``(n_paths × (n_trades + 1))`` equity matrix; column 0 is the initial
+    balance, column ``j`` the balance after ``j`` resampled trades.
+    """
+    pnl = np.asarray(pnl, dtype=np.float64)
+    rng = rng or np.random.default_rng()
+    k = len(pnl)
+    if method == "bootstrap":
+        draws = pnl[rng.integers(0, k, size=(n_paths, k))] if k else np.empty((n_paths, 0))
+    elif method == "shuffle":
+        draws = rng.permuted(np.tile(pnl, (n_paths, 1)), axis=1)
+    else:
+        raise ValueError(f"unknown method: {method!r}")
+    paths = np.empty((n_paths, k + 1))
+    paths[:, 0] = initial_balance
+    np.cumsum(draws, axis=1, out=paths[:, 1:])
+    paths[:, 1:] += initial_balance
+    return paths
+
+
+def monte_carlo(
+    trades,
+    n_paths: int = 10_000,
+    *,
+    method: str = "bootstrap",
+    initial_balance: float = 1_000.0,
+    percentiles: Sequence[float] = PERCENTILES,
+    seed: Optional[int] = None,
+    chunk: int = 2_000,
+    keep_paths: bool = False,
+) -> Dict[str, Any]:
+    """
+    Parameters
+    ----------
+    trades : structured array or sequence of float
+        ``TRADE_DTYPE`` trades (their ``pnl``) or plain PnLs.
+    n_paths : int
+        Number of resampled paths.
+    percentiles : sequence of float
+        Band levels reported for the path and the metrics.
+    chunk : int
+        Paths generated, scored and reduced per step; only one chunk of
+        paths is alive at a time.
+    keep_paths : bool
+        Also return the full path matrix (``n_paths × (n_trades + 1)``
+        floats; the only option that holds every path).
+
+    Returns
+    -------
+    dict with ``metrics`` (percentile × metric DataFrame), ``bands``
+    (percentile × trade number DataFrame), ``final_balance`` (per path),
+    ``prob_loss`` (share of paths ending below ``initial_balance``) and
+    optionally ``paths``.
+    """
+    pnl = np.asarray(trade_pnl(trades), dtype=np.float64)
+    rng = np.random.default_rng(seed)
+    k = len(pnl)
+    q = np.asarray(percentiles, dtype=np.float64)
+
+    metrics, finals, kept = [], [], []
+    bands = np.zeros((len(q), k + 1))
+    for start in range(0, n_paths, chunk):
+        paths = resample_paths(pnl, min(chunk, n_paths - start), method=method,
+                               initial_balance=initial_balance, rng=rng)
+        m = len(paths)
+        # resampled trades are the path increments: equal length → flat offsets
+        trades_ragged = (np.diff(paths, axis=1).ravel(), np.arange(m + 1) * k)
+        metrics.append(pd.DataFrame(calculate_metrics_batch(paths, trades_ragged, periods=1)))
+        bands += np.percentile(paths, q, axis=0) * (m / n_paths)
+        finals.append(paths[:, -1].copy())
+        if keep_paths:
+            kept.append(paths)
+    table = pd.concat(metrics, ignore_index=True)
+    final = np.concatenate(finals)
+
+    out = {
+        "metrics": table.quantile(q / 100).set_axis(q).rename_axis("percentile"),
+        "bands": pd.DataFrame(bands, index=q,
+                              columns=pd.RangeIndex(k + 1, name="trade")).rename_axis("percentile"),
+        "final_balance": final,
+        "prob_loss": float(np.mean(final < initial_balance)),
+    }
+    if keep_paths:
+        out["paths"] = np.concatenate(kept)
+    return out
@@ -0,0 +1,158 @@
+"""Parallel parameter sweep (grid / random search) over one OHLCV series.
+
+The series is copied into shared memory once (:class:`SharedFrame`); each
+pool task carries only the block spec plus a chunk of parameter
+combinations. Combinations are ordered so that chunks share leading
+parameters (typically the indicator periods), and strategies compute
+indicators through :data:`utils.indicator_cache.FRAME_MEMO`, so e.g. one RSI
+series per period is computed per worker process no matter how many
+threshold combinations use it.
+
+    table = optimize(df, "volume_rsi_spike", "1h",
+                     {"rsi_period": [10, 14], "buy_low_th": [28, 32]},
+                     effective_params={"leverage": 4, "sl_pct": 6, ...})
+    table.head()          # ranked by Sharpe
+
+Results stream through :func:`iter_sweep` as chunks finish.
+"""
+from __future__ import annotations
+
+import itertools
+import math
+import os
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from typing import Any, Callable, Dict, Iterator, List, Optional
+
+import numpy as np
+import pandas as pd
+
+from backtest.shared_frame import SharedFrame
+from backtest.worker import BacktestTask, run_backtest_chunk
+
+__all__ = ["grid_space", "random_space", "chunk_combos", "iter_sweep", "optimize",
+           "rank", "LOWER_IS_BETTER"]
+
+# calculate_metrics keys where lower is better
+LOWER_IS_BETTER = {"MaxDrawdown"}
+
+
+def grid_space(space: Dict[str, Any]) -> List[dict]:
+    """Cartesian product; scalars are fixed values, lists are swept."""
+    keys = list(space)
+    values = [v if isinstance(v, (list, tuple)) else [v] for v in space.values()]
+    return [dict(zip(keys, combo)) for combo in itertools.product(*values)]
+
+
+def random_space(space: Dict[str, Any], n_iter: int, seed: Optional[int] = None) -> List[dict]:
+    """
+    ``n_iter`` random draws: lists are sampled uniformly, ``(lo, hi)`` tuples
+    are ranges (integer if both bounds are int), scalars stay fixed.
+    Duplicate draws are dropped.
+    """
+    rng = np.random.default_rng(seed)
+    out, seen = [], set()
+    for _ in range(n_iter):
+        combo = {}
+        for k, v in space.items():
+            if isinstance(v, list):
+                combo[k] = v[rng.integers(len(v))]
+            elif isinstance(v, tuple):
+                lo, hi = v
+                combo[k] = (int(rng.integers(lo, hi + 1))
+                            if isinstance(lo, int) and isinstance(hi, int)
+                            else float(rng.uniform(lo, hi)))
+            else:
+                combo[k] = v
+        key = tuple(combo.items())
+        if key not in seen:
+            seen.add(key)
+            out.append(combo)
+    return out
+
+
+def chunk_combos(combos: List[dict], workers: int,
+                 chunk_size: Optional[int] = None) -> List[List[dict]]:
+    """
+    Split combinations into pool chunks, ordered by parameter values (space
+    order) so that neighbours share indicator periods and FRAME_MEMO hits.
+    """
+    combos = sorted(combos, key=lambda c: tuple(map(str, c.values())))
+    if chunk_size is None:
+        chunk_size = max(1, math.ceil(len(combos) / (workers * 4)))
+    return [combos[i:i + chunk_size] for i in range(0, len(combos), chunk_size)]
+
+
+def _row(res: dict) -> dict:
+    return {**res["params"], **res["metrics"]}
+
+
+def iter_sweep(
+    df: pd.DataFrame,
+    strategy: str,
+    timeframe: str,
+    combos: List[dict],
+    *,
+    symbol: str = "SWEEP",
+    effective_params: Optional[dict] = None,
+    initial_balance: float = 1_000.0,
+    workers: Optional[int] = None,
+    chunk_size: Optional[int] = None,
+) -> Iterator[dict]:
+    """Yield one result row (params + metrics) per combination as it finishes."""
+    workers = workers or os.cpu_count() or 1
+    with SharedFrame(df) as shared:
+        def tasks(chunk):
+            return [BacktestTask(symbol, timeframe, strategy, params, initial_balance,
+                                 data=shared.spec, effective_params=effective_params)
+                    for params in chunk]
+
+        chunks = chunk_combos(combos, workers, chunk_size)
+        if workers == 1:
+            for chunk in chunks:
+                yield from (_row(r) for r in run_backtest_chunk(tasks(chunk)) if r)
+            return
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            futures = [pool.submit(run_backtest_chunk, tasks(c)) for c in chunks]
+            for fut in as_completed(futures):
+                yield from (_row(r) for r in fut.result() if r)
+
+
+def rank(rows: List[dict], by: str = "Sharpe") -> pd.DataFrame:
+    table = pd.DataFrame(rows)
+    if table.empty:
+        return table
+    return (table.sort_values(by, ascending=by in LOWER_IS_BETTER, na_position="last")
+                 .reset_index(drop=True))
+
+
+def optimize(
+    df: pd.DataFrame,
+    strategy: str,
+    timeframe: str,
+    space: Dict[str, Any],
+    *,
+    method: str = "grid",
+    n_iter: int = 100,
+    seed: Optional[int] = None,
+    rank_by: str = "Sharpe",
+    on_result: Optional[Callable[[dict], None]] = None,
+    **kw,
+) -> pd.DataFrame:
+    """
+    Grid or random search; returns the table ranked by ``rank_by`` (a
+    :func:`backtest.metrics.calculate_metrics` key). ``on_result`` sees every
+    row as it arrives. Remaining keyword arguments go to :func:`iter_sweep`.
+    """
+    if method == "grid":
+        combos = grid_space(space)
+    elif method == "random":
+        combos = random_space(space, n_iter, seed)
+    else:
+        raise ValueError(f"unknown method: {method!r}")
+
+    rows = []
+    for row in iter_sweep(df, strategy, timeframe, combos, **kw):
+        rows.append(row)
+        if on_result is not None:
+            on_result(row)
+    return rank(rows, rank_by)
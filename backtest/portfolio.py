@@ -0,0 +1,248 @@
+"""Multi‑symbol portfolio back‑test with live position rules.
+
+:class:`BacktestEngine` trades one symbol with the full balance. This engine
+replays a whole universe on a time‑aligned panel and applies the same rules as
+:class:`live.position_manager.PositionManager`:
+
+    * at most one position per (symbol, strategy) key
+    * at most ``max_concurrent`` open positions overall
+    * each position is sized ``base_usdt_per_trade * leverage`` notional
+    * exits by SL / TP / expiry from ``effective_params`` (see
+      :mod:`backtest.exits`; same barrier, gap and tie rules)
+
+At each bar close the engine first finds exits that happened during the bar,
+then admits new entries. Entries see the pre‑exit book, as in live where
+``open_position`` runs before ``update_all``. When more keys signal than
+slots are free, earlier strategy entries win, then earlier symbols. Every
+step is a handful of array operations over the (strategy × symbol) book, so
+cost grows with bars, not with bars × symbols.
+
+    eng = PortfolioEngine(frames, cfg.get_strategies(), "30m",
+                          base_usdt_per_trade=10, max_concurrent=10)
+    res = eng.run()       # equity_curve, trades, final_balance, ...
+"""
+from __future__ import annotations
+
+from typing import Any, Dict, List, Optional, Sequence
+
+import numpy as np
+import pandas as pd
+
+from backtest.exits import (EXIT_END, EXIT_EXPIRE, EXIT_SL, EXIT_TP, barrier_frac,
+                            expire_bars)
+
+__all__ = ["PortfolioEngine", "PORTFOLIO_TRADE_DTYPE", "align_panel"]
+
+PORTFOLIO_TRADE_DTYPE = np.dtype([
+    ("strategy", np.int16),      # index into result["strategies"]
+    ("symbol", np.int32),        # index into result["symbols"]
+    ("entry_idx", np.int64),
+    ("exit_idx", np.int64),
+    ("side", np.int8),
+    ("entry_price", np.float64),
+    ("exit_price", np.float64),
+    ("qty", np.float64),
+    ("pnl", np.float64),
+    ("exit_type", np.int8),
+])
+
+_NEVER = np.iinfo(np.int64).max
+
+
+def align_panel(frames: Dict[str, pd.DataFrame]):
+    """Union time index and (T × S) OHLC matrices; missing bars are NaN."""
+    symbols = list(frames)
+    index = frames[symbols[0]].index if symbols else pd.DatetimeIndex([])
+    for sym in symbols[1:]:
+        index = index.union(frames[sym].index)
+    mats = {f: np.column_stack([frames[s][f].reindex(index).to_numpy(dtype=np.float64)
+                                for s in symbols]) if symbols else np.empty((0, 0))
+            for f in ("open", "high", "low", "close")}
+    return index, symbols, mats
+
+
+class PortfolioEngine:  # pylint: disable=too-many-instance-attributes
+    def __init__(
+        self,
+        frames: Dict[str, pd.DataFrame],
+        strategies: Sequence[dict],
+        timeframe: str,
+        *,
+        base_usdt_per_trade: float = 10.0,
+        max_concurrent: int = 1,
+        initial_balance: float = 1_000.0,
+        signals: Optional[Dict[str, np.ndarray]] = None,
+    ) -> None:
+        """
+        Parameters
+        ----------
+        frames : dict
+            symbol → OHLCV DataFrame of ``timeframe`` bars.
+        strategies : sequence of dict
+            ``ConfigLoader.get_strategies()`` entries; entries of another
+            timeframe are ignored, ``coins`` limits the symbols per entry.
+        signals : dict, optional
+            Precomputed (T × S) signal matrices by strategy name, aligned with
+            :func:`align_panel`; otherwise each strategy's
+            ``backtest_signals`` is run per symbol.
+        """
+        self.timeframe = timeframe
+        self.strategies = [s for s in strategies if s.get("timeframe", timeframe) == timeframe]
+        self.base = float(base_usdt_per_trade)
+        self.max_open = int(max_concurrent)
+        self.initial_balance = float(initial_balance)
+        self.frames = frames
+        self.index, self.symbols, self.mats = align_panel(frames)
+        self._signals = signals
+
+    # ------------------------------------------------------------------
+    # Signals
+    # ------------------------------------------------------------------
+    def _allowed(self, scfg: dict) -> np.ndarray:
+        coins = scfg.get("coins") or ["ALL_USDT"]
+        if any(str(c).upper() == "ALL_USDT" for c in coins):
+            return np.ones(len(self.symbols), dtype=bool)
+        wanted = {str(c).upper().replace("/", "") for c in coins}
+        return np.array([s in wanted for s in self.symbols], dtype=bool)
+
+    def _signal_matrix(self, scfg: dict, allowed: np.ndarray) -> np.ndarray:
+        if self._signals is not None:
+            return np.nan_to_num(np.asarray(self._signals[scfg["name"]], dtype=np.float64)).astype(np.int8)
+        from strategies import load_strategy
+        from utils.bar_store import BarStore
+
+        out = np.zeros((len(self.index), len(self.symbols)), dtype=np.int8)
+        for j, sym in enumerate(self.symbols):
+            if not allowed[j]:
+                continue
+            strat = load_strategy(scfg, bar_store=BarStore(), symbol=sym, timeframe=self.timeframe)
+            df = self.frames[sym]
+            sig = strat.backtest_signals(df).reindex(self.index)
+            out[:, j] = np.sign(sig.fillna(0).to_numpy(dtype=np.float64))
+        return out
+
+    # ------------------------------------------------------------------
+    # Public API
+    # ------------------------------------------------------------------
+    def run(self) -> Dict[str, Any]:
+        K, S, T = len(self.strategies), len(self.symbols), len(self.index)
+        o, h, l, c = (self.mats[f] for f in ("open", "high", "low", "close"))
+        mark = pd.DataFrame(c).ffill().to_numpy()          # last known close
+
+        allowed = np.array([self._allowed(s) for s in self.strategies]).reshape(K, S)
+        sigs = np.stack([self._signal_matrix(s, allowed[k])
+                         for k, s in enumerate(self.strategies)]) if K else np.zeros((0, T, S), np.int8)
+        sigs *= allowed[:, None, :].astype(np.int8)         # coins dışı → 0
+
+        eff = [s.get("effective_params", {}) for s in self.strategies]
+        lev = np.array([e.get("leverage") or 1 for e in eff], dtype=np.float64)[:, None]
+        sl_f = np.array([barrier_frac(e.get("sl_pct"), e.get("leverage") or 1) for e in eff])[:, None]
+        tp_f = np.array([barrier_frac(e.get("tp_pct"), e.get("leverage") or 1) for e in eff])[:, None]
+        life = np.array([expire_bars(e.get("expire_sec"), self.timeframe) or _NEVER
+                         for e in eff], dtype=np.int64)[:, None]
+
+        # ---- book: one slot per (strategy, symbol) key ----------------
+        is_open = np.zeros((K, S), dtype=bool)
+        side = np.zeros((K, S), dtype=np.int8)
+        entry = np.zeros((K, S))
+        qty = np.zeros((K, S))
+        sl = np.zeros((K, S))
+        tp = np.zeros((K, S))
+        t_in = np.zeros((K, S), dtype=np.int64)
+        t_exp = np.full((K, S), _NEVER, dtype=np.int64)
+
+        cash = self.initial_balance
+        equity = np.empty(T)
+        open_count = np.zeros(T, dtype=np.int32)
+        log: List[tuple] = []
+
+        for t in range(T):
+            ot, ht, lt, ct = o[t], h[t], l[t], c[t]
+            live = ~np.isnan(ct)
+
+            # ---- 1) exits during bar t ------------------------------
+            exit_px = exit_kind = None
+            if is_open.any():
+                chk = is_open & live
+                lng = side == 1
+                hit_sl = chk & np.where(lng, lt <= sl, ht >= sl)
+                hit_tp = chk & ~hit_sl & np.where(lng, ht >= tp, lt <= tp)
+                hit_ex = chk & ~hit_sl & ~hit_tp & (t >= t_exp)
+                out = hit_sl | hit_tp | hit_ex
+                if out.any():
+                    sl_px = np.where(lng, np.where(ot < sl, ot, sl), np.where(ot > sl, ot, sl))
+                    tp_px = np.where(lng, np.where(ot > tp, ot, tp), np.where(ot < tp, ot, tp))
+                    exit_px = np.where(hit_sl, sl_px, np.where(hit_tp, tp_px, ct))
+                    exit_kind = np.where(hit_sl, EXIT_SL, np.where(hit_tp, EXIT_TP, EXIT_EXPIRE))
+            else:
+                out = None
+
+            # ---- 2) entries at the close (pre‑exit book) -------------
+            cand = (sigs[:, t, :] != 0) & ~is_open & live
+            free = self.max_open - int(is_open.sum())
+            new = None
+            if free > 0 and cand.any():
+                flat = np.flatnonzero(cand)[:free]
+                new = np.zeros(K * S, dtype=bool)
+                new[flat] = True
+                new = new.reshape(K, S)
+
+            # ---- apply exits ------------------------------------------
+            if out is not None and out.any():
+                kk, ss = np.nonzero(out)
+                px = exit_px[kk, ss]
+                pnl = np.where(side[kk, ss] == 1, px - entry[kk, ss], entry[kk, ss] - px) * qty[kk, ss]
+                cash += float(pnl.sum())
+                log.append((kk, ss, t_in[kk, ss], np.full(len(kk), t), side[kk, ss],
+                            entry[kk, ss], px, qty[kk, ss], pnl, exit_kind[kk, ss]))
+                is_open[out] = False
+
+            # ---- apply entries ----------------------------------------
+            if new is not None:
+                d = sigs[:, t, :][new]
+                e = np.broadcast_to(ct, (K, S))[new]
+                kk = np.nonzero(new)[0]
+                lng = d == 1
+                is_open[new] = True
+                side[new] = d
+                entry[new] = e
+                qty[new] = self.base * lev[kk, 0] / e
+                sl[new] = np.where(lng, e * (1 - sl_f[kk, 0]), e * (1 + sl_f[kk, 0]))
+                tp[new] = np.where(lng, e * (1 + tp_f[kk, 0]), e * (1 - tp_f[kk, 0]))
+                t_in[new] = t
+                t_exp[new] = np.where(life[kk, 0] == _NEVER, _NEVER, t + life[kk, 0])
+
+            # ---- mark to market ---------------------------------------
+            upnl = np.where(is_open, side * (mark[t] - entry) * qty, 0.0)
+            equity[t] = cash + upnl.sum()
+            open_count[t] = is_open.sum()
+
+        # ---- liquidate what is still open at each symbol's last close -
+        if is_open.any():
+            kk, ss = np.nonzero(is_open)
+            last_t = np.array([np.flatnonzero(~np.isnan(c[:, j]))[-1] for j in ss])
+            px = c[last_t, ss]
+            pnl = np.where(side[kk, ss] == 1, px - entry[kk, ss], entry[kk, ss] - px) * qty[kk, ss]
+            cash += float(pnl.sum())
+            log.append((kk, ss, t_in[kk, ss], last_t, side[kk, ss], entry[kk, ss],
+                        px, qty[kk, ss], pnl, np.full(len(kk), EXIT_END)))
+            equity[-1] = cash
+
+        return {
+            "equity_curve": pd.Series(equity, index=self.index, name="equity"),
+            "open_positions": pd.Series(open_count, index=self.index, name="open"),
+            "trades": self._trades(log),
+            "final_balance": cash,
+            "symbols": self.symbols,
+            "strategies": [s["name"] for s in self.strategies],
+        }
+
+    @staticmethod
+    def _trades(log) -> np.ndarray:
+        if not log:
+            return np.empty(0, dtype=PORTFOLIO_TRADE_DTYPE)
+        cols = [np.concatenate(parts) for parts in zip(*log)]
+        out = np.empty(len(cols[0]), dtype=PORTFOLIO_TRADE_DTYPE)
+        for name, col in zip(PORTFOLIO_TRADE_DTYPE.names, cols):
+            out[name] = col
+        return out[np.lexsort((out["symbol"], out["strategy"], out["exit_idx"]))]
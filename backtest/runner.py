@@ -0,0 +1,219 @@
+"""Universe‑wide back‑test runner: strategies × coins × timeframes.
+
+Every entry of ``ConfigLoader.get_strategies()`` (one per strategy and
+timeframe) is expanded over its coins – ``ALL_USDT`` meaning every symbol
+with local data – into independent jobs. Local data is the columnar
+:class:`utils.ohlcv_store.OHLCVStore` under ``store_dir`` when given, else
+``{SYMBOL}_{tf}.csv`` files in ``data_dir``. Jobs run on a process pool; each
+worker loads its own series, so the parent never holds market data and at
+most ``2 × workers`` jobs are in flight.
+
+Exits follow ``exits``: ``"signal"`` (default) closes a position on the
+next signal flip as :class:`BacktestEngine` always did; ``"barrier"`` uses
+the live SL / TP / expiry rules of :mod:`backtest.exits` from each entry's
+``effective_params``. The mode is part of the job id and of every row.
+
+Results are appended to a JSON‑lines file as soon as a job finishes. On
+restart, job ids already present in that file are skipped (failed ones are
+retried), so an interrupted run resumes where it stopped.
+
+    summary = run_universe(cfg.get_strategies(), "results/backtest.jsonl",
+                           data_dir="data", workers=8)
+"""
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import os
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from pathlib import Path
+from typing import Callable, Dict, Iterable, List, Optional
+
+import pandas as pd
+
+from backtest.worker import BacktestTask, run_backtest_task
+from utils.ohlcv_store import OHLCVStore
+
+__all__ = ["EXIT_MODES", "expand_jobs", "local_symbols", "load_frame", "run_job", "run_universe",
+           "load_results"]
+
+log = logging.getLogger("BacktestRunner")
+
+EXIT_MODES = ("signal", "barrier")
+
+
+def local_symbols(data_dir, timeframe: str, store_dir=None) -> List[str]:
+    """Symbols with ``timeframe`` data in the store or a ``{SYMBOL}_{tf}.csv`` file."""
+    suffix = f"_{timeframe}.csv"
+    syms = {p.name[:-len(suffix)] for p in Path(data_dir).glob(f"*{suffix}")}
+    if store_dir is not None:
+        syms.update(OHLCVStore(store_dir).symbols(timeframe))
+    return sorted(syms)
+
+
+def load_csv_frame(data_dir, symbol: str, timeframe: str) -> Optional[pd.DataFrame]:
+    from utils.io import load_ohlcv_csv
+    path = Path(data_dir) / f"{symbol}_{timeframe}.csv"
+    return load_ohlcv_csv(path) if path.exists() else None
+
+
+def load_frame(data_dir, symbol: str, timeframe: str, store_dir=None) -> Optional[pd.DataFrame]:
+    """Store first (memory‑mapped), CSV as fallback."""
+    if store_dir is not None:
+        store = OHLCVStore(store_dir)
+        if store.has(symbol, timeframe):
+            return store.read(symbol, timeframe)
+    return load_csv_frame(data_dir, symbol, timeframe)
+
+
+def _job_id(name: str, symbol: str, tf: str, params: dict, eff: dict,
+            exits: str = "signal") -> str:
+    blob = json.dumps([params, eff, exits], sort_keys=True, default=str)
+    return f"{name}|{symbol}|{tf}|{hashlib.sha1(blob.encode()).hexdigest()[:10]}"
+
+
+def expand_jobs(strategies: Iterable[dict], universe: Callable[[str], List[str]],
+                exits: str = "signal") -> List[dict]:
+    """
+    strategies : ConfigLoader.get_strategies() çıktısı
+    universe   : timeframe → sembol listesi (ALL_USDT ve filtre için)
+    exits      : "signal" | "barrier" (bkz. modül açıklaması)
+    """
+    if exits not in EXIT_MODES:
+        raise ValueError(f"unknown exits mode: {exits!r} (expected one of {EXIT_MODES})")
+    jobs, seen = [], set()
+    for s in strategies:
+        tf = s["timeframe"]
+        avail = universe(tf)
+        coins = s.get("coins", [])
+        if any(str(c).upper() == "ALL_USDT" for c in coins):
+            symbols = avail
+        else:
+            have = set(avail)
+            wanted = (str(c).upper().replace("/", "") for c in coins)
+            symbols = [c for c in dict.fromkeys(wanted) if c in have]
+        params = s.get("params", {})
+        eff = s.get("effective_params", {})
+        for sym in symbols:
+            jid = _job_id(s["name"], sym, tf, params, eff, exits)
+            if jid not in seen:
+                seen.add(jid)
+                jobs.append({"id": jid, "strategy": s["name"], "symbol": sym,
+                             "timeframe": tf, "params": params,
+                             "effective_params": eff, "exits": exits})
+    return jobs
+
+
+def run_job(job: dict, data_dir, initial_balance: float = 1_000.0, store_dir=None) -> dict:
+    """Worker: load one series, back‑test it, return a JSON‑able row."""
+    t0 = time.perf_counter()
+    df = load_frame(data_dir, job["symbol"], job["timeframe"], store_dir)
+    row = {"id": job["id"], "strategy": job["strategy"], "symbol": job["symbol"],
+           "timeframe": job["timeframe"], "params": job["params"],
+           "exits": job.get("exits", "signal"), "bars": 0 if df is None else len(df)}
+    eff = (job["effective_params"] or None) if row["exits"] == "barrier" else None
+    if df is None or df.empty:
+        row["error"] = "no data"
+    else:
+        try:
+            res = run_backtest_task(BacktestTask(
+                job["symbol"], job["timeframe"], job["strategy"], job["params"],
+                initial_balance, data=df, effective_params=eff))
+            row["metrics"] = {k: float(v) for k, v in res["metrics"].items()}
+        except Exception as e:          # tek iş tüm koşuyu düşürmesin
+            row["error"] = f"{type(e).__name__}: {e}"
+    row["sec"] = time.perf_counter() - t0
+    return row
+
+
+def load_results(path) -> Dict[str, dict]:
+    """Finished rows by job id (a torn last line from a crash is ignored)."""
+    out = {}
+    path = Path(path)
+    if not path.exists():
+        return out
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            try:
+                row = json.loads(line)
+            except json.JSONDecodeError:
+                continue
+            out[row["id"]] = row
+    return out
+
+
+def _trim_torn_tail(path: Path) -> None:
+    """Drop a half‑written last line so new rows start on a fresh line."""
+    if not path.exists():
+        return
+    with open(path, "rb+") as f:
+        data = f.read()
+        if data and not data.endswith(b"\n"):
+            f.truncate(data.rfind(b"\n") + 1)
+
+
+def run_universe(
+    strategies: Iterable[dict],
+    results_path,
+    *,
+    data_dir="data",
+    store_dir=None,
+    workers: Optional[int] = None,
+    initial_balance: float = 1_000.0,
+    report_every: float = 5.0,
+    universe: Optional[Callable[[str], List[str]]] = None,
+    exits: str = "signal",
+) -> dict:
+    """Run (or resume) every job; returns a summary dict."""
+    universe = universe or (lambda tf: local_symbols(data_dir, tf, store_dir))
+    jobs = expand_jobs(strategies, universe, exits)
+    done = load_results(results_path)
+    # hatalı işler (ör. veri yoktu) yeniden denenir; son satır geçerlidir
+    todo = [j for j in jobs if "error" in done.get(j["id"], {"error": None})]
+    log.info("Back‑test: %d iş, %d tamamlanmış, %d kalan", len(jobs), len(jobs) - len(todo), len(todo))
+
+    results_path = Path(results_path)
+    results_path.parent.mkdir(parents=True, exist_ok=True)
+    _trim_torn_tail(results_path)
+    workers = workers or os.cpu_count() or 1
+    t0 = last = time.perf_counter()
+    n_done = bars = errors = 0
+
+    with open(results_path, "a", encoding="utf-8") as out, \
+            ProcessPoolExecutor(max_workers=workers) as pool:
+        pending = set()
+        queue = iter(todo)
+
+        def refill():
+            for job in queue:
+                pending.add(pool.submit(run_job, job, data_dir, initial_balance, store_dir))
+                if len(pending) >= 2 * workers:
+                    break
+
+        refill()
+        while pending:
+            finished, _ = wait(pending, return_when=FIRST_COMPLETED)
+            for fut in finished:
+                pending.discard(fut)
+                row = fut.result()
+                out.write(json.dumps(row) + "\n")
+                n_done += 1
+                bars += row["bars"]
+                errors += "error" in row
+            out.flush()
+            refill()
+
+            now = time.perf_counter()
+            if now - last >= report_every or not pending:
+                dt = now - t0
+                log.info("%d/%d iş | %.1f iş/sn | %.0f bar/sn | hata=%d",
+                         n_done, len(todo), n_done / dt, bars / dt, errors)
+                last = now
+
+    dt = time.perf_counter() - t0
+    return {"jobs": len(jobs), "skipped": len(jobs) - len(todo), "ran": n_done,
+            "errors": errors, "bars": bars, "sec": dt,
+            "jobs_per_sec": n_done / dt if dt else 0.0,
+            "bars_per_sec": bars / dt if dt else 0.0}
@@ -0,0 +1,116 @@
+"""OHLCV frames in shared memory for process‑pool back‑tests.
+
+The parent copies a DataFrame into one :class:`multiprocessing.shared_memory`
+block once; workers receive only a small picklable spec and rebuild a
+zero‑copy DataFrame over the same buffer.
+
+    with SharedFrame(df) as shared:
+        pool.submit(work, shared.spec)      # → attach(spec) inside the worker
+
+Layout of the block: ``int64[n]`` index (ns since epoch) followed by a
+``float64[5, n]`` OHLCV matrix.
+"""
+from __future__ import annotations
+
+from multiprocessing import shared_memory
+from typing import Dict
+
+import numpy as np
+import pandas as pd
+
+from utils.indicator_cache import FRAME_MEMO
+
+__all__ = ["SharedFrame", "SharedArray", "attach", "attach_array", "COLUMNS"]
+
+COLUMNS = ("open", "high", "low", "close", "volume")
+
+# worker‑side cache: block name → (SharedMemory, DataFrame)
+_ATTACHED: Dict[str, tuple] = {}
+
+
+def _views(buf, n: int):
+    index = np.ndarray((n,), dtype=np.int64, buffer=buf)
+    values = np.ndarray((len(COLUMNS), n), dtype=np.float64, buffer=buf, offset=8 * n)
+    return index, values
+
+
+def _frame(index: np.ndarray, values: np.ndarray, memo_key: str) -> pd.DataFrame:
+    values.flags.writeable = False
+    df = pd.DataFrame(values.T, index=pd.DatetimeIndex(index.view("datetime64[ns]")),
+                      columns=list(COLUMNS), copy=False)
+    df.attrs["memo_key"] = memo_key          # indicator reuse, see FrameMemo
+    return df
+
+
+class SharedFrame:
+    """Owner of a shared OHLCV block; unlinks it on :meth:`close`."""
+
+    def __init__(self, df: pd.DataFrame):
+        n = len(df)
+        self._shm = shared_memory.SharedMemory(create=True, size=max(1, 8 * n * (1 + len(COLUMNS))))
+        index, values = _views(self._shm.buf, n)
+        index[:] = df.index.to_numpy(dtype="datetime64[ns]").view(np.int64)
+        for i, col in enumerate(COLUMNS):
+            values[i] = df[col].to_numpy(dtype=np.float64)
+        self.spec = {"name": self._shm.name, "n": n}
+
+    def frame(self) -> pd.DataFrame:
+        """Zero‑copy view in the owning process."""
+        return _frame(*_views(self._shm.buf, self.spec["n"]), self.spec["name"])
+
+    def close(self) -> None:
+        if self._shm is not None:
+            _ATTACHED.pop(self.spec["name"], None)
+            FRAME_MEMO.discard(self.spec["name"])      # block gone → its indicators too
+            self._shm.close()
+            self._shm.unlink()
+            self._shm = None
+
+    def __enter__(self) -> "SharedFrame":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+
+def attach(spec: dict) -> pd.DataFrame:
+    """Worker side: DataFrame over the shared block (attached once per process)."""
+    hit = _ATTACHED.get(spec["name"])
+    if hit is None:
+        shm = shared_memory.SharedMemory(name=spec["name"])
+        hit = _ATTACHED[spec["name"]] = (shm, _frame(*_views(shm.buf, spec["n"]), spec["name"]))
+    return hit[1]
+
+
+class SharedArray:
+    """Any ndarray in shared memory (e.g. precomputed signal matrices)."""
+
+    def __init__(self, arr: np.ndarray):
+        arr = np.ascontiguousarray(arr)
+        self._shm = shared_memory.SharedMemory(create=True, size=max(1, arr.nbytes))
+        np.ndarray(arr.shape, dtype=arr.dtype, buffer=self._shm.buf)[...] = arr
+        self.spec = {"name": self._shm.name, "shape": arr.shape, "dtype": arr.dtype.str}
+
+    def close(self) -> None:
+        if self._shm is not None:
+            _ATTACHED.pop(self.spec["name"], None)
+            self._shm.close()
+            self._shm.unlink()
+            self._shm = None
+
+    def __enter__(self) -> "SharedArray":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+
+def attach_array(spec: dict) -> np.ndarray:
+    """Worker side: read‑only view of a SharedArray."""
+    hit = _ATTACHED.get(spec["name"])
+    if hit is None:
+        shm = shared_memory.SharedMemory(name=spec["name"])
+        arr = np.ndarray(spec["shape"], dtype=np.dtype(spec["dtype"]), buffer=shm.buf)
+        arr.flags.writeable = False
+        hit = _ATTACHED[spec["name"]] = (shm, arr)
+    return hit[1]
@@ -0,0 +1,184 @@
+"""Walk‑forward optimisation on top of :class:`BacktestEngine`.
+
+Rolling windows over one series: each window picks the parameter
+combination with the best in‑sample objective and trades it on the
+following out‑of‑sample block.
+
+Indicators (and hence signals) are causal, so they are computed **once per
+combination over the full history** and then only sliced per window – no
+window re‑runs the indicator pipeline, and each in‑sample slice still sees
+properly warmed‑up indicators. Signal generation is spread over a process
+pool (the series sits in a :class:`SharedFrame`); the windows themselves
+run in parallel too, reading the OHLCV and the (combination × bar) signal
+matrix from shared memory.
+
+    wf = walk_forward(df, "rsi_threshold_strategy", "1h",
+                      {"rsi_period": [7, 14], "rsi_oversold": [25, 30]},
+                      train=2_000, test=500, objective="Sharpe")
+    wf["windows"]        # per window: bounds, chosen params, IS/OOS metrics
+    wf["equity_curve"]   # stitched out‑of‑sample equity
+
+Positions are not carried across window boundaries; every test block
+starts flat. Out‑of‑sample PnL is in price units (as in BacktestEngine), so
+the stitched curve simply chains each block onto the previous block's end
+balance.
+"""
+from __future__ import annotations
+
+import os
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+
+from backtest.backtester import BacktestEngine
+from backtest.metrics import calculate_metrics, calculate_metrics_batch
+from backtest.optimizer import LOWER_IS_BETTER, chunk_combos, grid_space
+from backtest.shared_frame import SharedArray, SharedFrame, attach, attach_array
+from backtest.worker import resolve_strategy
+from utils.bar_store import BarStore
+
+__all__ = ["walk_forward", "windows"]
+
+
+class _FixedSignals:
+    """Strategy stand‑in that replays a precomputed signal slice."""
+
+    def __init__(self, sig: np.ndarray):
+        self.sig = sig
+
+    def generate_signals(self, df: pd.DataFrame) -> pd.Series:
+        return pd.Series(self.sig, index=df.index)
+
+
+def windows(n: int, train: int, test: int, step: Optional[int] = None) -> List[tuple]:
+    """[(train_start, train_end, test_start, test_end)] – end exclusive."""
+    step = step or test
+    if step < test:
+        raise ValueError("step < test would overlap out‑of‑sample blocks")
+    out, s = [], 0
+    while s + train + test <= n:
+        out.append((s, s + train, s + train, s + train + test))
+        s += step
+    return out
+
+
+def _signals_chunk(frame_spec, strategy, timeframe, combos) -> np.ndarray:
+    df = attach(frame_spec)
+    Strategy = resolve_strategy(strategy)
+    out = np.zeros((len(combos), len(df)), dtype=np.int8)
+    for i, params in enumerate(combos):
+        strat = Strategy(bar_store=BarStore(), symbol="WF", timeframe=timeframe, **params)
+        sig = strat.backtest_signals(df).reindex(df.index)
+        out[i] = np.sign(sig.fillna(0).to_numpy(dtype=np.float64))
+    return out
+
+
+def _scores(values: np.ndarray, objective: str) -> np.ndarray:
+    v = np.where(np.isnan(values), -np.inf, values)
+    return -v if objective in LOWER_IS_BETTER else v
+
+
+def _run(df, sig, eff, timeframe, initial_balance):
+    res = BacktestEngine(df, _FixedSignals(sig), initial_balance=initial_balance,
+                         effective_params=eff, timeframe=timeframe).run()
+    return res, calculate_metrics(res["equity_curve"], res["trades"], timeframe=timeframe)
+
+
+def _window(frame_spec, sig_spec, bounds, objective, eff, timeframe, initial_balance):
+    df, sigs = attach(frame_spec), attach_array(sig_spec)
+    a, b, c, d = bounds
+    train = df.iloc[a:b]
+    # in‑sample: every combination, then all metrics in one batched call
+    runs = [BacktestEngine(train, _FixedSignals(sigs[i, a:b]), initial_balance=initial_balance,
+                           effective_params=eff, timeframe=timeframe).run()
+            for i in range(sigs.shape[0])]
+    table = calculate_metrics_batch(np.stack([r["equity_curve"].to_numpy() for r in runs]),
+                                    [r["trades"] for r in runs], timeframe=timeframe)
+    best = int(np.argmax(_scores(table[objective], objective)))
+    best_is = {k: float(v[best]) for k, v in table.items()}
+    res, oos = _run(df.iloc[c:d], sigs[best, c:d], eff, timeframe, initial_balance)
+    return {"bounds": bounds, "best": best, "is": best_is, "oos": oos,
+            "equity": res["equity_curve"].to_numpy(), "trades": res["trades"]}
+
+
+def walk_forward(
+    df: pd.DataFrame,
+    strategy,
+    timeframe: str,
+    space: Dict[str, Any],
+    *,
+    train: int,
+    test: int,
+    step: Optional[int] = None,
+    objective: str = "Sharpe",
+    effective_params: Optional[dict] = None,
+    initial_balance: float = 1_000.0,
+    workers: Optional[int] = None,
+) -> Dict[str, Any]:
+    """
+    Parameters
+    ----------
+    train, test, step : int
+        In‑sample length, out‑of‑sample length and window step, in bars
+        (``step`` defaults to ``test`` → back‑to‑back OOS blocks; it may
+        not be smaller than ``test``).
+    objective : str
+        :func:`backtest.metrics.calculate_metrics` key to maximise
+        (``MaxDrawdown`` is minimised).
+    """
+    combos = grid_space(space)
+    bounds = windows(len(df), train, test, step)
+    if not bounds:
+        raise ValueError("series shorter than one train + test window")
+    workers = workers or os.cpu_count() or 1
+
+    with SharedFrame(df) as shared:
+        # 1) signals of every combination over the full history
+        chunks = chunk_combos(combos, workers)
+        combos = [p for ch in chunks for p in ch]          # chunk order
+        if workers == 1:
+            parts = [_signals_chunk(shared.spec, strategy, timeframe, ch) for ch in chunks]
+        else:
+            with ProcessPoolExecutor(max_workers=workers) as pool:
+                parts = list(pool.map(_signals_chunk, *zip(*[
+                    (shared.spec, strategy, timeframe, ch) for ch in chunks])))
+        sigs = np.concatenate(parts)
+
+        # 2) windows, in parallel
+        with SharedArray(sigs) as shared_sigs:
+            args = [(shared.spec, shared_sigs.spec, bd, objective, effective_params,
+                     timeframe, initial_balance) for bd in bounds]
+            if workers == 1:
+                results = [_window(*a) for a in args]
+            else:
+                with ProcessPoolExecutor(max_workers=workers) as pool:
+                    results = list(pool.map(_window, *zip(*args)))
+
+    return _stitch(df, combos, results, initial_balance, timeframe)
+
+
+def _stitch(df, combos, results, initial_balance, timeframe=None) -> Dict[str, Any]:
+    rows, parts, trades = [], [], []
+    carry = initial_balance
+    for w, r in enumerate(results):
+        a, b, c, d = r["bounds"]
+        rows.append({"window": w,
+                     "train_start": df.index[a], "train_end": df.index[b - 1],
+                     "test_start": df.index[c], "test_end": df.index[d - 1],
+                     **combos[r["best"]],
+                     **{f"is_{k}": v for k, v in r["is"].items()},
+                     **{f"oos_{k}": v for k, v in r["oos"].items()}})
+        eq = r["equity"] - initial_balance + carry
+        parts.append(pd.Series(eq, index=df.index[c:d]))
+        carry = eq[-1]
+        tr = r["trades"].copy()
+        tr["entry_idx"] += c                               # global bar indices
+        tr["exit_idx"] += c
+        trades.append(tr)
+
+    equity = pd.concat(parts).rename("equity")
+    return {"windows": pd.DataFrame(rows), "equity_curve": equity,
+            "trades": np.concatenate(trades), "final_balance": float(carry),
+            "metrics": calculate_metrics(equity, np.concatenate(trades), timeframe=timeframe)}
@@ -1,36 +1,98 @@
 # backtest/worker.py
+from __future__ import annotations
+
+from typing import Any, NamedTuple, Optional
+
+import pandas as pd
+
 from backtest.backtester import BacktestEngine
-from utils.config_loaders import ConfigLoader
-from data.data_fetcher import DataFetcher
+from backtest.metrics import calculate_metrics
+from backtest.shared_frame import attach
+from utils.bar_store import BarStore
+
+
+class BacktestTask(NamedTuple):
+    """
+    Tek back‑test görevi. Eski 7’li tuple biçimi de kabul edilir:
+    (symbol, timeframe, strategy, params, initial_balance, start_date, end_date)
+
+    strategy         : Strategy sınıfı veya strateji modül adı ("super_trend")
+    data             : None → DataFetcher ile çekilir; DataFrame; ya da
+                       SharedFrame.spec (paylaşılan bellek, kopyasız)
+    effective_params : verilirse SL/TP/expire çıkışları (backtest.exits)
+    """
+    symbol: str
+    timeframe: str
+    strategy: Any
+    params: dict
+    initial_balance: float = 1_000.0
+    start_date: Optional[Any] = None
+    end_date: Optional[Any] = None
+    data: Any = None
+    effective_params: Optional[dict] = None
+
+
+def resolve_strategy(strategy):
+    """Strateji modül adı veya sınıfı → Strategy sınıfı."""
+    if isinstance(strategy, str):
+        from strategies import strategy_class
+        return strategy_class(strategy)
+    return strategy
+
+
+def _load_frame(task: BacktestTask) -> pd.DataFrame:
+    if isinstance(task.data, pd.DataFrame):
+        df = task.data
+    elif isinstance(task.data, dict):
+        df = attach(task.data)
+    else:
+        from data.data_fetcher import DataFetcher    # ccxt yalnızca burada gerekir
+        fetcher = DataFetcher()
+        if task.start_date is not None:              # tüm aralık, sayfalı
+            df = fetcher.fetch_range(task.symbol, task.timeframe, task.start_date, task.end_date)
+        else:
+            df = fetcher.fetch_ohlcv(task.symbol, task.timeframe)
+    if task.end_date is not None and not df.empty:
+        df = df.loc[:task.end_date]
+    return df
+
 
 def run_backtest_task(task):
     """
-    task: tuple (symbol, timeframe, strategy_class, strategy_params, initial_balance, date_range)
+    task: BacktestTask veya eski biçim tuple
     Her görevde bir coinin bir zaman diliminde verilen strateji ile backtestini yapar.
     """
-    symbol, timeframe, StrategyClass, params, initial_balance, start_date, end_date = task
-    
-    # 1) Veri çek
-    fetcher = DataFetcher(ConfigLoader.get_api_keys[0], ConfigLoader.get_api_keys[1])
-    df = fetcher.fetch_ohlcv(symbol, timeframe, since=start_date)
+    task = BacktestTask(*task)
+    StrategyClass = resolve_strategy(task.strategy)
+
+    # 1) Veri
+    df = _load_frame(task)
     if df.empty:
         return None
-    
+
     # 2) Strateji yarat
-    strategy = StrategyClass(params)
-    
+    strategy = StrategyClass(bar_store=BarStore(), symbol=task.symbol,
+                             timeframe=task.timeframe, **task.params)
+
     # 3) Backtest çalıştır
-    engine = BacktestEngine(df, strategy, initial_balance=initial_balance)
+    engine = BacktestEngine(df, strategy, initial_balance=task.initial_balance,
+                            effective_params=task.effective_params,
+                            timeframe=task.timeframe)
     result = engine.run()
-    
-    # 4) Metrikleri hesaplayıp döndür (daha sonra metrics modülüne taşıyabiliriz)
-    from backtest.metrics import calculate_metrics
-    equity_series = result['equity_curve']
-    trades = result['trades']
-    metrics = calculate_metrics(equity_series, trades)
+
+    # 4) Metrikler
+    metrics = calculate_metrics(result['equity_curve'], result['trades'],
+                                timeframe=task.timeframe)
+    metrics['Trades'] = len(result['trades'])
     return {
-        'symbol': symbol,
-        'timeframe': timeframe,
-        'strategy': StrategyClass.__name__,
-        'metrics': metrics
+        'symbol': task.symbol,
+        'timeframe': task.timeframe,
+        'strategy': StrategyClass.__module__.rsplit('.', 1)[-1],
+        'params': dict(task.params),
+        'metrics': metrics,
     }
+
+
+def run_backtest_chunk(tasks):
+    """Süreç havuzu için: IPC maliyetini dağıtmak üzere görev grubu."""
+    return [run_backtest_task(t) for t in tasks]
@@ -0,0 +1,50 @@
+# benchmarks/bench_backtester.py
+"""
+BacktestEngine döngü modu ile vektörel mod karşılaştırması.
+
+    python -m benchmarks.bench_backtester [--bars 1000000] [--density 0.02]
+
+Rastgele +1/0/‑1 sinyaller (barların `density` oranında, geri kalanı NaN →
+pozisyon korunur) 1m barlar üzerinde iki modda çalıştırılır.
+"""
+import argparse
+import time
+
+import numpy as np
+import pandas as pd
+
+from backtest.backtester import BacktestEngine
+
+
+class RandomSignals:
+    def __init__(self, sig):
+        self.sig = sig
+
+    def generate_signals(self, df):
+        return pd.Series(self.sig, index=df.index)
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--bars", type=int, default=1_000_000)
+    ap.add_argument("--density", type=float, default=0.02)
+    args = ap.parse_args()
+
+    rng = np.random.default_rng(0)
+    n = args.bars
+    c = 100 + np.cumsum(rng.normal(0, 0.1, n))
+    df = pd.DataFrame({"open": c, "high": c, "low": c, "close": c, "volume": 1.0},
+                      index=pd.date_range("2020-01-01", periods=n, freq="1min"))
+    sig = np.where(rng.random(n) < args.density,
+                   rng.choice([-1.0, 0.0, 1.0], size=n), np.nan)
+
+    for mode in ("loop", "vector"):
+        t0 = time.perf_counter()
+        res = BacktestEngine(df, RandomSignals(sig), mode=mode).run()
+        dt = time.perf_counter() - t0
+        print(f"{mode:7s} {dt:8.3f}s  {n / dt:14,.0f} bar/s  "
+              f"{len(res['trades']):8d} trades  final={res['final_balance']:.4f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,77 @@
+# benchmarks/bench_bar_store.py
+"""
+Liste tabanlı eski BarStore ile NumPy halka BarStore karşılaştırması.
+
+    python -m benchmarks.bench_bar_store [--symbols 500] [--bars 1200]
+
+Her (sembol, timeframe) için `bars` kapanış eklenir; her eklemeden sonra
+stratejilerin yaptığı gibi get_ohlcv + np.asarray çağrılır.
+"""
+import argparse
+import time
+from collections import defaultdict
+
+import numpy as np
+
+from utils.bar_store import BarStore
+
+TFS = ("30m", "1h", "2h", "4h", "6h", "8h", "12h")
+
+
+class ListBarStore:
+    """Eski (liste + del arr[:n]) gerçekleme – yalnızca kıyas için."""
+
+    def __init__(self, maxlen: int = 600):
+        self._maxlen = maxlen
+        self._data = defaultdict(
+            lambda: {"open": [], "high": [], "low": [], "close": [], "volume": []}
+        )
+
+    def add_bar(self, symbol, tf, k):
+        if not k.get("x"):
+            return
+        buf = self._data[(symbol, tf)]
+        buf["open"].append(float(k["o"]))
+        buf["high"].append(float(k["h"]))
+        buf["low"].append(float(k["l"]))
+        buf["close"].append(float(k["c"]))
+        buf["volume"].append(float(k["v"]))
+        for arr in buf.values():
+            if len(arr) > self._maxlen:
+                del arr[: len(arr) - self._maxlen]
+
+    def get_ohlcv(self, symbol, tf):
+        return self._data[(symbol, tf)]
+
+
+def _run(store, symbols, bars):
+    k = {"o": 1.0, "h": 2.0, "l": 0.5, "c": 1.5, "v": 10.0, "x": True}
+    t0 = time.perf_counter()
+    for i in range(bars):
+        k["t"] = i * 60_000
+        for sym in symbols:
+            for tf in TFS:
+                store.add_bar(sym, tf, k)
+                buf = store.get_ohlcv(sym, tf)
+                for f in ("open", "high", "low", "close", "volume"):
+                    np.asarray(buf[f], dtype=float)
+    return time.perf_counter() - t0
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--symbols", type=int, default=50)
+    ap.add_argument("--bars", type=int, default=800)
+    ap.add_argument("--maxlen", type=int, default=600)
+    args = ap.parse_args()
+
+    symbols = [f"S{i}USDT" for i in range(args.symbols)]
+    n = args.symbols * len(TFS) * args.bars
+    for name, store in (("list", ListBarStore(args.maxlen)),
+                        ("ring", BarStore(args.maxlen))):
+        dt = _run(store, symbols, args.bars)
+        print(f"{name:5s} {dt:8.3f}s  {n / dt:12,.0f} add+read/s")
+
+
+if __name__ == "__main__":
+    main()
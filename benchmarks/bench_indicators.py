@@ -0,0 +1,74 @@
+# benchmarks/bench_indicators.py
+"""
+Bar başına gösterge maliyeti: tam tampon üzerinde talib (eski canlı yol)
+ile artımlı göstergeler (IndicatorEngine) karşılaştırması.
+
+    python -m benchmarks.bench_indicators [--bars 2000] [--maxlen 600]
+
+İki yol da volume_rsi_spike’ın kullandığı göstergeleri hesaplar:
+RSI, EMA20/50, BBANDS(20), MOM(10), ADX(20), hacim MA20.
+"""
+import argparse
+import time
+
+import numpy as np
+import pandas as pd
+import talib
+
+from utils.bar_store import BarStore
+from utils.indicators import IndicatorEngine
+
+SPECS = [("RSI", {"period": 14}), ("EMA", {"period": 20}), ("EMA", {"period": 50}),
+         ("BBANDS", {"period": 20}), ("MOM", {"period": 10}), ("ADX", {"period": 20}),
+         ("SMA", {"period": 20, "src": "volume"})]
+
+
+def _data(n):
+    rng = np.random.default_rng(0)
+    c = np.cumsum(rng.normal(0, 1, n)) + 1000
+    return c + rng.normal(0, .2, n), c + rng.random(n), c - rng.random(n), c, rng.random(n) * 100
+
+
+def _talib_pass(buf):
+    c, h, l, v = buf["close"], buf["high"], buf["low"], buf["volume"]
+    talib.RSI(c, 14)[-1]
+    talib.EMA(c, 20)[-1]
+    talib.EMA(c, 50)[-1]
+    talib.BBANDS(c, 20, 2, 2)
+    talib.MOM(c, 10)[-1]
+    talib.ADX(h, l, c, 20)[-1]
+    pd.Series(v).rolling(20).mean().iloc[-1]
+
+
+def _bench(bars, maxlen, incremental):
+    o, h, l, c, v = _data(maxlen + bars)
+    store = BarStore(maxlen)
+    for i in range(maxlen):
+        store.add_bar("X", "1h", {"o": o[i], "h": h[i], "l": l[i], "c": c[i], "v": v[i], "x": True})
+    if incremental:
+        eng = IndicatorEngine.attach(store)
+        inds = [eng.get("X", "1h", name, **p) for name, p in SPECS]
+
+    t0 = time.perf_counter()
+    for i in range(maxlen, maxlen + bars):
+        store.add_bar("X", "1h", {"o": o[i], "h": h[i], "l": l[i], "c": c[i], "v": v[i], "x": True})
+        if incremental:
+            [ind.value for ind in inds]
+        else:
+            _talib_pass(store.get_ohlcv("X", "1h"))
+    return (time.perf_counter() - t0) / bars
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--bars", type=int, default=2000)
+    ap.add_argument("--maxlen", type=int, default=600)
+    args = ap.parse_args()
+    full = _bench(args.bars, args.maxlen, incremental=False)
+    inc = _bench(args.bars, args.maxlen, incremental=True)
+    print(f"talib (tam tampon) : {full * 1e6:8.1f} µs/bar")
+    print(f"artımlı            : {inc * 1e6:8.1f} µs/bar  (x{full / inc:.1f})")
+
+
+if __name__ == "__main__":
+    main()
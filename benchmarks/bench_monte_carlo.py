@@ -0,0 +1,34 @@
+# benchmarks/bench_monte_carlo.py
+"""
+İşlem listesi üzerinde Monte Carlo (bootstrap / karıştırma) yolları.
+
+    python -m benchmarks.bench_monte_carlo [--paths 10000] [--trades 1000]
+
+Varsayılan: 10k yol × 1k işlem, metrikler + yüzdelik bantlar dahil.
+"""
+import argparse
+import time
+
+import numpy as np
+
+from backtest.monte_carlo import monte_carlo
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--paths", type=int, default=10_000)
+    ap.add_argument("--trades", type=int, default=1_000)
+    args = ap.parse_args()
+
+    pnl = np.random.default_rng(0).normal(0.2, 3.0, args.trades)
+    for method in ("bootstrap", "shuffle"):
+        t0 = time.perf_counter()
+        mc = monte_carlo(pnl, args.paths, method=method, seed=0)
+        dt = time.perf_counter() - t0
+        dd = mc["metrics"]["MaxDrawdown"]
+        print(f"{method:9s} {dt:6.2f}s  {args.paths * args.trades / dt:14,.0f} trade‑step/s  "
+              f"MaxDD p5/p50/p95 = {dd.iloc[0]:.3f}/{dd.loc[50]:.3f}/{dd.iloc[-1]:.3f}")
+
+
+if __name__ == "__main__":
+    main()
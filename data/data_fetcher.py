@@ -1,4 +1,9 @@
 # data/data_fetcher.py
+import os
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+import numpy as np
 import pandas as pd
 # CCXT kütüphanesini kullanarak Binance verisi çekebiliyoruz
 import ccxt
@@ -6,13 +11,37 @@ import threading
 import time
 from binance import ThreadedWebsocketManager
 
+from utils.ohlcv_store import to_ms
+from utils.timeframes import TF_SEC
+
+
+class _Throttle:
+    """İstek başlangıçları arasında en az `interval` sn (thread’ler arası ortak)."""
+
+    def __init__(self, interval: float):
+        self.interval = interval
+        self._lock = threading.Lock()
+        self._next = 0.0
+
+    def wait(self) -> None:
+        with self._lock:
+            now = time.monotonic()
+            at = max(now, self._next)
+            self._next = at + self.interval
+        if at > now:
+            time.sleep(at - now)
+
+
 class DataFetcher:
-    def __init__(self, api_key=None, api_secret=None):
-        self.exchange = ccxt.binance({
+    def __init__(self, api_key=None, api_secret=None, exchange=None):
+        """exchange: ccxt uyumlu nesne (testlerde yerel sahte borsa); yoksa Binance."""
+        self.exchange = exchange or ccxt.binance({
             'apiKey': api_key, 
             'secret': api_secret,
             'enableRateLimit': True
         })
+        # ccxt rateLimit: istekler arası ms
+        self._throttle = _Throttle(getattr(self.exchange, "rateLimit", 0) / 1000)
     
     def fetch_ohlcv(self, symbol, timeframe="1m", since=None, limit=1000):
         """
@@ -34,6 +63,77 @@ class DataFetcher:
         df.set_index('timestamp', inplace=True)
         return df
 
+    # ------------- SAYFALI ARALIK ÇEKİMİ -------------
+    def _fetch_page(self, symbol, timeframe, lo, hi, limit, retries, backoff):
+        """[lo, hi) aralığındaki mumlar (n × 6 dizi); borsa daha az dönerse devam eder."""
+        step = TF_SEC[timeframe] * 1000
+        rows, since = [], lo
+        while since < hi:
+            for attempt in range(retries + 1):
+                try:
+                    self._throttle.wait()
+                    data = self.exchange.fetch_ohlcv(symbol, timeframe, since=since,
+                                                     limit=min(limit, (hi - since) // step + 1))
+                    break
+                except Exception:
+                    if attempt == retries:
+                        raise
+                    time.sleep(backoff * 2 ** attempt)
+            data = [r for r in data if lo <= r[0] < hi]
+            if not data:
+                break
+            rows.extend(data)
+            since = int(data[-1][0]) + step
+        return np.array(rows, dtype=np.float64).reshape(-1, 6)
+
+    def fetch_range(self, symbol, timeframe, start, end=None, *, page_limit=1000,
+                    max_concurrency=4, retries=3, backoff=1.0, cache_dir=None):
+        """
+        [start, end) aralığının tamamı (1000 bar sınırı yok).
+        Aralık page_limit barlık sayfalara bölünür, sayfalar rate limit
+        içinde paralel çekilir; hata alan sayfa üstel beklemeyle yeniden
+        denenir. Sonuç sıralı ve tekrarsız birleştirilir.
+        cache_dir verilirse tamamlanmış (tamamen kapanmış) sayfalar diske
+        yazılır; yarıda kalan çekim aynı çağrıyla kaldığı yerden sürer.
+            start / end : ms, datetime veya "2024-01-01" (end None → şimdi)
+        """
+        step = TF_SEC[timeframe] * 1000
+        now = int(time.time() * 1000)
+        lo = to_ms(start) // step * step
+        hi = min(to_ms(end) if end is not None else now, now + step)
+        span = page_limit * step
+        pages = [(a, min(a + span, hi)) for a in range(lo, hi, span)]
+
+        cache = None
+        if cache_dir is not None:
+            cache = Path(cache_dir) / f"{symbol.replace('/', '')}_{timeframe}"
+            cache.mkdir(parents=True, exist_ok=True)
+
+        def page(bounds):
+            a, b = bounds
+            path = cache / f"{a}_{b}.npy" if cache is not None else None
+            if path is not None and path.exists():
+                return np.load(path)
+            arr = self._fetch_page(symbol, timeframe, a, b, page_limit, retries, backoff)
+            if path is not None and b <= now - step:      # son bar kapanmışsa kalıcı
+                tmp = path.with_name(f"{path.stem}.{os.getpid()}.{threading.get_ident()}.tmp.npy")
+                np.save(tmp, arr)
+                os.replace(tmp, path)
+            return arr
+
+        with ThreadPoolExecutor(max_workers=max_concurrency) as pool:
+            parts = list(pool.map(page, pages))           # sayfa sırası korunur
+
+        arr = np.concatenate(parts) if parts else np.empty((0, 6))
+        if len(arr):
+            t = arr[:, 0].astype(np.int64)
+            keep = np.r_[True, t[1:] > np.maximum.accumulate(t)[:-1]]
+            arr = arr[keep]
+        df = pd.DataFrame(arr[:, 1:], columns=['open', 'high', 'low', 'close', 'volume'],
+                          index=pd.to_datetime(arr[:, 0].astype(np.int64), unit='ms'))
+        df.index.name = 'timestamp'
+        return df
+
     def resample_ohlcv(self, df, timeframe):
         """
         Veriyi verilen zaman dilimine yeniden örnekler.
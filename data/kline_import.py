@@ -0,0 +1,167 @@
+# data/kline_import.py
+"""
+Zip’li aylık (veya günlük) kline arşivlerini yerel OHLCV deposuna toplu
+aktarır – tamamen çevrimdışı, borsa çağrısı yok.
+
+Beklenen dosya adları (Binance arşiv biçimi):
+
+    BTCUSDT-1m-2024-01.zip        (aylık)
+    BTCUSDT-1m-2024-02-15.zip     (günlük)
+
+Her zip tek bir CSV içerir: open_time, open, high, low, close, volume,
+close_time, ... (başlık satırı olabilir de olmayabilir de; open_time ms
+ya da µs olabilir). Dosyalar adlarından (sembol, timeframe) gruplarına
+ayrılır ve gruplar sırayla yazılır: grubun arşivleri süreç havuzunda
+paralel açılıp ayrıştırılır, ana süreç birleştirir, çakışan barları
+tekler, süreklilik boşluklarını raporlar ve OHLCVStore’a yazar. Ana süreç
+bir grubu yazarken sıradaki grubun arşivleri havuzda ayrıştırılır; bellekte
+aynı anda en fazla iki seri bulunur (yazılan ve sıradaki).
+
+    python -m data.kline_import arsiv/ --store data/store --workers 8
+"""
+from __future__ import annotations
+
+import argparse
+import io
+import logging
+import os
+import re
+import time
+import zipfile
+from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from utils.bar_store import FIELDS
+from utils.ohlcv_store import COLUMNS, OHLCVStore, dedup
+from utils.timeframes import TF_SEC
+
+__all__ = ["parse_archive", "find_archives", "import_archives"]
+
+log = logging.getLogger("KlineImport")
+
+_NAME = re.compile(r"^(?P<sym>[A-Z0-9]+)-(?P<tf>\d+[smhdwM])-\d{4}-\d{2}(-\d{2})?\.zip$")
+
+
+def find_archives(root) -> List[Path]:
+    """Kök altında (alt dizinler dahil) adı kalıba uyan zip’ler, sıralı."""
+    return sorted(p for p in Path(root).rglob("*.zip") if _NAME.match(p.name))
+
+
+def parse_archive(path) -> Tuple[str, str, Dict[str, np.ndarray]]:
+    """Tek zip → (sembol, timeframe, {"t", OHLCV} dizileri)."""
+    path = Path(path)
+    m = _NAME.match(path.name)
+    if m is None:
+        raise ValueError(f"Arşiv adı tanınmadı: {path.name}")
+    with zipfile.ZipFile(path) as zf:
+        raw = zf.read(zf.namelist()[0])
+    header = 0 if raw[:1].isalpha() else None          # başlık satırı var mı
+    df = pd.read_csv(io.BytesIO(raw), header=header, usecols=range(6),
+                     names=COLUMNS if header is None else None, engine="c")
+    df.columns = COLUMNS
+    t = df["t"].to_numpy(dtype=np.int64)
+    if len(t) and t[0] > 10**14:                       # µs zaman damgası → ms
+        t = t // 1000
+    cols = {"t": t, **{f: df[f].to_numpy(dtype=np.float64) for f in FIELDS}}
+    return m["sym"], m["tf"], cols
+
+
+def _gaps(t: np.ndarray, tf: str) -> List[tuple]:
+    """[(son bar ms, sonraki bar ms, eksik bar sayısı)]"""
+    step = TF_SEC[tf] * 1000
+    d = np.diff(t)
+    at = np.flatnonzero(d != step)
+    return [(int(t[i]), int(t[i + 1]), int(d[i] // step) - 1) for i in at]
+
+
+def import_archives(
+    root,
+    store_dir,
+    *,
+    workers: Optional[int] = None,
+) -> dict:
+    """
+    root altındaki tüm arşivleri depoya aktarır; özet sözlüğü döner:
+    files, rows (yazılan tekil bar), duplicates, gaps {(sym, tf): [...]},
+    sec, rows_per_sec.
+    """
+    files = find_archives(root)
+    workers = workers or os.cpu_count() or 1
+    t0 = time.perf_counter()
+
+    # dosya adından (sembol, timeframe) grupları: her seri ayrı yazılır
+    groups: Dict[tuple, List[Path]] = defaultdict(list)
+    for f in files:
+        m = _NAME.match(f.name)
+        groups[(m["sym"], m["tf"])].append(f)
+    order = sorted(groups)
+
+    pool = (ProcessPoolExecutor(max_workers=workers)
+            if workers > 1 and len(files) > 1 else None)
+
+    def submit(i):
+        """i. grubun ayrıştırma işleri havuza (havuz yoksa yol listesi)."""
+        if i >= len(order):
+            return None
+        paths = groups[order[i]]
+        return paths if pool is None else [pool.submit(parse_archive, p) for p in paths]
+
+    store = OHLCVStore(store_dir)
+    rows = dups = 0
+    parse_sec = 0.0                                  # ayrıştırma için bekleme
+    gaps = {}
+    try:
+        ahead = submit(0)
+        for i, (sym, tf) in enumerate(order):
+            current, ahead = ahead, submit(i + 1)    # sıradaki grup havuzda
+            p0 = time.perf_counter()
+            if pool is None:
+                chunks = [c for _, _, c in map(parse_archive, current)]
+            else:
+                chunks = [f.result()[2] for f in current]
+            del current
+            parse_sec += time.perf_counter() - p0
+            raw = {k: np.concatenate([c[k] for c in chunks]) for k in COLUMNS}
+            del chunks
+            cols = dedup(raw)
+            dups += len(raw["t"]) - len(cols["t"])
+            del raw
+            rows += len(cols["t"])
+            if tf in TF_SEC:
+                g = _gaps(cols["t"], tf)
+                if g:
+                    gaps[(sym, tf)] = g
+                    log.warning("%s | %s: %d boşluk, %d eksik bar", sym, tf, len(g),
+                                sum(x[2] for x in g))
+            store.append(sym, tf, cols)
+    finally:
+        if pool is not None:
+            pool.shutdown(cancel_futures=True)
+
+    dt = time.perf_counter() - t0
+    summary = {"files": len(files), "rows": rows, "duplicates": dups, "gaps": gaps,
+               "sec": dt, "parse_sec": parse_sec,
+               "rows_per_sec": rows / dt if dt else 0.0}
+    log.info("%d dosya, %d bar (%d tekrar atıldı) %.2f sn | %.0f satır/sn",
+             len(files), rows, dups, dt, summary["rows_per_sec"])
+    return summary
+
+
+def main():
+    from utils.logger import setup_logger
+    setup_logger("KlineImport")
+    ap = argparse.ArgumentParser(description="Zip kline arşivlerini OHLCV deposuna aktar")
+    ap.add_argument("root")
+    ap.add_argument("--store", default="data/store")
+    ap.add_argument("--workers", type=int, default=None)
+    args = ap.parse_args()
+    import_archives(args.root, args.store, workers=args.workers)
+
+
+if __name__ == "__main__":
+    main()
@@ -3,12 +3,14 @@ from binance.exceptions import BinanceAPIException
 from binance.enums import *
 from utils.logger import setup_logger
 from utils.interfaces import IBroker
+from live.rest_scheduler import ScheduledClient
 import math
 class BinanceBroker(IBroker):
     """Binance API'yi saran IBroker implementasyonu"""
 
     def __init__(self, client):
-        self.client = client
+        # REST çağrıları ağırlık kovasından geçsin (PositionManager da bunu kullanır)
+        self.client = client if isinstance(client, ScheduledClient) else ScheduledClient(client)
         self.log = setup_logger("BinanceBroker")
 
     async def get_mark_price(self, symbol: str) -> float:
@@ -1,11 +1,14 @@
 # live_engine.py – SOLID refactor: yalnızca orkestrasyon
 import asyncio
-from utils.bar_store import BarStore
+from collections import defaultdict
+from utils.bar_store import BarStore, pack_snapshot, write_snapshot
+from utils.indicator_cache import IndicatorCache
 from utils.interfaces import IBroker, IStrategy
 from strategies import load_strategy
 from live.position_manager import PositionManager
 from live.broker_binance import BinanceBroker
 from live.streamer import Streamer
+from utils.ohlcv_store import OHLCVStore
 from utils.logger import setup_logger
 log = setup_logger("LiveEngine")
 
@@ -16,18 +19,14 @@ class LiveEngine:
         self.broker  = broker          # IBroker implementasyonu
         self.bar_store = BarStore()    # ⬅︎ merkezi tampon artık burada!
 
-        # — Strateji konfiglerini hazırlayıp örneklerini yarat —
-        self.strategies = []
-        for scfg in cfg.get_strategies():
-            instance = load_strategy(scfg,
-                                     bar_store = self.bar_store,
-                                     symbol     = scfg["coins"][0],   # örnek
-                                     timeframe  = scfg["timeframe"])
-            self.strategies.append({**scfg, "instance": instance})
+        # — Strateji konfigleri; örnekler semboller çözülünce yaratılır —
+        self.strategies = cfg.get_strategies()
+        # dispatch[(symbol, timeframe)] = [(scfg, instance), ...]
+        self.dispatch: dict[tuple[str, str], list] = {}
         self.pos_mgr = PositionManager(self.broker, base_capital=cfg.get_base_usdt_per_trade(),
                                        max_concurrent=cfg.get_max_concurrent())
         # — Zaman dilimlerini çıkar —
-        self.timeframes = list(s["timeframe"] for s in self.strategies)
+        self.timeframes = list(dict.fromkeys(s["timeframe"] for s in self.strategies))
         # Streamer henüz oluşturulmadı; run() içinde —
         self.streamer = None
         self.symbols  = []
@@ -38,44 +37,147 @@ class LiveEngine:
         self.symbols = await Streamer.resolve_symbols(
             self.broker.client, self.cfg.get_coins())
 
-        # 2) Streamer oluştur (BarStore referansı veriyoruz)
+        # 2) (sembol, tf) → strateji örnekleri tablosu
+        self._build_dispatch()
+
+        # 3) Streamer oluştur (BarStore referansı veriyoruz)
+        store_dir = self.cfg.get_store_dir()
         self.streamer = Streamer(self.broker.client,
                                  self.symbols,
                                  self.timeframes,
-                                 bar_store=self.bar_store)
+                                 bar_store=self.bar_store,
+                                 store=OHLCVStore(store_dir) if store_dir else None)
 
-        # 3) Geçmiş mumları yükle
+        # 4) Geçmiş mumları yükle – anlık görüntü varsa yalnız eksik barlar
+        snap = self.cfg.get_snapshot_path()
+        if snap:
+            n = self.bar_store.load_snapshot(snap)
+            log.info("Anlık görüntüden %s (sembol, tf) yüklendi: %s", n, snap)
         await self.streamer.preload_history(
             self.symbols, self.timeframes,
             limit=self.cfg.get_history_limit(),
             batch=self.cfg.get_preload_batch())
 
-        # 4) Canlı akışı başlat
+        # 5) Canlı akışı başlat
         await self.streamer.start()
         log.info("Canlı motor başladı: %s sembol | tf=%s",
                  len(self.symbols), self.timeframes)
+        saver = (asyncio.create_task(self._snapshot_loop(snap, self.cfg.get_snapshot_every()))
+                 if snap else None)
 
         try:
             while True:
-                bar = await self.streamer.get()      # sadece tetikleyici
-                sym, tf = bar["s"], bar["k"]["i"]
+                event = await self.streamer.get()    # bir tf için toplu kapanış
+                await self._on_batch(event["i"], [b["s"] for b in event["bars"]])
+        finally:
+            if saver is not None:
+                saver.cancel()
+                await asyncio.gather(saver, return_exceptions=True)
+                try:
+                    self.bar_store.save_snapshot(snap)   # kapanışta son durum
+                except OSError as e:
+                    log.warning("Anlık görüntü yazılamadı: %s", e)
+            await self.streamer.stop()
 
-                for s in self.strategies:
-                    if sym not in s["coins"] or tf != s["timeframe"]:
-                        continue
-                    inst = s["instance"]
-                    sig  = inst.generate_signal(sym)  # BarStore'dan okuyor
+    async def _save_snapshot(self, path):
+        """
+        Halkalar döngüde küçük gruplar hâlinde kopyalanır (gruplar arasında
+        bar kapanışları işlenebilir); birleştirme + disk yazımı executor’da.
+        """
+        parts = []
+        for part in self.bar_store.iter_snapshot():
+            parts.extend(part)
+            await asyncio.sleep(0)
+        await asyncio.get_running_loop().run_in_executor(
+            None, lambda: write_snapshot(path, pack_snapshot(parts)))
+
+    async def _snapshot_loop(self, path, every: float):
+        while True:
+            await asyncio.sleep(every)
+            try:
+                await self._save_snapshot(path)
+            except OSError as e:
+                log.warning("Anlık görüntü yazılamadı: %s", e)
+
+    # -------------------------------------------------------------
+    def _expand_coins(self, coins) -> list[str]:
+        """Strateji coin listesini çözülmüş sembollere indirger (ALL_USDT → hepsi)."""
+        if any(str(c).upper() == "ALL_USDT" for c in coins):
+            return list(self.symbols)
+        resolved = set(self.symbols)
+        wanted   = (str(c).upper().replace("/", "") for c in coins)
+        return [c for c in dict.fromkeys(wanted) if c in resolved]
 
+    def _build_dispatch(self):
+        """
+        Her (sembol, timeframe) için o sembole ait hafif strateji
+        örneklerini bir kez yaratır; bar başına arama O(1) olur.
+        Bellek ~ sembol × strateji‑girdisi kadar doğrusal büyür.
+        """
+        table = defaultdict(list)
+        for scfg in self.strategies:
+            tf = scfg["timeframe"]
+            for sym in self._expand_coins(scfg["coins"]):
+                inst = load_strategy(scfg,
+                                     bar_store = self.bar_store,
+                                     symbol    = sym,
+                                     timeframe = tf)
+                table[(sym, tf)].append((scfg, inst))
+        self.dispatch = dict(table)
+        log.info("Dispatch tablosu: %s (sembol, tf) anahtarı, %s strateji örneği",
+                 len(self.dispatch), sum(map(len, self.dispatch.values())))
+
+    def _evaluate(self, tf, symbols) -> list[tuple[str, dict, object]]:
+        """Kapanan semboller için (sembol, scfg, sinyal) listesi; sinyali olmayanlar atlanır."""
+        groups: dict[int, tuple[dict, list]] = {}
+        for sym in symbols:
+            for scfg, inst in self.dispatch.get((sym, tf), ()):
+                groups.setdefault(id(scfg), (scfg, []))[1].append((sym, inst))
+
+        out = []
+        for scfg, members in groups.values():
+            proto = members[0][1]
+            if proto.incremental:
+                # göstergeler BarStore kapanışında O(1) ilerledi; tampon
+                # üzerinde matris çekirdeği koşturulmaz
+                sigs = proto.stream_signals_batch([inst for _, inst in members])
+                out.extend((sym, scfg, sig)
+                           for (sym, _), sig in zip(members, sigs) if sig)
+            elif len(members) > 1 and proto.has_batch():
+                for syms, m in self.bar_store.get_matrices([s for s, _ in members], tf):
+                    if m["close"].shape[1] < 2:
+                        continue
+                    sigs = proto.generate_signals_batch(
+                        m["open"], m["high"], m["low"], m["close"], m["volume"])
+                    out.extend((sym, scfg, int(sig))
+                               for sym, sig in zip(syms, sigs) if sig)
+            else:
+                for sym, inst in members:
+                    sig = inst.generate_signal(sym)  # BarStore'dan okuyor
                     if sig:
-                        await self.pos_mgr.open_position(
-                            sym,  1 if sig == "+1" else -1,
-                            s["name"],
-                            leverage   = s["effective_params"]["leverage"],
-                            sl_pct     = s["effective_params"]["sl_pct"],
-                            tp_pct     = s["effective_params"]["tp_pct"],
-                            expire_sec = s["effective_params"]["expire_sec"],
-                            timeframes = tf)
-                    else:
-                        await self.pos_mgr.update_all()
-        finally:
-            await self.streamer.stop()
\ No newline at end of file
+                        out.append((sym, scfg, sig))
+            metrics = proto.batch_metrics()
+            if metrics:
+                log.debug("%s [%s] toplu çağrı: %s sembol | %s",
+                          scfg["name"], tf, len(members), metrics)
+        return out
+
+    async def _on_batch(self, tf, symbols):
+        """
+        Aynı sınırda kapanan tüm semboller için etkilenen her
+        (sembol, strateji) çiftini tek geçişte değerlendirir. Toplu API’yi
+        destekleyen stratejiler sembol matrisi üzerinde tek çağrıyla
+        çalışır; diğerleri sembol başına generate_signal kullanır.
+        """
+        for sym, s, sig in self._evaluate(tf, symbols):
+            await self.pos_mgr.open_position(
+                sym,  int(sig),
+                s["name"],
+                leverage   = s["effective_params"]["leverage"],
+                sl_pct     = s["effective_params"]["sl_pct"],
+                tp_pct     = s["effective_params"]["tp_pct"],
+                expire_sec = s["effective_params"]["expire_sec"],
+                timeframes = tf)
+        await self.pos_mgr.update_all()
+        log.debug("%s kapanışı: %s sembol | gösterge önbelleği %s",
+                  tf, len(symbols), IndicatorCache.attach(self.bar_store).stats())
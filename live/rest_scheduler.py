@@ -0,0 +1,202 @@
+# live/rest_scheduler.py
+"""
+Tüm Binance REST çağrılarının geçtiği, ağırlık farkındalıklı zamanlayıcı.
+
+Binance USDⓈ‑M vadeli IP sınırı dakikalık pencerede toplam istek
+ağırlığıdır (varsayılan 2400). Zamanlayıcı bu pencereyi yerelde bir kova
+olarak izler: her çağrı uç noktasının ağırlığını (``request_weight``)
+kovadan düşer, kova dolunca istek bir sonraki pencereye kadar bekler.
+Yanıttaki ``x-mbx-used-weight-1m`` başlığı kovayı sunucunun gördüğü
+gerçek kullanıma eşitler (başka süreçler / elle yapılan çağrılar da
+hesaba girer). 429 / 418 yanıtında ``Retry-After`` kadar tüm kuyruk durur.
+
+Bekleyenler öncelik sırasıyla geçer: ORDER (emir, pozisyon) < NORMAL <
+PRELOAD (geçmiş mum yükleme). Kova boşalınca önce emirler çıkar; sabit
+``sleep`` yok, preload sınırın izin verdiği en yüksek hızla ilerler.
+
+    sched  = RestScheduler(limit=2400)
+    client = ScheduledClient(async_client, sched)      # aynı API
+    await client.futures_klines(symbol="BTCUSDT", interval="1m", limit=500)
+    await client.futures_klines(..., priority=ORDER)   # öncelik elle
+"""
+from __future__ import annotations
+
+import asyncio
+import heapq
+import itertools
+import math
+import time
+
+from binance.exceptions import BinanceAPIException
+from utils.logger import setup_logger
+
+__all__ = ["ORDER", "NORMAL", "PRELOAD", "WEIGHTS", "request_weight",
+           "RestScheduler", "ScheduledClient"]
+
+log = setup_logger("RestScheduler")
+
+ORDER, NORMAL, PRELOAD = 0, 1, 2
+
+# uç nokta → IP ağırlığı (Binance USDⓈ‑M dokümanı); listede olmayan → 1
+WEIGHTS = {
+    "futures_exchange_info":          1,
+    "futures_mark_price":             1,      # sembolsüz çağrı → 10
+    "futures_create_order":           1,
+    "futures_cancel_all_open_orders": 1,
+    "futures_change_leverage":        1,
+    "futures_change_margin_type":     1,
+    "futures_position_information":   5,
+    "futures_account_balance":        5,
+}
+
+# varsayılan öncelikler; listede olmayan → NORMAL
+PRIORITY = {
+    "futures_create_order":           ORDER,
+    "futures_cancel_all_open_orders": ORDER,
+    "futures_change_leverage":        ORDER,
+    "futures_change_margin_type":     ORDER,
+    "futures_position_information":   ORDER,
+    "futures_mark_price":             ORDER,
+    "futures_klines":                 PRELOAD,
+}
+
+
+def request_weight(method: str, params: dict) -> int:
+    """Tek çağrının IP ağırlığı (klines ağırlığı limit’e bağlıdır)."""
+    if method == "futures_klines":
+        n = int(params.get("limit", 500))
+        return 1 if n < 100 else 2 if n < 500 else 5 if n <= 1000 else 10
+    if method == "futures_mark_price" and "symbol" not in params:
+        return 10
+    return WEIGHTS.get(method, 1)
+
+
+class RestScheduler:
+    """
+    limit   : dakikalık ağırlık sınırı (borsanın bildirdiği)
+    safety  : sınırın kullanılacak payı – elle yapılan çağrılara boşluk
+    skew    : pencere sıfırlaması bu kadar sn geç yapılır (yerel saat
+              sunucudan ileride olsa da eski pencereye istek düşmesin)
+    retries : 429 sonrası emir dışı çağrıların yeniden deneme sayısı
+    """
+
+    def __init__(self, limit: int = 2400, *, window: float = 60.0,
+                 safety: float = 0.9, skew: float = 1.0, retries: int = 3,
+                 clock=time.time):
+        self.capacity = max(int(limit * safety), 1)
+        self.window   = window
+        self.skew     = skew
+        self.retries  = retries
+        self._clock   = clock
+        self._win     = None                 # geçerli pencere no
+        self._used    = 0                    # bu penceredeki ağırlık
+        self._paused  = 0.0                  # Retry-After bitişi
+        self._heap    = []                   # (öncelik, sıra, ağırlık, future)
+        self._seq     = itertools.count()
+        self._timer   = None
+        self.stats    = {"requests": 0, "weight": 0, "throttled": 0}
+
+    # ------------- kova -------------
+    def _roll(self, now: float) -> None:
+        w = math.floor((now - self.skew) / self.window)
+        if w != self._win:
+            self._win, self._used = w, 0
+
+    def _pump(self) -> None:
+        """Sıradaki bekleyenleri kovanın izin verdiği kadar serbest bırakır."""
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        now = self._clock()
+        self._roll(now)
+        while self._heap:
+            _, _, w, fut = self._heap[0]
+            if fut.done():                   # iptal edilmiş bekleyen
+                heapq.heappop(self._heap)
+                continue
+            if now < self._paused:
+                delay = self._paused - now
+            elif self._used + w > self.capacity:
+                delay = (self._win + 1) * self.window + self.skew - now
+            else:
+                heapq.heappop(self._heap)
+                self._used += w
+                fut.set_result(self._win)
+                continue
+            # baştaki (en öncelikli) sığmıyor: arkadakiler de bekler
+            loop = asyncio.get_running_loop()
+            self._timer = loop.call_later(max(delay, 1e-3), self._pump)
+            return
+
+    async def acquire(self, weight: int, priority: int = NORMAL) -> int:
+        """Ağırlık kadar yer açılınca döner; izin verilen pencere no’su."""
+        fut = asyncio.get_running_loop().create_future()
+        heapq.heappush(self._heap, (priority, next(self._seq),
+                                    min(weight, self.capacity), fut))
+        self._pump()
+        return await fut
+
+    def observe(self, headers, win: int) -> None:
+        """Yanıt başlığındaki kullanılan ağırlığı kovaya yansıtır."""
+        if not headers:
+            return
+        used = headers.get("x-mbx-used-weight-1m") or headers.get("X-MBX-USED-WEIGHT-1M")
+        if used is not None and win == self._win:
+            self._used = max(self._used, int(used))
+
+    def pause(self, sec: float) -> None:
+        """Tüm kuyruğu sec saniye durdurur (429 / 418)."""
+        self._paused = max(self._paused, self._clock() + sec)
+        self._used = self.capacity
+
+    # ------------- çağrı -------------
+    async def call(self, client, method: str, *, priority: int | None = None, **params):
+        """client.<method>(**params) çağrısını kovadan geçirerek yapar."""
+        prio = PRIORITY.get(method, NORMAL) if priority is None else priority
+        weight = request_weight(method, params)
+        fn = getattr(client, method)
+        for attempt in range(self.retries + 1):
+            win = await self.acquire(weight, prio)
+            self.stats["requests"] += 1
+            self.stats["weight"] += weight
+            try:
+                res = await fn(**params)
+            except BinanceAPIException as e:
+                if e.status_code not in (418, 429):
+                    raise
+                headers = getattr(e.response, "headers", None) or {}
+                sec = float(headers.get("Retry-After", self.window))
+                self.pause(sec)
+                self.stats["throttled"] += 1
+                log.warning("%s: %s – kuyruk %.0f sn durduruldu", method, e.status_code, sec)
+                if e.status_code == 418 or prio == ORDER or attempt == self.retries:
+                    raise
+                continue
+            self.observe(getattr(getattr(client, "response", None), "headers", None), win)
+            return res
+
+
+class ScheduledClient:
+    """
+    AsyncClient sarmalayıcı: ``futures_*`` çağrıları zamanlayıcıdan geçer,
+    diğer her şey (tld, close_connection, socket yöneticisi için alanlar)
+    doğrudan alttaki istemciye gider. Çağrıya ``priority=`` verilebilir.
+    """
+
+    def __init__(self, client, scheduler: RestScheduler | None = None):
+        self._client   = client
+        self.scheduler = scheduler or RestScheduler()
+
+    @property
+    def raw(self):
+        return self._client
+
+    def __getattr__(self, name):
+        attr = getattr(self._client, name)
+        if not (name.startswith("futures_") and callable(attr)):
+            return attr
+
+        async def scheduled(*, priority: int | None = None, **params):
+            return await self.scheduler.call(self._client, name,
+                                             priority=priority, **params)
+        return scheduled
@@ -1,33 +1,49 @@
 # live/streamer.py
 import asyncio, time
-from collections import defaultdict
+import numpy as np
 from utils.bar_store import BarStore
+from utils.ohlcv_store import OHLCVStore
 from utils.logger import setup_logger
 from utils.interfaces import IStreamer
+from utils.timeframes import TF_SEC
 from binance import BinanceSocketManager
 import asyncio
 
 log = setup_logger("Streamer")
 
-TF_SEC = {"1m":60, "5m":300, "15m":900, "30m":1800,
-          "1h":3600, "2h":7200, "4h":14400,
-          "6h":21600, "8h":28800, "12h":43200}
 
 class Streamer(IStreamer):
     
-    def __init__(self, client, symbols, intervals, bar_store: BarStore):
+    def __init__(self, client, symbols, intervals, bar_store: BarStore,
+                 close_delay: float = 1.0, store: OHLCVStore | None = None):
         self.client   = client
         self.symbols  = [s.upper().replace("/","") for s in symbols]
         self.intervals= intervals
         self.bar_store= bar_store
         self.queue    = asyncio.Queue()
         self.bsm      = BinanceSocketManager(self.client)
-        
-        # partial bar tamponu
-        self.partial = defaultdict(
-            lambda: {"o":None,"h":0,"l":1e18,"c":None,
-                     "v":0,"start":None,"i":None,"x":False}
-        )
+
+        # sembol → satır indeksi (frame başına O(1) arama)
+        self._sym_idx = {s: i for i, s in enumerate(self.symbols)}
+        self._tf_sec  = np.array([TF_SEC[tf] for tf in intervals], dtype=np.int64)
+
+        # partial bar durumu: (timeframe, sembol) matrisleri
+        shape = (len(intervals), len(self.symbols))
+        self._o     = np.zeros(shape)
+        self._h     = np.zeros(shape)
+        self._l     = np.zeros(shape)
+        self._c     = np.zeros(shape)
+        self._v     = np.zeros(shape)
+        self._start = np.full(shape, -1, dtype=np.int64)   # -1 → açık bar yok
+        # sınırı geçmiş ama close_delay dolmadığı için henüz kapanmamış
+        # önceki bar: (o, h, l, c, v) × (timeframe, sembol) + açılış zamanı
+        self._prev  = np.zeros((5,) + shape)
+        self._pstart = np.full(shape, -1, dtype=np.int64)
+        # timeframe başına son kapatılan sınır (sn)
+        self._epoch = np.full(len(intervals), -1, dtype=np.int64)
+        self.close_delay = close_delay
+        # yerel OHLCV deposu: ısınma önce buradan, REST yalnız eksik kuyruk
+        self.store = store
 
     # -----------------------------------------------------------------
     async def _fetch_kline(self, client, sym, tf, limit):
@@ -38,29 +54,82 @@ class Streamer(IStreamer):
             log.warning("%s | %s preload hata: %s", sym, tf, e)
             return sym, tf, None
     
+    def _preload_local(self, sym, tf, limit, now_ms):
+        """
+        Depodaki son `limit` barı BarStore’a yükler; REST’ten çekilmesi
+        gereken bar sayısını döner. BarStore anlık görüntüden zaten
+        doluysa yalnız son bardan bu yana eksikler istenir. Depo / anlık
+        görüntü, eksik kuyruk `limit`’i aşacak kadar eskiyse kullanılmaz
+        (tamponda boşluk kalmasın).
+        """
+        last = self.bar_store.last_ts(sym, tf)          # anlık görüntüden gelen
+        if last is not None:
+            missing = (now_ms - last) // (TF_SEC[tf] * 1000)
+            if missing < limit:
+                return max(int(missing), 1)
+            self.bar_store.drop(sym, tf)                  # bayat: baştan yükle
+        if self.store is None:
+            return limit
+        cols = self.store.tail(sym, tf, limit)
+        if len(cols["t"]) == 0:
+            return limit
+        missing = (now_ms - int(cols["t"][-1])) // (TF_SEC[tf] * 1000)
+        if missing >= limit:
+            return limit
+        for t, o, h, l, c, v in zip(cols["t"].tolist(), *(cols[f].tolist() for f in
+                                    ("open", "high", "low", "close", "volume"))):
+            self.bar_store.add_bar(sym, tf, {"t": t, "o": o, "h": h, "l": l,
+                                             "c": c, "v": v, "x": True, "i": tf})
+        log.info("Preloaded %s × %s bars (%s) – yerel depo", sym, len(cols["t"]), tf)
+        return max(int(missing), 1)                   # açık (son) bar dahil
+
+    def _store_klines(self, sym, tf, klines, now_ms):
+        """Kapanmış REST mumlarını depoya ekler (açık bar hariç)."""
+        closed = [k[:6] for k in klines if k[6] < now_ms]
+        if self.store is None or not closed:
+            return
+        arr = np.array(closed, dtype=float)
+        self.store.append(sym, tf, {"t": arr[:, 0].astype(np.int64), "open": arr[:, 1],
+                                    "high": arr[:, 2], "low": arr[:, 3],
+                                    "close": arr[:, 4], "volume": arr[:, 5]})
+
     async def preload_history(self, symbols, intervals, limit=250, batch=50):
+        """
+        Tüm (sembol, tf) çiftleri için eksik geçmişi çeker. Hız sınırını
+        istemcinin REST zamanlayıcısı (live.rest_scheduler) belirler;
+        `batch` yalnız aynı anda açık istek sayısını sınırlar.
+        """
+        now_ms = int(time.time() * 1000)
+        gate = asyncio.Semaphore(max(int(batch), 1))
+
+        async def fetch(sym, tf, n):
+            async with gate:
+                return await self._fetch_kline(self.client, sym, tf, n)
+
         tasks = []
         for tf in intervals:
             for sym in symbols:
-                tasks.append(self._fetch_kline(self.client, sym, tf, limit))
-
-        # batch‑batch gönder, Binance weight sınırına takılma
-        for i in range(0, len(tasks), batch):
-            chunk = tasks[i:i + batch]
-            results = await asyncio.gather(*chunk)
-            for sym, tf, klines in results:
-                if not klines:
-                    continue
-                for k in klines:
-                    self.bar_store.add_bar(sym, tf, {
-                        "t":k[0],"T":k[6],"o":k[1],"h":k[2],
-                        "l":k[3],"c":k[4],"v":k[5],
-                        "x":True,"i":tf})
-                log.info("Preloaded %s × %s bars (%s)",
-                        sym, len(klines), tf)
-
-            # Binance weight rahatlasın
-            await asyncio.sleep(1)
+                n = self._preload_local(sym, tf, limit, now_ms)
+                tasks.append(fetch(sym, tf, n))
+
+        for done in asyncio.as_completed(tasks):
+            sym, tf, klines = await done
+            # hâlâ açık olan son mum kapanmış sayılmaz; onu stream kurar
+            closed_ms = int(time.time() * 1000)
+            klines = [k for k in klines or () if k[6] < closed_ms]
+            if not klines:
+                continue
+            last = self.bar_store.last_ts(sym, tf)
+            if last is not None:                      # depodan gelenle çakışma
+                klines = [k for k in klines if k[0] > last]
+            self._store_klines(sym, tf, klines, closed_ms)
+            for k in klines:
+                self.bar_store.add_bar(sym, tf, {
+                    "t":k[0],"T":k[6],"o":k[1],"h":k[2],
+                    "l":k[3],"c":k[4],"v":k[5],
+                    "x":True,"i":tf})
+            log.info("Preloaded %s × %s bars (%s)",
+                    sym, len(klines), tf)
 
     # -----------------------------------------------------------------
     async def _stream_aggregate(self):
@@ -68,39 +137,133 @@ class Streamer(IStreamer):
         async with sock as stream:
             async for arr in stream:
                 ts = int(arr[0]["E"]//1000)
-                for t in arr:
-                    sym = t["s"]
-                    if sym not in self.symbols: continue
-                    self._update_partial(sym, float(t["c"]),
-                                         float(t["q"]), ts)
+                idx, price, vol = self._frame_arrays(arr)
+                if idx.size:
+                    self._update_batch(idx, price, vol, ts)
+
+    def _frame_arrays(self, arr):
+        """miniTicker frame → (satır indeksi, close, quote volume) dizileri."""
+        get = self._sym_idx.get
+        n   = len(arr)
+        idx   = np.fromiter((get(t["s"], -1) for t in arr), dtype=np.int64, count=n)
+        price = np.fromiter((t["c"] for t in arr), dtype=float, count=n)
+        vol   = np.fromiter((t["q"] for t in arr), dtype=float, count=n)
+        keep  = idx >= 0
+        return idx[keep], price[keep], vol[keep]
 
     def _update_partial(self, sym, price, vol, ts):
-        for tf in self.intervals:
-            bucket = ts - ts % TF_SEC[tf]
-            buf = self.partial[(sym, tf)]
-            if buf["start"] != bucket:          # bar kapanıyor
-                if buf["start"] is not None:    # eski barı kapat
-                    buf["x"] = True
-                    self.bar_store.add_bar(sym, tf, buf.copy())
-                    asyncio.create_task(
-                        self.queue.put({"s":sym, "k":buf.copy()}))
-                buf.update(o=price,h=price,l=price,c=price,
-                           v=vol,start=bucket,i=tf,x=False)
-            else:                               # bar açık
-                buf["c"] = price
-                buf["h"] = max(buf["h"], price)
-                buf["l"] = min(buf["l"], price)
-                buf["v"] += vol
+        """Tek tick için geriye dönük uyumlu giriş."""
+        i = self._sym_idx.get(sym)
+        if i is None:
+            return
+        self._update_batch(np.array([i]), np.array([float(price)]),
+                           np.array([float(vol)]), ts)
+
+    def _update_batch(self, idx, price, vol, ts):
+        """
+        Bir frame’deki tüm semboller × tüm timeframe’ler için partial
+        barları tek seferde günceller. idx tekrarsız olmalı (miniTicker
+        frame’inde her sembol bir kez gelir).
+        Sınırı close_delay kadar geçmiş timeframe’ler önce toplu kapatılır
+        (_clock ile aynı pay). Pay içinde yeni bara ait tick gelirse eski
+        bar "önceki" yuvasına taşınır; eski bara geç gelen tick’ler oraya
+        işlenir. Kapanmış bara ait tick’ler (bucket < epoch) yok sayılır.
+        """
+        self._close_due(int(ts - self.close_delay))
+        bucket = ts - ts % self._tf_sec
+        rows = np.nonzero(bucket >= self._epoch)[0]
+        if rows.size == 0:
+            return
+        sel    = np.ix_(rows, idx)
+        bucket = bucket[rows, None]
+        start  = self._start[sel]
+        late   = start > bucket                         # önceki (açık) bara geç tick
+        shift  = (start >= 0) & (start < bucket)        # yeni bar, eskisi kapanmadı
+
+        if shift.any():
+            for k, cur in enumerate((self._o, self._h, self._l, self._c, self._v)):
+                self._prev[k][sel] = np.where(shift, cur[sel], self._prev[k][sel])
+            self._pstart[sel] = np.where(shift, start, self._pstart[sel])
+        if late.any():
+            hit = late & (self._pstart[sel] == bucket)
+            po, ph, pl, pc, pv = self._prev
+            ph[sel] = np.where(hit, np.maximum(ph[sel], price), ph[sel])
+            pl[sel] = np.where(hit, np.minimum(pl[sel], price), pl[sel])
+            pc[sel] = np.where(hit, price, pc[sel])
+            pv[sel] = np.where(hit, pv[sel] + vol, pv[sel])
+
+        roll = ~late & (start != bucket)                # yeni bar başlıyor
+        upd  = ~late & ~roll
+        h, l, v = self._h[sel], self._l[sel], self._v[sel]
+        self._o[sel] = np.where(roll, price, self._o[sel])
+        self._h[sel] = np.where(roll, price, np.where(upd, np.maximum(h, price), h))
+        self._l[sel] = np.where(roll, price, np.where(upd, np.minimum(l, price), l))
+        self._c[sel] = np.where(late, self._c[sel], price)
+        self._v[sel] = np.where(roll, vol, np.where(upd, v + vol, v))
+        self._start[sel] = np.where(roll, bucket, start)
+
+    def _bar_dict(self, r, j, slot=None):
+        o, h, l, c, v = slot if slot is not None else (self._o, self._h, self._l,
+                                                       self._c, self._v)
+        start = self._pstart if slot is not None else self._start
+        return {"o": float(o[r, j]), "h": float(h[r, j]),
+                "l": float(l[r, j]), "c": float(c[r, j]),
+                "v": float(v[r, j]),
+                "start": int(start[r, j]), "i": self.intervals[r],
+                "x": True}
+
+    # -----------------------------------------------------------------
+    def _close_due(self, ts):
+        """ts anında sınırı geçmiş tüm timeframe’leri kapat."""
+        bucket = ts - ts % self._tf_sec
+        for r in np.nonzero(bucket > self._epoch)[0]:
+            self._close_tf(r, int(bucket[r]))
+
+    def _close_tf(self, r, boundary):
+        """
+        r. timeframe’de `boundary` öncesinde açılmış tüm barları tek
+        seferde kapatır ve tek bir toplu olay yayınlar:
+            {"i": tf, "t": boundary_ms, "bars": [{"s": sym, "k": kline}, ...]}
+        Önceki yuvadaki barlar (daha eski) açık barlardan önce gelir.
+        """
+        self._epoch[r] = boundary
+        tf   = self.intervals[r]
+        bars = []
+        for row, slot in ((self._pstart[r], self._prev), (self._start[r], None)):
+            js = np.nonzero((row >= 0) & (row < boundary))[0]
+            for j in js:
+                sym = self.symbols[j]
+                bar = self._bar_dict(r, j, slot)
+                self.bar_store.add_bar(sym, tf, bar)
+                bars.append({"s": sym, "k": bar})
+            row[js] = -1
+        if bars:
+            self.queue.put_nowait({"i": tf, "t": boundary * 1000, "bars": bars})
+
+    async def _clock(self):
+        """
+        TF_SEC sınırlarına göre uyanan zamanlayıcı: tick beklemeden
+        sınırı geçen timeframe’leri toplu kapatır. close_delay, sınırdan
+        hemen önce üretilip geç ulaşan tick’lere pay bırakır.
+        """
+        while True:
+            now = time.time() - self.close_delay
+            due = ((now // self._tf_sec + 1) * self._tf_sec).min()
+            await asyncio.sleep(max(float(due - now), 0.0))
+            # erken uyanma olursa bile hedeflenen sınır kapatılır
+            self._close_due(int(max(time.time() - self.close_delay, due)))
 
     # -----------------------------------------------------------------
     async def start(self):
-        self.task = asyncio.create_task(self._stream_aggregate())
+        self.task  = asyncio.create_task(self._stream_aggregate())
+        self.clock = asyncio.create_task(self._clock())
         log.info("Aggregate miniTicker stream açıldı – %s sembol | tf=%s",
                  len(self.symbols), self.intervals)
 
     async def stop(self):
         self.task.cancel()
-        await asyncio.gather(self.task, return_exceptions=True)
+        self.clock.cancel()
+        await asyncio.gather(self.task, self.clock, return_exceptions=True)
         await self.client.close_connection()
         log.info("Streamer durduruldu.")
 
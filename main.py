@@ -10,38 +10,30 @@ from pathlib import Path
 # todo py - venv venv enviroment ekle
 from binance import AsyncClient
 from live.live_engine import LiveEngine
+from live.rest_scheduler import RestScheduler, ScheduledClient
 from utils.config_loaders import ConfigLoader
 
 async def run_backtest(cfg,log):
     """
-    Backtest'i yürütür (Executor içinde, event loop'u bloklamamak için).
+    Tüm strateji × coin × timeframe matrisini back‑test eder (Executor
+    içinde, event loop'u bloklamamak için). Sonuçlar results/ altına
+    satır satır yazılır; yarıda kalan koşu aynı komutla kaldığı yerden
+    devam eder.
     """
-    # Backtest için gerekli modüller
-    from utils.io import load_ohlcv_csv
-    from strategies import load_strategy
-    from backtest.backtester import BacktestEngine
-    from data.data_fetcher import DataFetcher
-
-    sym = cfg["coins"][0]
-    tf = cfg["timeframes"][0]
-    strat_cfg = cfg["strategies"][0]
-    csv_path = Path(f"data/{sym}_{tf}.csv")
-
-    if csv_path.exists():
-        df = load_ohlcv_csv(csv_path)
-    else:
-        try:
-            pair = f"{sym.replace('USDT', '')}/USDT"
-            df = DataFetcher().fetch_ohlcv(pair, tf)
-        except Exception as e:
-            log.error("Backtest için veri alınamadı: %s", e)
-            return None
+    from backtest.runner import run_universe
+    setup_logger("BacktestRunner", level=log.level)   # ilerleme raporları
 
-    strategy = load_strategy(strat_cfg)
-    engine = BacktestEngine(df, strategy, initial_balance=cfg.get("initial_balance", 1000))
+    bt = cfg.config.get("backtest", {}) or {}
     loop = asyncio.get_event_loop()
-    result = await loop.run_in_executor(None, engine.run)
-    return result
+    return await loop.run_in_executor(None, lambda: run_universe(
+        cfg.get_strategies(),
+        bt.get("results", "results/backtest.jsonl"),
+        data_dir=bt.get("data_dir", "data"),
+        store_dir=cfg.get_store_dir(),
+        workers=bt.get("workers"),
+        initial_balance=cfg.config.get("initial_balance", 1000),
+        exits=bt.get("exits", "signal"),
+    ))
 
 async def async_main():
     # Yapılandırma dosyasını yükle
@@ -60,9 +52,9 @@ async def async_main():
     mode = cfg.get_mode().upper()
 
     if mode == "BACKTEST":
-        result = await run_backtest(cfg,log)
-        if result:
-            print("Final bakiye:", result.get("final_balance", "N/A"))
+        summary = await run_backtest(cfg,log)
+        log.info("Back‑test bitti: %(ran)d iş (%(skipped)d atlandı, %(errors)d hata) "
+                 "%(sec).1f sn | %(jobs_per_sec).1f iş/sn | %(bars_per_sec).0f bar/sn", summary)
 
     elif mode == "LIVE":
 
@@ -73,9 +65,11 @@ async def async_main():
 
         # Binance AsyncClient oluştur
         try:
-            client = await AsyncClient.create(api_key, api_secret)
+            raw_client = await AsyncClient.create(api_key, api_secret)
         except Exception as e:
             sys.exit(f"⚠ Binance istemcisi oluşturulamadı: {e}")
+        # Tüm REST çağrıları (broker, pozisyon, streamer) tek ağırlık kovasından geçer
+        client = ScheduledClient(raw_client, RestScheduler(cfg.get_rest_weight_limit()))
 
         # Risk yüzdesine göre işlem başına sermayeyi hesapla
         if cfg.get_risk_pct() is not None:
@@ -101,7 +95,7 @@ async def async_main():
         except Exception as e:
             log.error("LiveEngine çalışırken hata: %s", e)
         finally:
-            await client.close_connection()
+            await raw_client.close_connection()
 
     else:
         sys.exit(f"⚠ Geçersiz mod: {mode} (BACKTEST veya LIVE seçilmeli)")
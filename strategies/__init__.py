@@ -24,6 +24,18 @@ def _discover():
 _STRAT_MODULES = _discover()
 
 # ────────────────────────────────────────────────────────────────────────────
+def strategy_class(name: str):
+    """Modül adından Strategy sınıfı ("super_trend" → super_trend.Strategy)."""
+    if name not in _STRAT_MODULES:
+        raise ValueError(f"Strateji bulunamadı: {name}")
+
+    mod = _STRAT_MODULES[name]
+
+    if not hasattr(mod, "Strategy"):
+        raise AttributeError(f"{name}.py içinde Strategy sınıfı tanımlı değil.")
+    return mod.Strategy
+
+
 def load_strategy(cfg_entry: dict, *, bar_store, symbol: str, timeframe: str):
     """
     cfg_entry: ConfigLoader.get_strategies() çıktısındaki bir eleman
@@ -44,13 +56,7 @@ def load_strategy(cfg_entry: dict, *, bar_store, symbol: str, timeframe: str):
     tech_param = cfg_entry.get("params", {})
     runtime    = cfg_entry.get("effective_params", {})
 
-    if name not in _STRAT_MODULES:
-        raise ValueError(f"Strateji bulunamadı: {name}")
-
-    mod = _STRAT_MODULES[name]
-    
-    if not hasattr(mod, "Strategy"):
-        raise AttributeError(f"{name}.py içinde Strategy sınıfı tanımlı değil.")
+    Strategy = strategy_class(name)
 
     # Teknik + runtime parametrelerini birleştir
     kwargs = {**runtime, **tech_param,
@@ -58,4 +64,4 @@ def load_strategy(cfg_entry: dict, *, bar_store, symbol: str, timeframe: str):
               "symbol":    symbol,
               "timeframe": timeframe}
 
-    return mod.Strategy(**kwargs)
+    return Strategy(**kwargs)
@@ -1,16 +1,39 @@
 from __future__ import annotations
 from abc import ABC, abstractmethod
+from functools import lru_cache
 from typing import Dict, List, Optional
 import numpy as np
 import pandas as pd
+import talib
+from talib import abstract as ta_abstract
 from utils.bar_store import BarStore
+from utils.indicator_cache import FRAME_MEMO, IndicatorCache
+from utils.indicators import IndicatorEngine, Indicator
 from utils.interfaces import IStrategy
 
+@lru_cache(maxsize=None)
+def _talib_inputs(name: str) -> tuple[str, ...]:
+    """talib fonksiyonunun girdi kolonları, ör. ATR → (high, low, close)."""
+    out = []
+    for v in ta_abstract.Function(name).input_names.values():
+        out.extend([v] if isinstance(v, str) else v)
+    return tuple(out)
+
+
 class BaseStrategy(IStrategy):
     """
     BarStore‑tabanlı ortak strateji sınıfı.
     Her strateji tek sembol + tek timeframe için örneklenir.
+
+    Canlı yol iki şekilde çalışabilir:
+      ▸ _live_signal(o, h, l, c, v) : tüm tampon üzerinde referans hesap
+      ▸ _stream_signal()            : artımlı göstergelerle O(1) hesap
+        (incremental = True olan stratejilerde generate_signal bunu kullanır)
     """
+    incremental = False
+    # Back‑test devamı (Checkpoint) için saklanan geçmiş bar sayısı; EMA /
+    # Wilder özyinelemelerinin tohumu unutması için yeterince uzun olmalı.
+    warmup_bars = 1_000
 
     def __init__(
         self,
@@ -28,6 +51,41 @@ class BaseStrategy(IStrategy):
         
     def update_bar(self, symbol: str, bar: dict) -> None:
         return
+
+    # ------------- ARTIMLI GÖSTERGELER -------------
+    @property
+    def indicators(self) -> IndicatorEngine:
+        return IndicatorEngine.attach(self.bar_store)
+
+    def stream(self, name: str, keep: int = 16, **params) -> Indicator:
+        """Bu örneğin (symbol, tf) anahtarı için paylaşılan artımlı gösterge."""
+        return self.indicators.get(self.symbol, self.tf, name, keep=keep, **params)
+
+    # ------------- PAYLAŞILAN ÖNBELLEK -------------
+    @property
+    def cache(self) -> IndicatorCache:
+        return IndicatorCache.attach(self.bar_store)
+
+    def indicator(self, name: str, **params):
+        """
+        talib göstergesini BarStore tamponu üzerinde hesaplar; aynı
+        (symbol, tf, isim, parametre) için bar kapanışı başına en fazla
+        bir kez – kaç strateji isterse istesin.
+            self.indicator("ATR", timeperiod=10)
+        """
+        def compute():
+            buf = self.bar_store.get_ohlcv(self.symbol, self.tf)
+            out = getattr(talib, name)(*(buf[k] for k in _talib_inputs(name)), **params)
+            for arr in (out if isinstance(out, tuple) else (out,)):
+                arr.flags.writeable = False      # paylaşılan sonuç
+            return out
+        return self.cache.get(self.symbol, self.tf, name,
+                              tuple(sorted(params.items())), compute)
+
+    def _stream_signal(self) -> Optional[str]:
+        """incremental stratejiler override eder."""
+        raise NotImplementedError
+
     # ------------- CANLI API -------------
     @abstractmethod
     def _live_signal(
@@ -44,7 +102,10 @@ class BaseStrategy(IStrategy):
         buf = self.bar_store.get_ohlcv(self.symbol, self.tf)
         if len(buf["close"]) < 2:
             return None
+        if self.incremental:
+            return self._stream_signal()
 
+        # BarStore float64 görünüm döndürür → asarray kopyalamaz
         o = np.asarray(buf["open"],   dtype=float)
         h = np.asarray(buf["high"],   dtype=float)
         l = np.asarray(buf["low"],    dtype=float)
@@ -52,12 +113,70 @@ class BaseStrategy(IStrategy):
         v = np.asarray(buf["volume"], dtype=float)
         return self._live_signal(o, h, l, c, v)
 
+    # ------------- KESİTSEL TOPLU API (opsiyonel) -------------
+    def generate_signals_batch(
+        self,
+        o: np.ndarray,
+        h: np.ndarray,
+        l: np.ndarray,
+        c: np.ndarray,
+        v: np.ndarray,
+    ) -> np.ndarray:
+        """
+        Aynı timeframe’de kapanan semboller için (sembol × bar) matrisleri
+        alır, sembol başına +1/0/‑1 vektörü döner. Parametreler bu örnekten
+        okunur; LiveEngine aynı konfig girdisine ait tüm semboller için
+        tek çağrı yapar.
+        """
+        raise NotImplementedError
+
+    @classmethod
+    def has_batch(cls) -> bool:
+        return cls.generate_signals_batch is not BaseStrategy.generate_signals_batch
+
+    def stream_signals_batch(self, insts: list) -> list:
+        """
+        incremental stratejilerin kesitsel yolu: aynı konfig girdisine ait
+        örnekler (bu örnek dahil) için sinyal listesi. Her sinyal
+        IndicatorEngine durumundan O(1) okunur; model çağrısı gibi semboller
+        arasında paylaşılabilecek işi olan stratejiler override eder.
+        """
+        return [inst.generate_signal() for inst in insts]
+
+    def batch_metrics(self) -> dict:
+        """Toplu çağrı ölçümleri (ör. model gecikmesi); yoksa boş."""
+        return {}
+
     # ------------- BACKTEST API ----------
     @staticmethod
     @abstractmethod
     def generate_signals(df: pd.DataFrame) -> pd.Series:
         """Vectorized +1/0/‑1 sinyalleri döndürür."""
 
+    def backtest_signals(self, df: pd.DataFrame) -> pd.Series:
+        """
+        BacktestEngine giriş noktası: örneğin parametreleriyle
+        generate_signals. Parametreleri statik imzayla alan stratejiler
+        override eder.
+        """
+        return self.generate_signals(df)
+
+    @staticmethod
+    def frame_indicator(df: pd.DataFrame, name: str, **params):
+        """
+        talib göstergesi DataFrame kolonları üzerinde; df.attrs["memo_key"]
+        varsa (ör. paylaşılan bellek bloğu) sonuç süreç içinde kombinasyonlar
+        arasında paylaşılır.
+            BaseStrategy.frame_indicator(df, "RSI", timeperiod=14)
+        """
+        def compute():
+            cols = (df[k].to_numpy(dtype=float) for k in _talib_inputs(name))
+            out = getattr(talib, name)(*cols, **params)
+            for arr in (out if isinstance(out, tuple) else (out,)):
+                arr.flags.writeable = False      # paylaşılan sonuç
+            return out
+        return FRAME_MEMO.get(df, name, tuple(sorted(params.items())), compute)
+
     # ------------- Yardımcı --------------
     def sl_pct(self) -> float:
         """PositionManager risk hesabı için."""
@@ -1,6 +1,7 @@
 # strategies/rsi_strategy.py
 import pandas as pd
 from strategies.base_strategy import BaseStrategy
+from utils.kernels import rsi_matrix
 import talib
 import numpy as np
 
@@ -8,6 +9,7 @@ class Strategy(BaseStrategy):
     """
     RSI THRESHOLD STRATEGY
     """
+    incremental = True
 
     def __init__(self, rsi_period: int = 14, rsi_overbought: int = 80, rsi_oversold: int = 20, **kw):
         super().__init__(rsi_period=rsi_period, overbought=rsi_overbought, oversold=rsi_oversold, **kw)
@@ -15,10 +17,15 @@ class Strategy(BaseStrategy):
         self.ob = rsi_overbought
         self.os = rsi_oversold
 
+    def _stream_signal(self):
+        return self._decide(self.stream("RSI", period=self.rsi_period).value)
+
     def _live_signal(self, o, h, l, c, v):
         if c.size < self.rsi_period:
             return None
-        rsi = talib.RSI(c, timeperiod=self.rsi_period)[-1]
+        return self._decide(talib.RSI(c, timeperiod=self.rsi_period)[-1])
+
+    def _decide(self, rsi):
         if np.isnan(rsi):
             return None
         if rsi > self.ob:
@@ -27,9 +34,16 @@ class Strategy(BaseStrategy):
             return +1
         return None
 
+    def generate_signals_batch(self, o, h, l, c, v):
+        rsi = rsi_matrix(c, self.rsi_period)[:, -1]
+        return np.where(rsi > self.ob, -1, np.where(rsi < self.os, 1, 0))
+
+    def backtest_signals(self, df: pd.DataFrame) -> pd.Series:
+        return self.generate_signals(df, self.rsi_period, self.ob, self.os)
+
     @staticmethod
     def generate_signals(df: pd.DataFrame, rsi_period: int = 14, overbought: int = 80, oversold: int = 20) -> pd.Series:
-        rsi = talib.RSI(df["close"].values, timeperiod=rsi_period)
+        rsi = BaseStrategy.frame_indicator(df, "RSI", timeperiod=rsi_period)
         sig = np.where(rsi > overbought, -1, np.where(rsi < oversold, 1, 0))
         return pd.Series(sig, index=df.index, name="signal")
 
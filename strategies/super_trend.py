@@ -2,60 +2,63 @@ import pandas as pd
 import numpy as np
 import talib
 from strategies.base_strategy import BaseStrategy
+from utils.kernels import atr_matrix, supertrend, supertrend_matrix
 
 
 class Strategy(BaseStrategy):
     """SupertrendStrategy with ConfigLoader integration."""
+    incremental = True
 
     def __init__(self, atr_period: int = 10, multiplier: float = 2.0, **kw):
         super().__init__(atr_period=atr_period, multiplier=multiplier, **kw)
         self.atr_period = atr_period
         self.multiplier = multiplier
 
-    def _live_signal(self, o, h, l, c, v):
+    def _stream_signal(self):
+        c = self.bar_store.get_ohlcv(self.symbol, self.tf)["close"]
         if len(c) < self.atr_period + 2:
             return None
+        st = self.stream("SUPERTREND", period=self.atr_period,
+                         multiplier=self.multiplier).tail(2)
+        return self._cross(c[-2:], st)
 
-        # Supertrend calculation
+    def _live_signal(self, o, h, l, c, v):
+        if len(c) < self.atr_period + 2:
+            return None
         atr = talib.ATR(h, l, c, timeperiod=self.atr_period)
-        upperband = (h + l) / 2 + (self.multiplier * atr)
-        lowerband = (h + l) / 2 - (self.multiplier * atr)
-
-        supertrend = np.zeros_like(c)
-        supertrend[0] = upperband[0]
+        return self._cross(c[-2:], supertrend(h, l, c, atr, self.multiplier)[-2:])
 
-        for i in range(1, len(c)):
-            if c[i - 1] <= supertrend[i - 1]:
-                supertrend[i] = min(upperband[i], supertrend[i - 1])
-            else:
-                supertrend[i] = max(lowerband[i], supertrend[i - 1])
+    def generate_signals_batch(self, o, h, l, c, v):
+        if c.shape[1] < self.atr_period + 2:
+            return np.zeros(c.shape[0], dtype=int)
+        atr = atr_matrix(h, l, c, self.atr_period)
+        st  = supertrend_matrix(h, l, c, atr, self.multiplier)[:, -2:]
+        c   = c[:, -2:]
+        bull = (c[:, 0] <= st[:, 0]) & (c[:, 1] > st[:, 1])
+        bear = (c[:, 0] >= st[:, 0]) & (c[:, 1] < st[:, 1])
+        return np.where(bull, 1, np.where(bear, -1, 0))
 
-        # Signal generation logic
-        if c[-2] <= supertrend[-2] and c[-1] > supertrend[-1]:
+    @staticmethod
+    def _cross(c, st):
+        """c, st: son iki close ve supertrend değeri."""
+        if c[-2] <= st[-2] and c[-1] > st[-1]:
             return +1  # Bullish crossover
-        elif c[-2] >= supertrend[-2] and c[-1] < supertrend[-1]:
+        elif c[-2] >= st[-2] and c[-1] < st[-1]:
             return -1  # Bearish crossover
         return None
 
+    def backtest_signals(self, df: pd.DataFrame) -> pd.Series:
+        return self.generate_signals(df, self.atr_period, self.multiplier)
+
     @staticmethod
     def generate_signals(df: pd.DataFrame, atr_period=10, multiplier=2.0) -> pd.Series:
         """Vectorized Supertrend Signal Generation."""
         h, l, c = df["high"].values, df["low"].values, df["close"].values
 
-        atr = talib.ATR(h, l, c, timeperiod=atr_period)
-        upperband = (h + l) / 2 + multiplier * atr
-        lowerband = (h + l) / 2 - multiplier * atr
-
-        supertrend = np.zeros_like(c)
-        supertrend[0] = upperband[0]
-
-        for i in range(1, len(c)):
-            if c[i - 1] <= supertrend[i - 1]:
-                supertrend[i] = min(upperband[i], supertrend[i - 1])
-            else:
-                supertrend[i] = max(lowerband[i], supertrend[i - 1])
+        atr = BaseStrategy.frame_indicator(df, "ATR", timeperiod=atr_period)
+        supertrend_line = supertrend(h, l, c, atr, multiplier)
 
-        trend = c > supertrend
+        trend = c > supertrend_line
         signals = np.zeros(len(c), dtype=int)
         signals[1:][(~trend[:-1]) & trend[1:]] = 1  # Bullish crossover
         signals[1:][trend[:-1] & (~trend[1:])] = -1  # Bearish crossover
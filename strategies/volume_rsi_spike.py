@@ -1,83 +1,256 @@
 # strategies/volume_rsi_spike.py
 from __future__ import annotations
+import time
+from collections import defaultdict
 import numpy as np, pandas as pd, talib
 from utils.bar_store import BarStore
+from utils.indicator_cache import FRAME_MEMO
+from utils.kernels import rsi_matrix
 from utils.model_registry import load as load_model
 from strategies.base_strategy import BaseStrategy
 
 
+class InferenceStats:
+    """Model çağrısı başına satır sayısı ve gecikme (toplu çıkarım ölçümü)."""
+
+    def __init__(self):
+        self.batches = 0
+        self.rows = 0
+        self.total_sec = 0.0
+        self.last_rows = 0
+        self.last_sec = 0.0
+
+    def record(self, rows: int, sec: float) -> None:
+        self.batches += 1
+        self.rows += rows
+        self.total_sec += sec
+        self.last_rows, self.last_sec = rows, sec
+
+    def as_dict(self) -> dict:
+        return {"batches": self.batches, "rows": self.rows,
+                "last_rows": self.last_rows,
+                "last_ms": self.last_sec * 1e3,
+                "avg_ms": self.total_sec * 1e3 / self.batches if self.batches else 0.0,
+                "avg_rows": self.rows / self.batches if self.batches else 0.0}
+
+
+# (timeframe, "buy"|"sell") → InferenceStats; tüm örnekler paylaşır
+INFERENCE_STATS: dict[tuple[str, str], InferenceStats] = defaultdict(InferenceStats)
+
+
 class Strategy(BaseStrategy):
+    incremental = True
+
     # ———— constructor ————
     def __init__(self, bar_store: BarStore, symbol: str, timeframe: str,
                  sl_pct: float = 3.0, **params):
         super().__init__(bar_store, symbol, timeframe, sl_pct, **params)
         self.model_buy  = load_model("volume_rsi_spike", timeframe, "buy")
         self.model_sell = load_model("volume_rsi_spike", timeframe, "sell")
-    
+
     # ———— canlı sinyal ————
     def _live_signal(self, o, h, l, c, v):
-        raw = self._indicator_signal(c, v)            # +1 / -1 / None
+        if len(c) < 60:
+            return None
+        rsi = talib.RSI(c, timeperiod=int(self.params.get("rsi_period", 14)))
+        raw = self._indicator_signal(c, v, rsi)       # +1 / -1 / None
         if not raw:
             return None
 
-        feats = self._features(o, h, l, c, v)
+        feats = self._features(o, h, l, c, v, rsi)    # RSI yeniden hesaplanmaz
+        return raw if self._approve(raw, feats) else None
+
+    def _stream_signal(self):
+        """_live_signal’in artımlı göstergelerle O(1) karşılığı."""
+        raw, feats = self._stream_candidate()
+        return raw if raw and self._approve(raw, feats) else None
+
+    def _stream_candidate(self):
+        """Artımlı göstergelerden (ham sinyal, özellik satırı); aday yoksa (None, None)."""
+        if len(self.bar_store.get_ohlcv(self.symbol, self.tf)["close"]) < 60:
+            return None, None
+        lookback = int(self.params.get("cross_lookback", 4))
+        rsi  = self.stream("RSI", keep=max(16, lookback + 1),
+                           period=int(self.params.get("rsi_period", 14)))
+        vma  = self.stream("SMA", period=20, src="volume")
+        vol  = self.bar_store.get_ohlcv(self.symbol, self.tf)["volume"][-1]
+
+        raw = self._raw_signal(rsi.tail(lookback + 1), vol, vma.value)
+        if not raw:
+            return None, None
+
+        up, mid, lo = self.stream("BBANDS", period=20, nbdevup=2, nbdevdn=2).value
+        feats = np.array([[rsi.value,
+                           self.stream("EMA", period=20).value,
+                           self.stream("EMA", period=50).value,
+                           (up - lo) / mid,
+                           self.stream("MOM", period=10).value,
+                           self.stream("ADX", period=20).value,
+                           vol / vma.value]])
+        return raw, feats
+
+    def _approve(self, raw, feats) -> bool:
         model = self.model_buy if raw == "+1" else self.model_sell
-        approve = bool(model.predict(feats)[0])
-        return raw if approve else None
+        return bool(model.predict(feats)[0])
 
     # ———— 1) ham sinyal ————
-    def _indicator_signal(self, c, v):
+    def _indicator_signal(self, c, v, rsi=None):
         if len(c) < 60:
             return None
 
         rsi_p    = int(self.params.get("rsi_period", 14))
         lookback = int(self.params.get("cross_lookback", 4))
 
-        rsi  = talib.RSI(c, timeperiod=rsi_p)
-        vol  = pd.Series(v, dtype=float)
-        ma20 = vol.rolling(20).mean()
-        if np.isnan(ma20.iloc[-1]):
-            return None
+        if rsi is None:
+            rsi = talib.RSI(c, timeperiod=rsi_p)
+        ma20 = pd.Series(v, dtype=float).rolling(20).mean()
+        return self._raw_signal(rsi[-(lookback + 1):], v[-1], ma20.iloc[-1])
 
-        rng = range(-lookback, 0)
+    def _raw_signal(self, rsi_tail, vol, ma20):
+        """
+        rsi_tail : son cross_lookback + 1 RSI değeri (eski → yeni)
+        vol/ma20 : son barın hacmi ve 20 bar hacim ortalaması
+        """
+        raw = self._raw_signals(np.asarray(rsi_tail, dtype=float)[None, :],
+                                np.array([vol], dtype=float),
+                                np.array([ma20], dtype=float))[0]
+        return {1: "+1", -1: "-1"}.get(int(raw))
+
+    def _raw_signals(self, rsi_tail, vol, ma20):
+        """
+        _raw_signal’in vektör hali: rsi_tail (k × lookback+1), vol/ma20 (k,)
+        → +1 / -1 / 0. BUY koşulu SELL’den önce gelir.
+        """
+        prev, cur = rsi_tail[:, :-1], rsi_tail[:, 1:]
+        ok = ~np.isnan(ma20)
 
         # —— BUY tarafı
-        if self._spike_ok(vol, ma20,
-                          self.params.get("buy_vol_mult", 2)) and \
-           any(rsi[i-1] < self.params.get("buy_low_th", 32)
-               and rsi[i] > self.params.get("buy_high_th", 38) for i in rng):
-            return "+1"
+        buy = ok & self._spike_ok(vol, ma20, self.params.get("buy_vol_mult", 2)) & \
+            ((prev < self.params.get("buy_low_th", 32)) &
+             (cur > self.params.get("buy_high_th", 38))).any(axis=1)
 
         # —— SELL tarafı
-        if self._spike_ok(vol, ma20,
-                          self.params.get("sell_vol_mult", 3)) and \
-           any(rsi[i-1] > self.params.get("sell_high_th", 70)
-               and rsi[i] < self.params.get("sell_low_th", 65) for i in rng):
-            return "-1"
+        sell = ok & self._spike_ok(vol, ma20, self.params.get("sell_vol_mult", 3)) & \
+            ((prev > self.params.get("sell_high_th", 70)) &
+             (cur < self.params.get("sell_low_th", 65))).any(axis=1)
 
-        return None
+        return np.where(buy, 1, np.where(sell, -1, 0))
 
     @staticmethod
     def _spike_ok(vol, ma20, mult):   # yardımcı
-        return vol.iloc[-1] > ma20.iloc[-1] * float(mult)
+        return vol > ma20 * float(mult)
 
     # ———— 2) model özellikleri ————
-    def _features(self, o, h, l, c, v):
-        close, high, low = map(np.asarray, (c, h, l))
+    def _features(self, o, h, l, c, v, rsi=None):
+        return self._feature_matrix(o, h, l, c, v, rsi)[-1:]
+
+    def _feature_matrix(self, o, h, l, c, v, rsi=None):
+        """Her bar için [rsi, ema20, ema50, boll_w, mom, adx20, vol_rat] (n × 7)."""
+        close, high, low = (np.asarray(a, dtype=float) for a in (c, h, l))
         vol = pd.Series(v, dtype=float)
 
-        rsi_val = talib.RSI(close, timeperiod=self.params.get("rsi_period", 14))[-1]
-        ema20   = talib.EMA(close, 20)[-1]
-        ema50   = talib.EMA(close, 50)[-1]
+        if rsi is None:
+            rsi = talib.RSI(close, timeperiod=int(self.params.get("rsi_period", 14)))
         up, mid, lo = talib.BBANDS(close, 20, 2, 2)
-        boll_w  = (up[-1] - lo[-1]) / mid[-1]
-        mom_val = talib.MOM(close, 10)[-1]
-        adx_val = talib.ADX(high, low, close, 20)[-1]
-        vol_rat = vol.iloc[-1] / vol.rolling(20).mean().iloc[-1]
+        vol_rat = (vol / vol.rolling(20).mean()).to_numpy()
 
-        return np.array([[rsi_val, ema20, ema50, boll_w, mom_val, adx_val, vol_rat]])
+        return np.column_stack([rsi,
+                                talib.EMA(close, 20),
+                                talib.EMA(close, 50),
+                                (up - lo) / mid,
+                                talib.MOM(close, 10),
+                                talib.ADX(high, low, close, 20),
+                                vol_rat])
 
-    # ———— toplu back‑test (opsiyonel) ————
-    @staticmethod
-    def generate_signals(df: pd.DataFrame):
-        raise NotImplementedError
+    # ———— 3) kesitsel toplu değerlendirme ————
+    def generate_signals_batch(self, o, h, l, c, v):
+        """
+        Aynı timeframe’de kapanan tüm semboller: ham sinyal vektörel
+        hesaplanır, adayların özellikleri tek matriste toplanır ve her
+        taraf modeli batch başına bir kez çağrılır.
+        """
+        out = np.zeros(c.shape[0], dtype=int)
+        if c.shape[1] < 60:
+            return out
+        lookback = int(self.params.get("cross_lookback", 4))
+        rsi  = rsi_matrix(c, int(self.params.get("rsi_period", 14)))
+        ma20 = v[:, -20:].mean(axis=1)
+        raw  = self._raw_signals(rsi[:, -(lookback + 1):], v[:, -1], ma20)
+
+        for side, name, model in ((1, "buy", self.model_buy),
+                                  (-1, "sell", self.model_sell)):
+            rows = np.nonzero(raw == side)[0]
+            if rows.size == 0:
+                continue
+            feats = np.vstack([self._features(o[i], h[i], l[i], c[i], v[i], rsi[i])
+                               for i in rows])
+            t0 = time.perf_counter()
+            approve = np.asarray(model.predict(feats)).astype(bool)
+            INFERENCE_STATS[(self.tf, name)].record(len(rows), time.perf_counter() - t0)
+            out[rows[approve]] = side
+        return out
+
+    def stream_signals_batch(self, insts):
+        """
+        Kapanan semboller için artımlı yol: adaylar ve özellikleri her
+        örneğin IndicatorEngine durumundan okunur, her taraf modeli yine
+        batch başına bir kez çağrılır.
+        """
+        out = [None] * len(insts)
+        cands = {"+1": [], "-1": []}
+        for i, inst in enumerate(insts):
+            raw, feats = inst._stream_candidate()
+            if raw:
+                cands[raw].append((i, feats))
+
+        for raw, name, model in (("+1", "buy", self.model_buy),
+                                 ("-1", "sell", self.model_sell)):
+            rows = cands[raw]
+            if not rows:
+                continue
+            t0 = time.perf_counter()
+            approve = np.asarray(model.predict(np.vstack([f for _, f in rows]))).astype(bool)
+            INFERENCE_STATS[(self.tf, name)].record(len(rows), time.perf_counter() - t0)
+            for (i, _), ok in zip(rows, approve):
+                if ok:
+                    out[i] = raw
+        return out
+
+    def batch_metrics(self) -> dict:
+        return {side: INFERENCE_STATS[(self.tf, side)].as_dict()
+                for side in ("buy", "sell") if (self.tf, side) in INFERENCE_STATS}
+
+    # ———— toplu back‑test ————
+    def generate_signals(self, df: pd.DataFrame) -> pd.Series:
+        """
+        Tüm seri için vektörel +1/0/‑1: her bar, o bara kadar olan tampon
+        üzerinde _live_signal’in vereceği sonuçla aynıdır. Modeller aday
+        barlar için taraf başına tek predict çağrısı alır.
+        """
+        o, h, l, c, v = (df[k].to_numpy(dtype=float)
+                         for k in ("open", "high", "low", "close", "volume"))
+        out = np.zeros(len(c), dtype=int)
+        if len(c) < 60:
+            return pd.Series(out, index=df.index, name="signal")
+
+        lookback = int(self.params.get("cross_lookback", 4))
+        rsi_p = int(self.params.get("rsi_period", 14))
+        rsi   = self.frame_indicator(df, "RSI", timeperiod=rsi_p)
+        ma20  = FRAME_MEMO.get(df, "VOL_MA20", (), lambda: pd.Series(
+            v, dtype=float).rolling(20).mean().to_numpy())
+
+        # bar i için pencere: rsi[i - lookback .. i] (baş NaN ile doldurulur)
+        padded = np.concatenate([np.full(lookback, np.nan), rsi])
+        tails  = np.lib.stride_tricks.sliding_window_view(padded, lookback + 1)
+        raw = self._raw_signals(tails, v, ma20)
+        raw[:59] = 0                                  # _live_signal: len < 60 → None
+
+        # özellikler yalnızca rsi_period’a bağlı → eşik taramalarında paylaşılır
+        feats = FRAME_MEMO.get(df, "VRS_FEATURES", (("rsi_period", rsi_p),),
+                               lambda: self._feature_matrix(o, h, l, c, v, rsi))
+        for side, model in ((1, self.model_buy), (-1, self.model_sell)):
+            rows = np.nonzero(raw == side)[0]
+            if rows.size:
+                approve = np.asarray(model.predict(feats[rows])).astype(bool)
+                out[rows[approve]] = side
+        return pd.Series(out, index=df.index, name="signal")
@@ -0,0 +1,72 @@
+# tests/test_backtester.py
+import numpy as np
+import pandas as pd
+import pytest
+
+from backtest.backtester import BacktestEngine, TRADE_DTYPE
+from backtest.metrics import calculate_metrics
+
+
+class FixedSignals:
+    def __init__(self, sig):
+        self.sig = sig
+
+    def generate_signals(self, df):
+        return pd.Series(self.sig, index=df.index[:len(self.sig)])
+
+
+def _df(n, seed=0):
+    rng = np.random.default_rng(seed)
+    c = 100 + np.cumsum(rng.normal(0, 1, n))
+    return pd.DataFrame({"open": c, "high": c + 1, "low": c - 1, "close": c,
+                         "volume": rng.random(n)},
+                        index=pd.date_range("2024-01-01", periods=n, freq="1min"))
+
+
+def _run(df, sig, mode):
+    return BacktestEngine(df, FixedSignals(sig), initial_balance=1000, mode=mode).run()
+
+
+@pytest.mark.parametrize("seed", range(6))
+def test_vector_matches_loop(seed):
+    n = 2_000
+    rng = np.random.default_rng(seed)
+    sig = rng.choice([-1.0, 0.0, 1.0, np.nan], size=n, p=[.05, .05, .05, .85])
+    if seed % 2:
+        sig = sig[: n - 300]                        # reindex → sonda NaN
+    df = _df(n, seed)
+    loop, vec = _run(df, sig, "loop"), _run(df, sig, "vector")
+
+    assert vec["trades"].dtype == TRADE_DTYPE
+    assert np.array_equal(loop["trades"], vec["trades"])
+    assert np.array_equal(loop["equity_curve"].to_numpy(), vec["equity_curve"].to_numpy())
+    assert loop["final_balance"] == vec["final_balance"]
+    assert len(vec["trades"]) > 10
+
+
+@pytest.mark.parametrize("sig", [
+    [0, 0, 0, 0],
+    [1, 1, 1, 1],                                   # sonda tasfiye
+    [0, 0, 0, -1],                                  # son barda açılıp kapanır
+    [1, -1, 1, -1],                                 # her barda yön değişimi
+    [np.nan, -1, np.nan, 0],
+])
+def test_vector_matches_loop_edge_cases(sig):
+    df = _df(len(sig))
+    loop, vec = _run(df, sig, "loop"), _run(df, sig, "vector")
+    assert np.array_equal(loop["trades"], vec["trades"])
+    assert np.array_equal(loop["equity_curve"].to_numpy(), vec["equity_curve"].to_numpy())
+    assert loop["final_balance"] == vec["final_balance"]
+
+
+def test_metrics_accept_structured_trades():
+    df = _df(500)
+    res = _run(df, np.where(np.arange(500) % 50 < 25, 1, -1), "vector")
+    m = calculate_metrics(res["equity_curve"], res["trades"])
+    assert m["ProfitFactor"] == calculate_metrics(res["equity_curve"],
+                                                  list(res["trades"]["pnl"]))["ProfitFactor"]
+
+
+def test_empty_frame():
+    res = _run(_df(0), [], "vector")
+    assert len(res["trades"]) == 0 and res["final_balance"] == 1000
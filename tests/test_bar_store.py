@@ -0,0 +1,79 @@
+# tests/test_bar_store.py
+import numpy as np
+import pytest
+from utils.bar_store import BarStore
+
+
+def _k(i, closed=True):
+    return {"t": i * 60_000, "o": i, "h": i + 1, "l": i - 1, "c": i + 0.5,
+            "v": 10 * i, "x": closed}
+
+
+def test_chronological_views_after_wrap():
+    store = BarStore(maxlen=5)
+    for i in range(12):
+        store.add_bar("BTCUSDT", "1m", _k(i))
+
+    buf = store.get_ohlcv("BTCUSDT", "1m")
+    assert np.array_equal(buf["open"], [7, 8, 9, 10, 11])
+    assert np.array_equal(buf["close"], [7.5, 8.5, 9.5, 10.5, 11.5])
+    assert np.array_equal(store.get_times("BTCUSDT", "1m"),
+                          [i * 60_000 for i in range(7, 12)])
+    assert store.last_ts("BTCUSDT", "1m") == 11 * 60_000
+
+
+def test_views_are_read_only_and_zero_copy():
+    store = BarStore(maxlen=4)
+    for i in range(3):
+        store.add_bar("ETHUSDT", "5m", _k(i))
+    c = store.get_ohlcv("ETHUSDT", "5m")["close"]
+    assert np.asarray(c, dtype=float) is c
+    with pytest.raises(ValueError):
+        c[0] = 1.0
+
+
+def test_open_bar_ignored_and_missing_key_empty():
+    store = BarStore()
+    store.add_bar("BTCUSDT", "1m", _k(1, closed=False))
+    assert len(store.get_ohlcv("BTCUSDT", "1m")["close"]) == 0
+    assert store.last_ts("BTCUSDT", "1m") is None
+
+
+def test_partial_bar_start_used_as_timestamp():
+    store = BarStore()
+    store.add_bar("BTCUSDT", "1m", {"o": 1, "h": 1, "l": 1, "c": 1, "v": 1,
+                                    "start": 120, "x": True})
+    assert store.last_ts("BTCUSDT", "1m") == 120_000
+
+
+def test_snapshot_roundtrip_keeps_order_and_truncates_to_maxlen(tmp_path):
+    store = BarStore(maxlen=5)
+    for i in range(12):
+        store.add_bar("BTCUSDT", "1m", _k(i))
+    for i in range(3):
+        store.add_bar("ETHUSDT", "5m", _k(i))
+    path = tmp_path / "snap" / "bars.npz"
+    store.save_snapshot(path)
+    assert list(path.parent.iterdir()) == [path]         # geçici dosya kalmaz
+
+    back = BarStore(maxlen=5)
+    assert back.load_snapshot(path) == 2
+    for key in (("BTCUSDT", "1m"), ("ETHUSDT", "5m")):
+        for f in ("open", "close", "volume"):
+            assert np.array_equal(back.get_ohlcv(*key)[f], store.get_ohlcv(*key)[f])
+        assert np.array_equal(back.get_times(*key), store.get_times(*key))
+    back.add_bar("BTCUSDT", "1m", _k(12))                # halka yüklemeden sonra da döner
+    assert np.array_equal(back.get_ohlcv("BTCUSDT", "1m")["open"], [8, 9, 10, 11, 12])
+
+    small = BarStore(maxlen=3)
+    small.load_snapshot(path)
+    assert np.array_equal(small.get_ohlcv("BTCUSDT", "1m")["open"], [9, 10, 11])
+
+
+def test_missing_or_corrupt_snapshot_is_cold_start(tmp_path):
+    store = BarStore()
+    assert store.load_snapshot(tmp_path / "none.npz") == 0
+    bad = tmp_path / "bad.npz"
+    bad.write_bytes(b"not a zip")
+    assert store.load_snapshot(bad) == 0
+    assert len(store) == 0
@@ -0,0 +1,85 @@
+# tests/test_checkpoint.py
+import numpy as np
+import pandas as pd
+import pytest
+
+from backtest.backtester import BacktestEngine
+from backtest.checkpoint import load_checkpoint, save_checkpoint
+from backtest.exits import EXIT_END
+from strategies.rsi_threshold_strategy import Strategy as RsiThreshold
+from utils.bar_store import BarStore
+
+EFF = {"leverage": 5, "sl_pct": 10, "tp_pct": 15, "expire_sec": 3600 * 6}
+
+
+def _df(n, seed=0):
+    rng = np.random.default_rng(seed)
+    c = 100 + np.cumsum(rng.normal(0, 0.6, n))
+    o = np.r_[c[0], c[:-1]] + rng.normal(0, 0.2, n)
+    return pd.DataFrame({"open": o, "high": np.maximum(o, c) + rng.random(n) * 0.8,
+                         "low": np.minimum(o, c) - rng.random(n) * 0.8, "close": c,
+                         "volume": rng.random(n)},
+                        index=pd.date_range("2024-01-01", periods=n, freq="1h"))
+
+
+class TimedSignals:
+    """Zaman damgasına bağlı (nedensel) sabit sinyaller."""
+
+    def __init__(self, sig: pd.Series):
+        self.sig = sig
+
+    def generate_signals(self, df):
+        return self.sig.reindex(df.index)
+
+
+def _split_run(df, strategy, cut, **kw):
+    first = BacktestEngine(df.iloc[:cut], strategy, **kw).run()
+    second = BacktestEngine(df, strategy, **kw).run(checkpoint=first["checkpoint"])
+    return first, second
+
+
+def _assert_continues(full, first, second, cut):
+    assert second["final_balance"] == full["final_balance"]
+    assert np.array_equal(second["equity_curve"].to_numpy(),
+                          full["equity_curve"].to_numpy()[cut:])
+    closed = first["trades"][first["trades"]["exit_type"] != EXIT_END]
+    assert np.array_equal(np.concatenate([closed, second["trades"]]), full["trades"])
+
+
+@pytest.mark.parametrize("mode, eff", [("vector", None), ("loop", None), ("vector", EFF)])
+@pytest.mark.parametrize("cut", [1, 137, 500, 999])
+def test_continuation_matches_full_run(mode, eff, cut):
+    df = _df(1_000, seed=cut)
+    rng = np.random.default_rng(cut)
+    sig = pd.Series(rng.choice([-1.0, 0.0, 1.0, np.nan], size=len(df),
+                               p=[.05, .05, .05, .85]), index=df.index)
+    kw = {"initial_balance": 1000, "mode": mode, "effective_params": eff, "timeframe": "1h"}
+    full = BacktestEngine(df, TimedSignals(sig), **kw).run()
+    first, second = _split_run(df, TimedSignals(sig), cut, **kw)
+    _assert_continues(full, first, second, cut)
+    assert second["checkpoint"].bars == len(df)
+
+
+def test_indicator_state_from_tail(tmp_path):
+    df = _df(3_000, seed=7)
+    strat = RsiThreshold(bar_store=BarStore(), symbol="X", timeframe="1h",
+                         rsi_period=14, rsi_overbought=65, rsi_oversold=35)
+    full = BacktestEngine(df, strat).run()
+    first = BacktestEngine(df.iloc[:1_800], strat).run()
+
+    save_checkpoint(first["checkpoint"], tmp_path / "ckpt.pkl")
+    ckpt = load_checkpoint(tmp_path / "ckpt.pkl")
+    assert len(ckpt.tail) == strat.warmup_bars
+
+    second = BacktestEngine(df.iloc[1_800:], strat).run(checkpoint=ckpt)
+    _assert_continues(full, first, second, 1_800)
+
+
+def test_no_new_bars_keeps_state():
+    df = _df(50)
+    sig = pd.Series(1.0, index=df.index)
+    first = BacktestEngine(df, TimedSignals(sig)).run()
+    again = BacktestEngine(df, TimedSignals(sig)).run(checkpoint=first["checkpoint"])
+    assert len(again["trades"]) == 0
+    assert again["checkpoint"] is first["checkpoint"]
+    assert first["checkpoint"].position == 1
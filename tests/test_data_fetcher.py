@@ -0,0 +1,66 @@
+# tests/test_data_fetcher.py
+import threading
+
+import numpy as np
+import pytest
+
+from data.data_fetcher import DataFetcher
+
+T0 = 1_704_067_200_000                      # 2024‑01‑01 (ms)
+STEP = 3_600_000                            # 1h
+
+
+class FakeExchange:
+    """Yerel sahte borsa: çağrı başına en fazla `cap` bar, istenirse ilk çağrılarda hata."""
+    rateLimit = 0
+
+    def __init__(self, n=5_000, cap=400, fail_first=0, gap=()):
+        self.t = [T0 + i * STEP for i in range(n) if i not in set(gap)]
+        self.cap = cap
+        self.fail_left = fail_first
+        self.calls = 0
+        self.lock = threading.Lock()
+
+    def fetch_ohlcv(self, symbol, timeframe, since=None, limit=None):
+        with self.lock:
+            self.calls += 1
+            if self.fail_left:
+                self.fail_left -= 1
+                raise ConnectionError("geçici hata")
+        i = np.searchsorted(self.t, since)
+        out = self.t[i:i + min(limit, self.cap)]
+        return [[t, t % 97, t % 97 + 1, t % 97 - 1, t % 89, 1.0] for t in out]
+
+
+def test_range_is_complete_ordered_and_unique():
+    ex = FakeExchange(gap=range(1_000, 1_010))
+    f = DataFetcher(exchange=ex)
+    df = f.fetch_range("BTC/USDT", "1h", T0 + 5 * STEP, T0 + 3_500 * STEP,
+                       page_limit=1_000, max_concurrency=3)
+    expect = [t for t in ex.t if T0 + 5 * STEP <= t < T0 + 3_500 * STEP]
+    got = df.index.to_numpy(dtype="datetime64[ms]").view(np.int64)
+    assert np.array_equal(got, expect)
+    assert np.array_equal(df["close"].to_numpy(), np.array(expect) % 89)
+
+
+def test_failed_pages_are_retried():
+    ex = FakeExchange(fail_first=3)
+    df = DataFetcher(exchange=ex).fetch_range("BTC/USDT", "1h", T0, T0 + 2_000 * STEP,
+                                              backoff=0)
+    assert len(df) == 2_000
+    with pytest.raises(ConnectionError):
+        DataFetcher(exchange=FakeExchange(fail_first=100)).fetch_range(
+            "BTC/USDT", "1h", T0, T0 + 10 * STEP, retries=2, backoff=0)
+
+
+def test_page_cache_resumes(tmp_path):
+    kw = dict(page_limit=500, cache_dir=tmp_path, backoff=0)
+    first = DataFetcher(exchange=FakeExchange()).fetch_range(
+        "BTC/USDT", "1h", T0, T0 + 3_000 * STEP, **kw)
+    assert len(list((tmp_path / "BTCUSDT_1h").glob("*.npy"))) == 6
+
+    offline = FakeExchange(fail_first=10**9)                  # her çağrı hata
+    again = DataFetcher(exchange=offline).fetch_range(
+        "BTC/USDT", "1h", T0, T0 + 3_000 * STEP, retries=0, **kw)
+    assert offline.calls == 0
+    assert again.equals(first)
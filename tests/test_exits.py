@@ -0,0 +1,112 @@
+# tests/test_exits.py
+import math
+
+import numpy as np
+import pandas as pd
+import pytest
+
+import backtest.exits as ex
+from backtest.backtester import BacktestEngine
+
+EFF = {"leverage": 5, "sl_pct": 10, "tp_pct": 15, "expire_sec": 3600 * 6}
+
+
+def _bars(n, seed=0):
+    rng = np.random.default_rng(seed)
+    c = 100 + np.cumsum(rng.normal(0, 0.6, n))
+    o = np.r_[c[0], c[:-1]] + rng.normal(0, 0.2, n)       # ara sıra boşluk
+    h = np.maximum(o, c) + rng.random(n) * 0.8
+    l = np.minimum(o, c) - rng.random(n) * 0.8
+    return o, h, l, c
+
+
+def _reference(o, h, l, c, sig, eff, tf):
+    """Bar bar, işlem işlem düz Python tarama."""
+    lev = eff["leverage"]
+    sl_f = eff["sl_pct"] / lev / 100 if eff.get("sl_pct") else math.nan
+    tp_f = eff["tp_pct"] / lev / 100 if eff.get("tp_pct") else math.nan
+    mb = ex.expire_bars(eff.get("expire_sec"), tf)
+    out, free = [], 0
+    for i, s in enumerate(sig):
+        if i < free or not s or s != s:
+            continue
+        e = c[i]
+        sl = e * (1 - sl_f) if s > 0 else e * (1 + sl_f)
+        tp = e * (1 + tp_f) if s > 0 else e * (1 - tp_f)
+        last = min(len(c) - 1, i + mb) if mb else len(c) - 1
+        hit = (last, c[last], ex.EXIT_EXPIRE if mb and last == i + mb else ex.EXIT_END)
+        for t in range(i + 1, last + 1):
+            if s > 0 and l[t] <= sl:
+                hit = (t, min(o[t], sl), ex.EXIT_SL); break
+            if s > 0 and h[t] >= tp:
+                hit = (t, max(o[t], tp), ex.EXIT_TP); break
+            if s < 0 and h[t] >= sl:
+                hit = (t, max(o[t], sl), ex.EXIT_SL); break
+            if s < 0 and l[t] <= tp:
+                hit = (t, min(o[t], tp), ex.EXIT_TP); break
+        out.append((i, hit[0], int(np.sign(s)), e, hit[1], hit[2]))
+        free = hit[0] + 1
+    return out
+
+
+@pytest.mark.parametrize("eff", [
+    EFF,
+    {**EFF, "expire_sec": None},
+    {**EFF, "sl_pct": 0},                                 # SL kapalı
+    {"leverage": 1, "sl_pct": 1, "tp_pct": 1, "expire_sec": 1800},
+])
+@pytest.mark.parametrize("seed", range(3))
+def test_first_hits_match_reference(eff, seed):
+    o, h, l, c = _bars(3_000, seed)
+    rng = np.random.default_rng(seed + 10)
+    sig = np.where(rng.random(len(c)) < 0.05, rng.choice([-1.0, 1.0], len(c)), np.nan)
+
+    hits = ex.first_hits(o, h, l, c, sig, eff, "1h")
+    got = list(zip(*(hits[k].tolist() for k in
+                     ("entry_idx", "exit_idx", "side", "entry_price",
+                      "exit_price", "exit_type"))))
+    assert got == _reference(o, h, l, c, sig, eff, "1h")
+    assert len(got) > 20
+
+
+def test_barriers_use_position_manager_formula():
+    sl, tp = ex.barrier_prices([100.0, 100.0], [1, -1], leverage=5, sl_pct=10, tp_pct=15)
+    assert sl.tolist() == [100 * (1 - 10 / 5 / 100), 100 * (1 + 10 / 5 / 100)]
+    assert tp.tolist() == [100 * (1 + 15 / 5 / 100), 100 * (1 - 15 / 5 / 100)]
+
+
+def test_engine_with_effective_params():
+    o, h, l, c = _bars(2_000, 7)
+    idx = pd.date_range("2024-01-01", periods=len(c), freq="1h")
+    df = pd.DataFrame({"open": o, "high": h, "low": l, "close": c, "volume": 1.0}, index=idx)
+    sig = np.where(np.arange(len(c)) % 37 == 0, 1.0, 0.0)
+
+    class S:
+        def generate_signals(self, df):
+            return pd.Series(sig, index=df.index)
+
+    res = BacktestEngine(df, S(), initial_balance=1000, effective_params=EFF,
+                         timeframe="1h").run()
+    tr = res["trades"]
+    assert set(tr["exit_type"]) <= {ex.EXIT_SL, ex.EXIT_TP, ex.EXIT_EXPIRE, ex.EXIT_END}
+    assert (tr["exit_idx"][:-1] < tr["entry_idx"][1:]).all()
+    assert (tr["exit_idx"] - tr["entry_idx"] <= 6).all()
+    assert res["final_balance"] == pytest.approx(1000 + tr["pnl"].sum())
+    eq = res["equity_curve"].to_numpy()
+    # işlem dışındaki barlarda özsermaye = gerçekleşmiş bakiye
+    assert eq[-1] == res["final_balance"]
+    assert eq[tr["exit_idx"][0]] == 1000 + tr["pnl"][0]
+
+
+@pytest.mark.parametrize("eff", [EFF, {**EFF, "expire_sec": None}, {**EFF, "tp_pct": 0}])
+def test_block_fallback_matches_compiled_scan(monkeypatch, eff):
+    o, h, l, c = _bars(3_000, 4)
+    rng = np.random.default_rng(5)
+    sig = np.where(rng.random(len(c)) < 0.05, rng.choice([-1.0, 1.0], len(c)), 0.0)
+    carry = (-3, 1, c[0] * 1.01)                       # önceki koşudan açık pozisyon
+    fast = ex.first_hits(o, h, l, c, sig, eff, "30m", carry=carry)
+    monkeypatch.setattr(ex, "HAVE_NUMBA", False)
+    slow = ex.first_hits(o, h, l, c, sig, eff, "30m", carry=carry)
+    for k in fast:
+        assert np.array_equal(fast[k], slow[k]), k
+    assert len(slow["exit_idx"]) > 20
@@ -0,0 +1,57 @@
+# tests/test_indicator_cache.py
+import numpy as np
+import pytest
+import talib
+
+from strategies import load_strategy
+from utils.bar_store import BarStore
+from utils.indicator_cache import IndicatorCache
+
+
+def _add(store, i, sym="BTCUSDT", tf="1h"):
+    c = 100 + np.sin(i / 3) * 5
+    store.add_bar(sym, tf, {"t": i * 3_600_000, "o": c, "h": c + 1, "l": c - 1,
+                            "c": c, "v": 10, "x": True})
+
+
+def _supertrend(store, mult):
+    return load_strategy({"name": "super_trend",
+                          "params": {"atr_period": 10, "multiplier": mult},
+                          "effective_params": {}},
+                         bar_store=store, symbol="BTCUSDT", timeframe="1h")
+
+
+def test_indicator_computed_once_per_bar_across_strategies():
+    store = BarStore()
+    for i in range(50):
+        _add(store, i)
+    a, b = _supertrend(store, 2.0), _supertrend(store, 3.0)
+    cache = IndicatorCache.attach(store)
+
+    atr = a.indicator("ATR", timeperiod=10)
+    assert b.indicator("ATR", timeperiod=10) is atr
+    assert (cache.misses, cache.hits) == (1, 1)
+    buf = store.get_ohlcv("BTCUSDT", "1h")
+    np.testing.assert_array_equal(atr, talib.ATR(buf["high"], buf["low"], buf["close"], 10))
+    with pytest.raises(ValueError):
+        atr[-1] = 0.0
+
+    _add(store, 50)                     # yeni bar → eski girdi düşer
+    assert cache.stats()["entries"] == 0 and cache.evictions == 1
+    a.indicator("ATR", timeperiod=10)
+    assert cache.misses == 2
+
+
+def test_cache_isolated_per_key():
+    store = BarStore()
+    for i in range(30):
+        _add(store, i)
+        _add(store, i, sym="ETHUSDT")
+    cache = IndicatorCache.attach(store)
+    calls = []
+    for sym in ("BTCUSDT", "ETHUSDT", "BTCUSDT"):
+        cache.get(sym, "1h", "X", (), lambda: calls.append(sym) or len(calls))
+    assert calls == ["BTCUSDT", "ETHUSDT"]
+    _add(store, 30, sym="ETHUSDT")
+    assert cache.stats()["entries"] == 1
+    assert cache.stats()["hit_rate"] == pytest.approx(1 / 3)
@@ -0,0 +1,66 @@
+# tests/test_indicators.py
+import numpy as np
+import pandas as pd
+import pytest
+import talib
+
+from utils.bar_store import BarStore
+from utils.indicators import IndicatorEngine, INDICATORS
+
+
+def _ohlcv(n=400, seed=0):
+    rng = np.random.default_rng(seed)
+    c = np.cumsum(rng.normal(0, 1, n)) + 100
+    h = c + rng.random(n)
+    l = c - rng.random(n)
+    o = c + rng.normal(0, .3, n)
+    v = rng.random(n) * 100
+    return o, h, l, c, v
+
+
+def _fill(store, sym, tf, data, start=0, stop=None):
+    o, h, l, c, v = data
+    for i in range(start, stop if stop is not None else len(c)):
+        store.add_bar(sym, tf, {"t": i * 60_000, "o": o[i], "h": h[i], "l": l[i],
+                                "c": c[i], "v": v[i], "x": True})
+
+
+@pytest.mark.parametrize("name, params, ref", [
+    ("RSI", {"period": 14}, lambda o, h, l, c, v: talib.RSI(c, 14)),
+    ("EMA", {"period": 50}, lambda o, h, l, c, v: talib.EMA(c, 50)),
+    ("ATR", {"period": 10}, lambda o, h, l, c, v: talib.ATR(h, l, c, 10)),
+    ("ADX", {"period": 20}, lambda o, h, l, c, v: talib.ADX(h, l, c, 20)),
+    ("MOM", {"period": 10}, lambda o, h, l, c, v: talib.MOM(c, 10)),
+    ("SMA", {"period": 20, "src": "volume"},
+     lambda o, h, l, c, v: pd.Series(v).rolling(20).mean().values),
+])
+def test_streaming_matches_reference(name, params, ref):
+    data = _ohlcv()
+    ind = INDICATORS[name](keep=len(data[3]), **params)
+    for row in zip(*(a.tolist() for a in data)):
+        ind.update(*row)
+    np.testing.assert_allclose(np.array(ind.values), ref(*data), rtol=1e-9, equal_nan=True)
+
+
+def test_bbands_matches_talib():
+    data = _ohlcv()
+    ind = INDICATORS["BBANDS"](keep=len(data[3]), period=20)
+    for row in zip(*(a.tolist() for a in data)):
+        ind.update(*row)
+    ref = np.array(talib.BBANDS(data[3], 20, 2, 2)).T
+    np.testing.assert_allclose(np.array(ind.values), ref, rtol=1e-9, equal_nan=True)
+
+
+def test_engine_seeds_from_history_then_advances_with_bar_store():
+    data = _ohlcv()
+    store = BarStore(maxlen=1000)
+    _fill(store, "BTCUSDT", "1h", data, stop=200)
+    eng = IndicatorEngine.attach(store)
+    assert IndicatorEngine.attach(store) is eng
+
+    rsi = eng.get("BTCUSDT", "1h", "RSI", period=14)
+    assert eng.get("BTCUSDT", "1h", "RSI", period=14) is rsi
+    _fill(store, "BTCUSDT", "1h", data, start=200)
+    assert rsi.n == len(data[3])
+    assert rsi.value == pytest.approx(talib.RSI(data[3], 14)[-1], rel=1e-9)
+    np.testing.assert_allclose(rsi.tail(4), talib.RSI(data[3], 14)[-4:], rtol=1e-9)
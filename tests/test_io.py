@@ -0,0 +1,51 @@
+# tests/test_io.py
+import os
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from utils.io import load_ohlcv_csv
+
+
+def _csv(path, n=500, iso=False):
+    rng = np.random.default_rng(0)
+    c = 100 + np.cumsum(rng.normal(0, 1, n))
+    ts = np.arange(n) * 60_000 + 1_700_000_000_000
+    if iso:
+        ts = pd.to_datetime(ts, unit="ms", utc=True).tz_convert("Europe/Istanbul").astype(str)
+    pd.DataFrame({"Open_Time": ts, "Open": c, "High": c + 1, "Low": c - 1, "Close": c,
+                  "Volume": rng.random(n), "Trades": 3}).to_csv(path, index=False)
+
+
+def _mapped(a):
+    while a is not None:
+        if isinstance(a, np.memmap):
+            return True
+        a = getattr(a, "base", None)
+    return False
+
+
+@pytest.mark.parametrize("iso", [False, True])
+def test_cache_roundtrip(tmp_path, iso):
+    path = tmp_path / "BTCUSDT_1m.csv"
+    _csv(path, iso=iso)
+    first = load_ohlcv_csv(path)
+    assert (tmp_path / "BTCUSDT_1m.csv.npcache" / "meta.json").exists()
+    again = load_ohlcv_csv(path)
+    pd.testing.assert_frame_equal(again, first)
+    assert _mapped(again["close"].to_numpy())
+    pd.testing.assert_frame_equal(load_ohlcv_csv(path, cache=False), first)
+
+    again.loc[again.index[0], "close"] = -1.0          # özel kopya; önbellek bozulmaz
+    assert load_ohlcv_csv(path)["close"].iloc[0] == first["close"].iloc[0]
+
+
+def test_cache_invalidated_when_source_changes(tmp_path):
+    path = tmp_path / "ETHUSDT_1h.csv"
+    _csv(path, n=100)
+    assert len(load_ohlcv_csv(path)) == 100
+    _csv(path, n=120)
+    os.utime(path, ns=(0, path.stat().st_mtime_ns + 1_000_000_000))
+    assert len(load_ohlcv_csv(path)) == 120
+    assert len(load_ohlcv_csv(path)) == 120
@@ -0,0 +1,55 @@
+# tests/test_kernels.py
+import numpy as np
+import pandas as pd
+import talib
+
+from strategies.super_trend import Strategy as SuperTrend
+from utils.indicators import SUPERTREND
+from utils.kernels import supertrend
+
+
+def _legacy_supertrend(h, l, c, atr, multiplier):
+    upperband = (h + l) / 2 + (multiplier * atr)
+    lowerband = (h + l) / 2 - (multiplier * atr)
+    st = np.zeros_like(c)
+    st[0] = upperband[0]
+    for i in range(1, len(c)):
+        if c[i - 1] <= st[i - 1]:
+            st[i] = min(upperband[i], st[i - 1])
+        else:
+            st[i] = max(lowerband[i], st[i - 1])
+    return st
+
+
+def _hlc(n=800, seed=3):
+    rng = np.random.default_rng(seed)
+    c = 100 + np.cumsum(rng.normal(0, 1, n))
+    return c + rng.random(n), c - rng.random(n), c
+
+
+def test_kernel_matches_legacy_loop_including_nan_warmup():
+    h, l, c = _hlc()
+    atr = talib.ATR(h, l, c, 10)
+    np.testing.assert_array_equal(supertrend(h, l, c, atr, 2.0),
+                                  _legacy_supertrend(h, l, c, atr, 2.0))
+
+
+def test_incremental_supertrend_tracks_full_kernel():
+    h, l, c = _hlc()
+    ind = SUPERTREND(period=10, multiplier=3.0, keep=len(c))
+    for row in zip(h.tolist(), l.tolist(), c.tolist()):
+        ind.update(0.0, *row, 0.0)
+    ref = supertrend(h, l, c, talib.ATR(h, l, c, 10), 3.0)
+    np.testing.assert_allclose(np.array(ind.values), ref, rtol=1e-12, equal_nan=True)
+
+
+def test_generate_signals_unchanged():
+    h, l, c = _hlc()
+    df = pd.DataFrame({"open": c, "high": h, "low": l, "close": c, "volume": 1.0})
+    sig = SuperTrend.generate_signals(df, atr_period=10, multiplier=2.0)
+    trend = c > _legacy_supertrend(h, l, c, talib.ATR(h, l, c, 10), 2.0)
+    ref = np.zeros(len(c), dtype=int)
+    ref[1:][(~trend[:-1]) & trend[1:]] = 1
+    ref[1:][trend[:-1] & (~trend[1:])] = -1
+    np.testing.assert_array_equal(sig.values, ref)
+    assert (sig != 0).sum() > 0
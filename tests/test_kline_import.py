@@ -0,0 +1,108 @@
+# tests/test_kline_import.py
+import zipfile
+
+import numpy as np
+import pytest
+
+from data.kline_import import import_archives, parse_archive
+from utils.ohlcv_store import OHLCVStore
+
+T0 = 1_704_067_200_000                     # 2024‑01‑01 00:00 UTC (ms)
+HEADER = "open_time,open,high,low,close,volume,close_time,quote_volume,count,tb,tq,ignore\n"
+
+
+def _zip(path, t, header=False, scale=1):
+    rows = "".join(f"{ti * scale},{ti % 97},{ti % 97 + 1},{ti % 97 - 1},{ti % 89},1.5,"
+                   f"{ti + 59_999},0,0,0,0,0\n" for ti in t)
+    with zipfile.ZipFile(path, "w", zipfile.ZIP_DEFLATED) as zf:
+        zf.writestr(path.stem + ".csv", (HEADER if header else "") + rows)
+
+
+def _minutes(a, b):
+    return T0 + np.arange(a, b, dtype=np.int64) * 60_000
+
+
+def test_parse_archive_header_and_microseconds(tmp_path):
+    t = _minutes(0, 10)
+    _zip(tmp_path / "BTCUSDT-1m-2024-01.zip", t, header=True)
+    _zip(tmp_path / "ETHUSDT-1m-2024-01.zip", t, scale=1000)      # µs
+    for name in ("BTCUSDT-1m-2024-01.zip", "ETHUSDT-1m-2024-01.zip"):
+        sym, tf, cols = parse_archive(tmp_path / name)
+        assert tf == "1m" and np.array_equal(cols["t"], t)
+        assert np.array_equal(cols["close"], (t % 89).astype(float))
+
+
+@pytest.mark.parametrize("workers", [1, 2])
+def test_import_dedups_and_reports_gaps(tmp_path, workers):
+    src = tmp_path / "arsiv"
+    (src / "daily").mkdir(parents=True)
+    jan = 31 * 1440
+    _zip(src / "BTCUSDT-1m-2024-01.zip", _minutes(0, jan), header=True)
+    _zip(src / "BTCUSDT-1m-2024-02.zip", np.r_[_minutes(jan, jan + 100),
+                                                _minutes(jan + 105, jan + 1440)])
+    _zip(src / "daily" / "BTCUSDT-1m-2024-01-31.zip", _minutes(jan - 1440, jan))   # çakışma
+    _zip(src / "ETHUSDT-1h-2024-01.zip", T0 + np.arange(24 * 31) * 3_600_000)
+    (src / "notes.zip").write_bytes(b"")                               # ad kalıbına uymaz
+
+    summary = import_archives(src, tmp_path / "store", workers=workers)
+    assert summary["files"] == 4
+    assert summary["duplicates"] == 1440
+    assert summary["rows"] == jan + 1435 + 24 * 31
+    assert summary["gaps"] == {("BTCUSDT", "1m"): [(int(_minutes(jan + 99, jan + 100)[0]),
+                                                    int(_minutes(jan + 105, jan + 106)[0]), 5)]}
+    assert summary["rows_per_sec"] > 0
+
+    store = OHLCVStore(tmp_path / "store")
+    assert store.partitions("BTCUSDT", "1m") == ["2024-01", "2024-02"]
+    t = store.read_arrays("BTCUSDT", "1m")["t"]
+    assert len(t) == jan + 1435 and np.all(np.diff(t) > 0)
+    assert store.symbols("1h") == ["ETHUSDT"]
+
+
+def test_groups_are_written_before_the_next_is_parsed(tmp_path, monkeypatch):
+    import data.kline_import as ki
+    for sym in ("AAAUSDT", "BBBUSDT"):
+        for m in ("01", "02"):
+            _zip(tmp_path / f"{sym}-1m-2024-{m}.zip", _minutes(0, 5) + (m == "02") * 31 * 86_400_000)
+    events = []
+    real_parse, real_append = ki.parse_archive, OHLCVStore.append
+    monkeypatch.setattr(ki, "parse_archive", lambda p: events.append(("parse", p.name[:3]))
+                        or real_parse(p))
+    monkeypatch.setattr(OHLCVStore, "append", lambda self, sym, tf, cols:
+                        events.append(("append", sym[:3])) or real_append(self, sym, tf, cols))
+    import_archives(tmp_path, tmp_path / "store", workers=1)
+    assert events == [("parse", "AAA")] * 2 + [("append", "AAA")] + \
+                     [("parse", "BBB")] * 2 + [("append", "BBB")]
+
+
+def test_next_group_is_parsed_while_current_is_written(tmp_path, monkeypatch):
+    from concurrent.futures import Future
+    import data.kline_import as ki
+    files = [("AAAUSDT", "01"), ("AAAUSDT", "02"), ("BBBUSDT", "01"), ("CCCUSDT", "01")]
+    for sym, m in files:
+        _zip(tmp_path / f"{sym}-1m-2024-{m}.zip", _minutes(0, 5) + (m == "02") * 31 * 86_400_000)
+    events = []
+
+    class InlinePool:                                # süreçsiz havuz: gönderim sırasını kaydeder
+        def __init__(self, max_workers):
+            pass
+
+        def submit(self, fn, path):
+            events.append(("submit", path.name[:3]))
+            fut = Future()
+            fut.set_result(fn(path))
+            return fut
+
+        def shutdown(self, **kw):
+            pass
+
+    real_append = OHLCVStore.append
+    monkeypatch.setattr(ki, "ProcessPoolExecutor", InlinePool)
+    monkeypatch.setattr(OHLCVStore, "append", lambda self, sym, tf, cols:
+                        events.append(("append", sym[:3])) or real_append(self, sym, tf, cols))
+    summary = import_archives(tmp_path, tmp_path / "store", workers=2)
+    assert summary["files"] == 4
+    # tek arşivli gruplar da havuza gider; yazım sırasında sıradaki grup ayrıştırılıyor
+    assert events == [("submit", "AAA")] * 2 + [("submit", "BBB"), ("append", "AAA"),
+                                                 ("submit", "CCC"), ("append", "BBB"),
+                                                 ("append", "CCC")]
@@ -0,0 +1,133 @@
+# tests/test_live_engine.py
+import asyncio
+
+import numpy as np
+import pytest
+from live.live_engine import LiveEngine
+
+
+class FakeCfg:
+    def __init__(self, strategies):
+        self._strategies = strategies
+
+    def get_strategies(self):
+        return self._strategies
+
+    def get_base_usdt_per_trade(self):
+        return 10.0
+
+    def get_max_concurrent(self):
+        return 5
+
+
+class FakeBroker:
+    client = None
+
+
+def _scfg(coins, tf="1h", name="rsi_threshold_strategy"):
+    return {"name": name, "coins": coins, "timeframe": tf, "params": {},
+            "effective_params": {"leverage": 2, "sl_pct": 3, "tp_pct": 3,
+                                 "expire_sec": 60}}
+
+
+def _engine(strategies, symbols):
+    eng = LiveEngine(FakeCfg(strategies), FakeBroker())
+    eng.symbols = symbols
+    eng._build_dispatch()
+    return eng
+
+
+def test_dispatch_expands_all_usdt_per_symbol():
+    eng = _engine([_scfg(["ALL_USDT"]), _scfg(["btc/usdt", "DOGEUSDT"], tf="4h")],
+                  ["BTCUSDT", "ETHUSDT"])
+    assert set(eng.dispatch) == {("BTCUSDT", "1h"), ("ETHUSDT", "1h"), ("BTCUSDT", "4h")}
+    inst = eng.dispatch[("ETHUSDT", "1h")][0][1]
+    assert inst.symbol == "ETHUSDT" and inst.tf == "1h"
+
+
+@pytest.mark.asyncio
+async def test_on_batch_only_touches_closed_keys():
+    eng = _engine([_scfg(["ALL_USDT"])], ["BTCUSDT", "ETHUSDT", "XRPUSDT"])
+    seen, opened = [], []
+    for (sym, _), entries in eng.dispatch.items():
+        for _, inst in entries:
+            inst.generate_signal = (lambda s=sym: seen.append(s) or "+1")
+            inst.has_batch = lambda: False
+
+    async def open_position(sym, side, name, **kw):
+        opened.append((sym, side, kw["timeframes"]))
+
+    async def update_all():
+        pass
+    eng.pos_mgr.open_position = open_position
+    eng.pos_mgr.update_all = update_all
+
+    await eng._on_batch("1h", ["BTCUSDT", "XRPUSDT", "UNKNOWN"])
+    await eng._on_batch("4h", ["BTCUSDT"])
+    assert seen == ["BTCUSDT", "XRPUSDT"]
+    assert opened == [("BTCUSDT", 1, "1h"), ("XRPUSDT", 1, "1h")]
+
+
+@pytest.mark.parametrize("name, params", [
+    ("rsi_threshold_strategy", {"rsi_period": 14, "rsi_overbought": 55, "rsi_oversold": 45}),
+    ("super_trend", {"atr_period": 10, "multiplier": 1.0}),
+])
+def test_batch_path_matches_per_symbol_signals(name, params):
+    symbols = [f"S{i}USDT" for i in range(40)]
+    scfg = {**_scfg(["ALL_USDT"], name=name), "params": params}
+    eng = _engine([scfg], symbols)
+    rng = np.random.default_rng(7)
+    for k, sym in enumerate(symbols):
+        n = 120 if k % 5 else 80                     # iki farklı tampon uzunluğu
+        c = 100 + np.cumsum(rng.normal(0, 1, n))
+        for i in range(n):
+            eng.bar_store.add_bar(sym, "1h", {"t": i, "o": c[i], "h": c[i] + 1,
+                                              "l": c[i] - 1, "c": c[i], "v": 1, "x": True})
+
+    batch = {sym: sig for sym, _, sig in eng._evaluate("1h", symbols)}
+    single = {}
+    for sym in symbols:
+        inst = eng.dispatch[(sym, "1h")][0][1]
+        buf = eng.bar_store.get_ohlcv(sym, "1h")
+        sig = inst._live_signal(buf["open"], buf["high"], buf["low"], buf["close"], buf["volume"])
+        if sig:
+            single[sym] = int(sig)
+    assert batch == single and batch
+
+
+def test_incremental_strategies_skip_matrix_kernels(monkeypatch):
+    symbols = [f"S{i}USDT" for i in range(5)]
+    eng = _engine([{**_scfg(["ALL_USDT"]), "params": {"rsi_period": 5}}], symbols)
+    for sym in symbols:
+        for i in range(30):
+            eng.bar_store.add_bar(sym, "1h", {"t": i, "o": i, "h": i, "l": i,
+                                              "c": 100 - i, "v": 1, "x": True})
+
+    def no_matrices(*a, **kw):
+        raise AssertionError("artımlı strateji tamponu yeniden hesapladı")
+    monkeypatch.setattr(eng.bar_store, "get_matrices", no_matrices)
+    assert {sym for sym, _, _ in eng._evaluate("1h", symbols)} == set(symbols)
+
+
+@pytest.mark.asyncio
+async def test_snapshot_save_yields_between_chunks(tmp_path, monkeypatch):
+    from utils.bar_store import BarStore
+    eng = _engine([_scfg(["BTCUSDT"])], ["BTCUSDT"])
+    for k in range(600):                              # 3 grup (256’lık)
+        eng.bar_store.add_bar(f"S{k}USDT", "1h", {"t": 0, "o": k, "h": k, "l": k,
+                                                  "c": k, "v": 1, "x": True})
+    sizes = []
+    real = eng.bar_store.iter_snapshot
+    monkeypatch.setattr(eng.bar_store, "iter_snapshot",
+                        lambda: (sizes.append(len(p)) or p for p in real()))
+
+    async def close_bar():                            # kopyalama sırasında kapanış
+        eng.bar_store.add_bar("S0USDT", "1h", {"t": 1, "o": 9, "h": 9, "l": 9,
+                                               "c": 9, "v": 1, "x": True})
+    task = asyncio.ensure_future(close_bar())
+    await eng._save_snapshot(tmp_path / "bars.npz")
+    assert task.done() and sizes == [256, 256, 88]
+
+    back = BarStore()
+    assert back.load_snapshot(tmp_path / "bars.npz") == 600
+    assert back.get_ohlcv("S599USDT", "1h")["close"][-1] == 599
@@ -0,0 +1,47 @@
+# tests/test_metrics.py
+import numpy as np
+import pandas as pd
+import pytest
+
+from backtest.metrics import (calculate_metrics, calculate_metrics_batch,
+                              periods_per_year, ragged)
+
+
+def _curves(m, t, seed=0):
+    rng = np.random.default_rng(seed)
+    return 1000 + np.cumsum(rng.normal(0, 5, (m, t)), axis=1)
+
+
+def _trades(m, seed=0):
+    rng = np.random.default_rng(seed)
+    out = [rng.normal(0.1, 2, rng.integers(0, 30)) for _ in range(m)]
+    out[0] = np.empty(0)                                   # işlemsiz
+    out[1] = np.abs(out[1]) + 0.1                          # zararsız → PF NaN
+    return out
+
+
+@pytest.mark.parametrize("tf", [None, "1h"])
+def test_batch_matches_single(tf):
+    eq, tr = _curves(40, 300), _trades(40)
+    eq[3] = 1000.0                                         # düz eğri → Sharpe NaN
+    batch = pd.DataFrame(calculate_metrics_batch(eq, tr, timeframe=tf))
+    single = pd.DataFrame([calculate_metrics(pd.Series(e), t, timeframe=tf)
+                           for e, t in zip(eq, tr)])
+    pd.testing.assert_frame_equal(batch, single, check_dtype=False, rtol=1e-9)
+
+
+def test_nan_padded_curves_and_ragged_tuple():
+    eq = _curves(3, 200)
+    padded = eq.copy()
+    padded[1, 150:] = np.nan
+    pnl, offsets = ragged(_trades(3))
+    batch = calculate_metrics_batch(padded, (pnl, offsets))
+    one = calculate_metrics(pd.Series(eq[1, :150]), pnl[offsets[1]:offsets[2]])
+    for k, v in one.items():
+        assert batch[k][1] == pytest.approx(v, rel=1e-9, nan_ok=True)
+
+
+def test_periods_per_year():
+    assert periods_per_year(None) == 252
+    assert periods_per_year("1h") == 365 * 24
+    assert periods_per_year("30m") == 365 * 48
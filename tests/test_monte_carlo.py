@@ -0,0 +1,58 @@
+# tests/test_monte_carlo.py
+import numpy as np
+import pandas as pd
+import pytest
+
+from backtest.backtester import TRADE_DTYPE
+from backtest.metrics import max_drawdown
+from backtest.monte_carlo import monte_carlo, resample_paths
+
+PNL = np.random.default_rng(0).normal(0.5, 4, 200)
+
+
+def test_shuffle_keeps_final_balance():
+    mc = monte_carlo(PNL, 500, method="shuffle", seed=1, keep_paths=True)
+    assert np.allclose(mc["final_balance"], 1000 + PNL.sum())
+    # her yol aynı işlemlerin bir permütasyonu
+    steps = np.diff(mc["paths"], axis=1)
+    assert np.allclose(np.sort(steps, axis=1), np.sort(PNL))
+
+
+def test_bootstrap_bands_and_metrics():
+    trades = np.zeros(len(PNL), dtype=TRADE_DTYPE)
+    trades["pnl"] = PNL
+    mc = monte_carlo(trades, 1_000, seed=2, chunk=300, keep_paths=True)
+    assert mc["paths"].shape == (1_000, len(PNL) + 1)
+    bands, table = mc["bands"], mc["metrics"]
+    assert list(bands.index) == [5, 25, 50, 75, 95]
+    assert (np.diff(bands.to_numpy(), axis=0) >= 0).all()
+    assert bands[0].eq(1000).all()
+    assert table["MaxDrawdown"].is_monotonic_increasing
+    dd = [max_drawdown(pd.Series(p)) for p in mc["paths"]]
+    assert table.loc[50, "MaxDrawdown"] == pytest.approx(np.percentile(dd, 50))
+    assert 0 <= mc["prob_loss"] <= 1
+
+    again = monte_carlo(trades, 1_000, seed=2, chunk=300)
+    assert np.array_equal(again["final_balance"], mc["final_balance"])
+
+
+def test_chunked_bands_and_per_trade_sharpe():
+    whole = monte_carlo(PNL, 2_000, seed=3, chunk=2_000, keep_paths=True)
+    exact = np.percentile(whole["paths"], [5, 25, 50, 75, 95], axis=0)
+    assert np.allclose(whole["bands"].to_numpy(), exact)
+
+    chunked = monte_carlo(PNL, 2_000, seed=3, chunk=250)
+    assert "paths" not in chunked
+    assert np.array_equal(chunked["final_balance"], whole["final_balance"])
+    spread = exact[-1] - exact[0]
+    assert np.abs(chunked["bands"].to_numpy() - exact).max() < 0.1 * spread.max()
+
+    # yıllıklaştırma yok: işlem başına getirinin ortalama / std oranı
+    r = np.diff(whole["paths"], axis=1) / whole["paths"][:, :-1]
+    sharpe = r.mean(axis=1) / r.std(axis=1, ddof=1)
+    assert whole["metrics"].loc[50, "Sharpe"] == pytest.approx(np.percentile(sharpe, 50))
+
+
+def test_resample_paths_rejects_unknown_method():
+    with pytest.raises(ValueError):
+        resample_paths(PNL, 10, method="jackknife")
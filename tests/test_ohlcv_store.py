@@ -0,0 +1,93 @@
+# tests/test_ohlcv_store.py
+import asyncio
+
+import numpy as np
+import pandas as pd
+
+from backtest.runner import load_frame, local_symbols
+from live.streamer import Streamer
+from utils.bar_store import BarStore
+from utils.ohlcv_store import OHLCVStore
+
+
+def _df(n, start="2024-01-30", freq="1h", seed=0):
+    rng = np.random.default_rng(seed)
+    c = 100 + np.cumsum(rng.normal(0, 1, n))
+    return pd.DataFrame({"open": c, "high": c + 1, "low": c - 1, "close": c,
+                         "volume": rng.random(n)},
+                        index=pd.date_range(start, periods=n, freq=freq))
+
+
+def test_append_partitions_and_roundtrip(tmp_path):
+    store = OHLCVStore(tmp_path)
+    df = _df(24 * 40)                                   # ocak sonu → mart başı
+    assert store.append("BTCUSDT", "1h", df.iloc[:500]) == 500
+    assert store.append("BTCUSDT", "1h", df.iloc[400:]) == len(df) - 500   # çakışma
+    assert store.partitions("BTCUSDT", "1h") == ["2024-01", "2024-02", "2024-03"]
+
+    out = store.read("BTCUSDT", "1h")
+    assert out.index.equals(df.index)
+    assert np.array_equal(out.to_numpy(), df.to_numpy())
+
+    # yeni değer kazanır
+    fix = df.iloc[[10]] * 2
+    assert store.append("BTCUSDT", "1h", fix) == 0
+    assert store.read("BTCUSDT", "1h")["close"].iloc[10] == fix["close"].iloc[0]
+
+
+def test_range_read_is_zero_copy_within_a_month(tmp_path):
+    store = OHLCVStore(tmp_path)
+    df = _df(24 * 40)
+    store.append("BTCUSDT", "1h", df)
+    cols = store.read_arrays("BTCUSDT", "1h", start="2024-02-03", end="2024-02-05")
+    assert isinstance(cols["close"].base, np.memmap) or isinstance(cols["close"], np.memmap)
+    part = store.read("BTCUSDT", "1h", start="2024-02-03", end="2024-02-05")
+    assert part.index[0] == pd.Timestamp("2024-02-03") and len(part) == 48
+    span = store.read("BTCUSDT", "1h", start="2024-01-31 12:00", end="2024-03-01 01:00")
+    pd.testing.assert_frame_equal(span, df.loc["2024-01-31 12:00":"2024-03-01 00:00"],
+                                  check_freq=False, check_index_type=False,
+                                  check_names=False)
+
+    tail = store.tail("BTCUSDT", "1h", 30)
+    assert np.array_equal(tail["close"], df["close"].to_numpy()[-30:])
+    assert store.last_ts("BTCUSDT", "1h") == int(tail["t"][-1])
+
+
+def test_runner_prefers_store(tmp_path):
+    store = OHLCVStore(tmp_path / "store")
+    df = _df(300)
+    store.append("ETHUSDT", "1h", df)
+    assert local_symbols(tmp_path, "1h", tmp_path / "store") == ["ETHUSDT"]
+    out = load_frame(tmp_path, "ETHUSDT", "1h", tmp_path / "store")
+    assert np.array_equal(out["close"].to_numpy(), df["close"].to_numpy())
+    assert load_frame(tmp_path, "XRPUSDT", "1h", tmp_path / "store") is None
+
+
+class FakeClient:
+    def __init__(self, klines):
+        self.klines = klines
+        self.limits = []
+
+    async def futures_klines(self, symbol, interval, limit):
+        self.limits.append(limit)
+        return self.klines[-limit:]
+
+
+def test_preload_reads_store_and_fetches_only_the_gap(tmp_path, monkeypatch):
+    df = _df(200, start="2024-03-01", freq="1min")
+    t = df.index.to_numpy(dtype="datetime64[ms]").view(np.int64)
+    klines = [[int(ti), *map(str, row), int(ti) + 59_999] for ti, row in
+              zip(t, df[["open", "high", "low", "close", "volume"]].to_numpy())]
+    now = (int(t[-1]) + 30_000) / 1000                  # son bar hâlâ açık
+    monkeypatch.setattr("live.streamer.time.time", lambda: now)
+    store = OHLCVStore(tmp_path)
+    store.append("BTCUSDT", "1m", df.iloc[:190])
+    client = FakeClient(klines)
+    st = Streamer.__new__(Streamer)
+    st.client, st.bar_store, st.store = client, BarStore(), store
+    asyncio.run(st.preload_history(["BTCUSDT"], ["1m"], limit=100))
+
+    assert client.limits == [10]                        # 9 eksik kapanmış + açık bar
+    closes = st.bar_store.get_ohlcv("BTCUSDT", "1m")["close"]
+    assert np.array_equal(closes, df["close"].to_numpy()[-110:-1])   # açık bar stream’in
+    assert store.last_ts("BTCUSDT", "1m") == int(t[-2])  # açık bar depoya yazılmaz
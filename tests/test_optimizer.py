@@ -0,0 +1,89 @@
+# tests/test_optimizer.py
+import numpy as np
+import pandas as pd
+import pytest
+
+from backtest.backtester import BacktestEngine
+from backtest.optimizer import grid_space, optimize, random_space
+from backtest.shared_frame import SharedFrame, attach
+from strategies import load_strategy
+from utils.bar_store import BarStore
+from utils.indicator_cache import FRAME_MEMO
+
+EFF = {"leverage": 4, "sl_pct": 6, "tp_pct": 3, "expire_sec": 3600 * 12}
+
+
+def _df(n=1_500, seed=0):
+    rng = np.random.default_rng(seed)
+    c = 100 + np.cumsum(rng.normal(0, 1, n))
+    return pd.DataFrame({"open": c, "high": c + rng.random(n), "low": c - rng.random(n),
+                         "close": c, "volume": rng.random(n) * 100},
+                        index=pd.date_range("2024-01-01", periods=n, freq="1h"))
+
+
+def test_spaces():
+    g = grid_space({"a": [1, 2, 3], "b": [4, 5], "c": 7})
+    assert len(g) == 6 and all(x["c"] == 7 for x in g)
+    r1 = random_space({"a": (5, 20), "b": [1, 2], "x": (0.5, 1.5)}, 30, seed=1)
+    assert r1 == random_space({"a": (5, 20), "b": [1, 2], "x": (0.5, 1.5)}, 30, seed=1)
+    assert all(5 <= x["a"] <= 20 and isinstance(x["a"], int) for x in r1)
+
+
+def test_shared_frame_roundtrip():
+    df = _df(100)
+    with SharedFrame(df) as shared:
+        view = attach(shared.spec)
+        assert view.index.equals(df.index)
+        assert np.array_equal(view.to_numpy(), df.to_numpy())
+        assert view.attrs["memo_key"] == shared.spec["name"]
+
+
+@pytest.mark.parametrize("workers", [1, 2])
+def test_sweep_matches_direct_runs(workers):
+    df = _df()
+    space = {"rsi_period": [7, 14], "rsi_overbought": [60, 70], "rsi_oversold": [30, 40]}
+    FRAME_MEMO.clear()
+    table = optimize(df, "rsi_threshold_strategy", "1h", space,
+                     effective_params=EFF, workers=workers, rank_by="TotalProfit")
+    assert len(table) == 8
+    assert table["TotalProfit"].is_monotonic_decreasing
+
+    for _, row in table.iterrows():
+        params = {k: int(row[k]) for k in space}
+        strat = load_strategy({"name": "rsi_threshold_strategy", "params": params},
+                              bar_store=BarStore(), symbol="X", timeframe="1h")
+        res = BacktestEngine(df, strat, effective_params=EFF, timeframe="1h").run()
+        assert row["Trades"] == len(res["trades"])
+        assert row["TotalProfit"] == pytest.approx(
+            res["equity_curve"].iloc[-1] - res["equity_curve"].iloc[0])
+
+    if workers == 1:                       # 8 kombinasyon, 2 RSI periyodu
+        assert FRAME_MEMO.stats()["misses"] == 2
+
+
+def test_memo_not_shared_between_slices_of_a_shared_frame():
+    from backtest.worker import BacktestTask, run_backtest_task
+    df = _df(500)
+    FRAME_MEMO.clear()
+    with SharedFrame(df) as shared:
+        task = BacktestTask("X", "1h", "rsi_threshold_strategy", {"rsi_period": 7},
+                            data=shared.spec, effective_params=EFF)
+        full = run_backtest_task(task)
+        part = run_backtest_task(task._replace(end_date=df.index[200]))
+    direct = run_backtest_task(task._replace(data=df.loc[:df.index[200]].copy()))
+    assert full is not None
+    assert part["metrics"] == direct["metrics"]
+
+
+def test_frame_memo_byte_budget_and_release():
+    from utils.indicator_cache import FrameMemo
+    memo = FrameMemo(maxsize=100, max_bytes=3 * 8 * 500)      # üç tam seri
+    df = _df(500)
+    with SharedFrame(df) as shared:
+        view = shared.frame()
+        for p in range(5):
+            memo.get(view, "X", (p,), lambda: np.zeros(500))
+        assert memo.stats()["entries"] == 3 and memo.nbytes == 3 * 8 * 500
+        memo.get(view, "X", (4,), lambda: pytest.fail("en yeni girdi düşmemeli"))
+        memo.discard(shared.spec["name"])
+    assert memo.stats()["entries"] == 0 and memo.nbytes == 0
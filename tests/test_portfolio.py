@@ -0,0 +1,74 @@
+# tests/test_portfolio.py
+import numpy as np
+import pandas as pd
+import pytest
+
+import backtest.exits as ex
+from backtest.portfolio import PortfolioEngine
+
+EFF = {"leverage": 4, "sl_pct": 6, "tp_pct": 4, "expire_sec": 3600 * 8}
+
+
+def _frame(n, seed, start="2024-01-01"):
+    rng = np.random.default_rng(seed)
+    c = 100 + np.cumsum(rng.normal(0, 0.5, n))
+    o = np.r_[c[0], c[:-1]]
+    return pd.DataFrame({"open": o, "high": np.maximum(o, c) + rng.random(n) * .5,
+                         "low": np.minimum(o, c) - rng.random(n) * .5, "close": c,
+                         "volume": 1.0},
+                        index=pd.date_range(start, periods=n, freq="1h"))
+
+
+def _scfg(name="s", coins=("ALL_USDT",), eff=EFF):
+    return {"name": name, "coins": list(coins), "timeframe": "1h", "params": {},
+            "effective_params": eff}
+
+
+def test_single_symbol_matches_exit_engine():
+    df = _frame(2_000, 1)
+    rng = np.random.default_rng(5)
+    sig = np.where(rng.random(len(df)) < 0.05, rng.choice([-1, 1], len(df)), 0)
+    eng = PortfolioEngine({"BTCUSDT": df}, [_scfg()], "1h", base_usdt_per_trade=10,
+                          max_concurrent=5, signals={"s": sig[:, None]})
+    res = eng.run()
+    hits = ex.first_hits(df.open, df.high, df.low, df.close, sig, EFF, "1h")
+    tr = res["trades"]
+    for k in ("entry_idx", "exit_idx", "side", "entry_price", "exit_price", "exit_type"):
+        assert np.array_equal(tr[k], hits[k]), k
+    assert np.allclose(tr["qty"], 40 / tr["entry_price"])
+    assert res["final_balance"] == pytest.approx(1000 + tr["pnl"].sum())
+    assert res["equity_curve"].iloc[-1] == pytest.approx(res["final_balance"])
+
+
+def test_concurrency_cap_and_key_uniqueness():
+    frames = {f"S{i}": _frame(300, i) for i in range(6)}
+    frames["S5"] = frames["S5"].iloc[50:]                 # geç başlayan sembol
+    T = 300
+    sig = np.ones((T, 6), dtype=int)                       # herkes her bar sinyal veriyor
+    strategies = [_scfg("a"), _scfg("b", coins=["S4", "S5"])]
+    res = PortfolioEngine(frames, strategies, "1h", max_concurrent=3,
+                          signals={"a": sig, "b": sig}).run()
+    assert res["open_positions"].max() == 3
+    tr = res["trades"]
+    # ilk bar: strateji sırası, sonra sembol sırası
+    first = tr[tr["entry_idx"] == 0]
+    assert sorted(zip(first["strategy"], first["symbol"])) == [(0, 0), (0, 1), (0, 2)]
+    # aynı anahtar üst üste binmez
+    for key in set(zip(tr["strategy"], tr["symbol"])):
+        m = (tr["strategy"] == key[0]) & (tr["symbol"] == key[1])
+        e, x = tr["entry_idx"][m], tr["exit_idx"][m]
+        assert (x[:-1] < e[1:]).all()
+    assert not ((tr["strategy"] == 1) & (tr["symbol"] < 4)).any()     # coins filtresi
+    s5 = tr["symbol"] == 5
+    assert (tr["entry_idx"][s5] >= 50).all()
+
+
+def test_strategy_signals_from_config():
+    frames = {s: _frame(400, i) for i, s in enumerate(("BTCUSDT", "ETHUSDT"))}
+    scfg = {"name": "rsi_threshold_strategy", "coins": ["ALL_USDT"], "timeframe": "1h",
+            "params": {"rsi_period": 14, "rsi_overbought": 60, "rsi_oversold": 40},
+            "effective_params": EFF}
+    res = PortfolioEngine(frames, [scfg, {**scfg, "timeframe": "4h"}], "1h",
+                          max_concurrent=2).run()
+    assert res["strategies"] == ["rsi_threshold_strategy"]
+    assert len(res["trades"]) > 0
@@ -0,0 +1,100 @@
+# tests/test_rest_scheduler.py
+import asyncio
+import time
+from types import SimpleNamespace
+
+import pytest
+from binance.exceptions import BinanceAPIException
+
+from live.rest_scheduler import (ORDER, PRELOAD, RestScheduler, ScheduledClient,
+                                 request_weight)
+
+
+class FakeClient:
+    tld = "com"
+
+    def __init__(self, used=None, fail=0):
+        self.calls = []
+        self.used = used
+        self.fail = fail
+        self.response = None
+
+    async def futures_klines(self, symbol, interval, limit):
+        return await self._hit(symbol)
+
+    async def futures_create_order(self, symbol, **kw):
+        return await self._hit(symbol)
+
+    async def _hit(self, symbol):
+        if self.fail:
+            self.fail -= 1
+            resp = SimpleNamespace(headers={"Retry-After": "0"}, text="")
+            raise BinanceAPIException(resp, 429, '{"code": -1003, "msg": "Too many requests"}')
+        self.calls.append(symbol)
+        self.response = SimpleNamespace(headers={"x-mbx-used-weight-1m": str(self.used or 0)})
+        return symbol
+
+
+def test_request_weight_tiers():
+    assert [request_weight("futures_klines", {"limit": n}) for n in (50, 200, 500, 1500)] \
+        == [1, 2, 5, 10]
+    assert request_weight("futures_mark_price", {}) == 10
+    assert request_weight("futures_position_information", {"symbol": "X"}) == 5
+    assert request_weight("futures_ticker", {}) == 1
+
+
+def test_orders_overtake_queued_preload_when_window_rolls():
+    async def go():
+        sched = RestScheduler(10, window=0.2, safety=1.0, skew=0)
+        raw = FakeClient()
+        client = ScheduledClient(raw, sched)
+        t0 = time.time()
+        # 3 × 5 ağırlık: ikisi bu pencerede, üçüncüsü sıradaki pencerede
+        pre = [asyncio.create_task(client.futures_klines(symbol=f"P{i}", interval="1m", limit=500))
+               for i in range(3)]
+        await asyncio.sleep(0)
+        order = asyncio.create_task(client.futures_create_order(symbol="O", side="BUY"))
+        await asyncio.gather(*pre, order)
+        return raw.calls, time.time() - t0, sched.stats
+
+    calls, dt, stats = asyncio.run(go())
+    assert calls[:2] == ["P0", "P1"]
+    assert calls[2] == "O"                           # kova açılınca önce emir
+    assert calls[3] == "P2"
+    assert dt < 1.0
+    assert stats["weight"] == 16 and stats["requests"] == 4
+
+
+def test_used_weight_header_drains_bucket():
+    async def go():
+        sched = RestScheduler(100, window=0.3, safety=1.0, skew=0)
+        client = ScheduledClient(FakeClient(used=100), sched)
+        await client.futures_klines(symbol="A", interval="1m", limit=50)
+        assert sched._used == 100                     # sunucu sayımı kovaya yansıdı
+        win = sched._win
+        await client.futures_klines(symbol="B", interval="1m", limit=50)
+        return win, sched._win
+
+    before, after = asyncio.run(go())
+    assert after > before                             # ikinci çağrı sonraki pencerede
+
+
+def test_throttled_call_is_retried_and_orders_are_not():
+    async def go(method, **kw):
+        sched = RestScheduler(100, window=0.2, skew=0)
+        raw = FakeClient(fail=1)
+        client = ScheduledClient(raw, sched)
+        await getattr(client, method)(symbol="A", **kw)
+        return raw.calls, sched.stats["throttled"]
+
+    assert asyncio.run(go("futures_klines", interval="1m", limit=10)) == (["A"], 1)
+    with pytest.raises(BinanceAPIException):
+        asyncio.run(go("futures_create_order", side="BUY", priority=ORDER))
+
+
+def test_scheduled_client_passes_through_plain_attributes():
+    raw = FakeClient()
+    client = ScheduledClient(raw)
+    assert client.tld == "com" and client.raw is raw
+    assert asyncio.run(client.futures_klines(symbol="X", interval="1m", limit=5,
+                                             priority=PRELOAD)) == "X"
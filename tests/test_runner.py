@@ -0,0 +1,75 @@
+# tests/test_runner.py
+import json
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from backtest.runner import expand_jobs, load_results, local_symbols, run_job, run_universe
+
+EFF = {"leverage": 4, "sl_pct": 6, "tp_pct": 3, "expire_sec": 3600}
+
+
+def _write_csv(path, n=400, seed=0):
+    rng = np.random.default_rng(seed)
+    c = 100 + np.cumsum(rng.normal(0, 1, n))
+    pd.DataFrame({"timestamp": (np.arange(n) * 3_600_000 + 1_700_000_000_000),
+                  "open": c, "high": c + 1, "low": c - 1, "close": c,
+                  "volume": rng.random(n)}).to_csv(path, index=False)
+
+
+def _strategies():
+    rsi = {"name": "rsi_threshold_strategy", "coins": ["ALL_USDT"],
+           "params": {"rsi_period": 14, "rsi_overbought": 65, "rsi_oversold": 35},
+           "effective_params": EFF}
+    st = {"name": "super_trend", "coins": ["btc/usdt", "XRPUSDT"],
+          "params": {"atr_period": 10, "multiplier": 2.0}, "effective_params": EFF}
+    return [{**rsi, "timeframe": "1h"}, {**rsi, "timeframe": "4h"},
+            {**st, "timeframe": "1h"}]
+
+
+def _data(tmp_path):
+    for i, sym in enumerate(("BTCUSDT", "ETHUSDT", "SOLUSDT")):
+        _write_csv(tmp_path / f"{sym}_1h.csv", seed=i)
+    _write_csv(tmp_path / "BTCUSDT_4h.csv", seed=9)
+    return tmp_path
+
+
+def test_expand_jobs(tmp_path):
+    d = _data(tmp_path)
+    assert local_symbols(d, "1h") == ["BTCUSDT", "ETHUSDT", "SOLUSDT"]
+    jobs = expand_jobs(_strategies(), lambda tf: local_symbols(d, tf))
+    keys = [(j["strategy"], j["symbol"], j["timeframe"]) for j in jobs]
+    assert keys == [("rsi_threshold_strategy", s, "1h") for s in ("BTCUSDT", "ETHUSDT", "SOLUSDT")] + \
+        [("rsi_threshold_strategy", "BTCUSDT", "4h"), ("super_trend", "BTCUSDT", "1h")]
+    assert len({j["id"] for j in jobs}) == len(jobs)
+
+
+def test_run_and_resume(tmp_path):
+    d = _data(tmp_path)
+    out = tmp_path / "res" / "bt.jsonl"
+    first = run_universe(_strategies(), out, data_dir=d, workers=2)
+    assert first["ran"] == 5 and first["errors"] == 0 and first["bars"] == 5 * 400
+    rows = load_results(out)
+    assert all("Sharpe" in r["metrics"] for r in rows.values())
+
+    # kesinti: son satır yarım yazılmış, bir iş eksik
+    lines = out.read_text().splitlines()
+    out.write_text("\n".join(lines[:-1]) + "\n" + lines[-1][:20])
+    again = run_universe(_strategies(), out, data_dir=d, workers=2)
+    assert again["skipped"] == 4 and again["ran"] == 1
+    assert set(load_results(out)) == set(rows)
+
+
+def test_exit_mode_defaults_to_signal_flips(tmp_path):
+    d = _data(tmp_path)
+    universe = lambda tf: local_symbols(d, tf)
+    sig, bar = (expand_jobs(_strategies()[:1], universe, exits=m)[0] for m in ("signal", "barrier"))
+    assert expand_jobs(_strategies()[:1], universe)[0] == sig
+    assert sig["id"] != bar["id"]                      # mod değişince iş yeniden koşar
+
+    rows = [run_job(j, d) for j in (sig, bar)]
+    assert [r["exits"] for r in rows] == ["signal", "barrier"]
+    assert rows[0]["metrics"] != rows[1]["metrics"]
+    with pytest.raises(ValueError):
+        expand_jobs(_strategies(), universe, exits="trailing")
@@ -0,0 +1,146 @@
+# tests/test_strategies.py
+import numpy as np
+import pytest
+
+import strategies.volume_rsi_spike as vrs
+from strategies import load_strategy
+from utils.bar_store import BarStore
+
+
+class ApproveAll:
+    def predict(self, X):
+        return np.ones(len(X), dtype=int)
+
+
+def _spiky(n=600, seed=1):
+    rng = np.random.default_rng(seed)
+    c = 100 + np.cumsum(rng.normal(0, 1.5, n))
+    h = c + rng.random(n)
+    l = c - rng.random(n)
+    o = c + rng.normal(0, .3, n)
+    v = rng.random(n) * 100
+    v[rng.random(n) < 0.08] *= 12           # ara sıra hacim patlaması
+    return o, h, l, c, v
+
+
+def _scfg(name, **params):
+    return {"name": name, "params": params,
+            "effective_params": {"leverage": 2, "sl_pct": 3, "tp_pct": 3, "expire_sec": 60}}
+
+
+@pytest.fixture
+def approve_models(monkeypatch):
+    monkeypatch.setattr(vrs, "load_model", lambda *a: ApproveAll())
+
+
+@pytest.mark.parametrize("name, params", [
+    ("rsi_threshold_strategy", {"rsi_period": 14, "rsi_overbought": 60, "rsi_oversold": 40}),
+    ("super_trend", {"atr_period": 10, "multiplier": 2.0}),
+    ("volume_rsi_spike", {"rsi_period": 10, "cross_lookback": 4, "buy_low_th": 45,
+                          "buy_high_th": 50, "sell_high_th": 55, "sell_low_th": 50,
+                          "buy_vol_mult": 2, "sell_vol_mult": 2}),
+])
+@pytest.mark.parametrize("maxlen", [600, 200])     # 200: halka dolup sarıyor
+def test_stream_signal_matches_array_signal(approve_models, name, params, maxlen):
+    o, h, l, c, v = _spiky()
+    store = BarStore(maxlen=maxlen)
+    strat = load_strategy(_scfg(name, **params), bar_store=store,
+                          symbol="BTCUSDT", timeframe="1h")
+    fired = 0
+    for i in range(len(c)):
+        store.add_bar("BTCUSDT", "1h", {"t": i, "o": o[i], "h": h[i], "l": l[i],
+                                        "c": c[i], "v": v[i], "x": True})
+        live = strat._live_signal(o[:i + 1], h[:i + 1], l[:i + 1], c[:i + 1], v[:i + 1]) \
+            if i >= 1 else None
+        assert strat.generate_signal() == live, i
+        fired += live is not None
+    assert fired > 0
+
+
+class CountingModel:
+    """Özelliğe bağlı onay; çağrı ve satır sayılarını kaydeder."""
+
+    def __init__(self):
+        self.calls = []
+
+    def predict(self, X):
+        self.calls.append(len(X))
+        return (X[:, 0] > 50).astype(int)          # rsi > 50 ise onay
+
+
+VRS_PARAMS = {"rsi_period": 10, "cross_lookback": 4, "buy_low_th": 45,
+              "buy_high_th": 50, "sell_high_th": 55, "sell_low_th": 50,
+              "buy_vol_mult": 2, "sell_vol_mult": 2}
+
+
+def test_volume_rsi_spike_batch_matches_single(monkeypatch):
+    monkeypatch.setattr(vrs, "load_model", lambda *a: CountingModel())
+    vrs.INFERENCE_STATS.clear()
+    store = BarStore()
+    strat = load_strategy(_scfg("volume_rsi_spike", **VRS_PARAMS),
+                          bar_store=store, symbol="S0", timeframe="1h")
+    cols = [_spiky(n=120, seed=s) for s in range(40)]
+    mats = [np.stack([col[k] for col in cols]) for k in range(5)]
+
+    # son 30 bar boyunca kesitsel çağrı = sembol başına _live_signal
+    fired = 0
+    for end in range(90, 121):
+        window = [m[:, :end] for m in mats]
+        batch = strat.generate_signals_batch(*window)
+        single = [strat._live_signal(*(m[i] for m in window)) for i in range(len(cols))]
+        assert batch.tolist() == [int(s) if s else 0 for s in single], end
+        fired += int(np.count_nonzero(batch))
+    assert fired > 0
+
+    # taraf başına bar kapanışında en fazla bir predict çağrısı
+    m = strat.model_buy
+    batched = [n for n in m.calls if n > 1]
+    assert batched, m.calls
+    stats = strat.batch_metrics()
+    assert set(stats) <= {"buy", "sell"} and stats
+    assert all(s["batches"] > 0 and s["rows"] >= s["batches"] for s in stats.values())
+
+
+def test_volume_rsi_spike_stream_batch_matches_single(monkeypatch):
+    monkeypatch.setattr(vrs, "load_model", lambda *a: CountingModel())
+    store = BarStore(maxlen=100)
+    symbols = [f"S{k}" for k in range(40)]
+    insts = [load_strategy(_scfg("volume_rsi_spike", **VRS_PARAMS), bar_store=store,
+                           symbol=sym, timeframe="1h") for sym in symbols]
+    cols = [_spiky(n=160, seed=s) for s in range(len(symbols))]
+
+    fired = 0
+    for i in range(160):
+        for sym, (o, h, l, c, v) in zip(symbols, cols):
+            store.add_bar(sym, "1h", {"t": i, "o": o[i], "h": h[i], "l": l[i],
+                                      "c": c[i], "v": v[i], "x": True})
+        if i < 60:
+            continue
+        model = insts[0].model_buy
+        before = len(model.calls)
+        batch = insts[0].stream_signals_batch(insts)
+        assert len(model.calls) - before <= 1          # taraf başına tek predict
+        single = [inst._live_signal(*(col[k][:i + 1] for k in range(5)))
+                  for inst, col in zip(insts, cols)]
+        assert batch == single, i
+        fired += sum(map(bool, batch))
+    assert fired > 0
+
+
+def test_volume_rsi_spike_generate_signals_matches_replay(monkeypatch):
+    import pandas as pd
+    monkeypatch.setattr(vrs, "load_model", lambda *a: CountingModel())
+    strat = load_strategy(_scfg("volume_rsi_spike", **VRS_PARAMS),
+                          bar_store=BarStore(), symbol="BTCUSDT", timeframe="30m")
+    o, h, l, c, v = _spiky(n=400, seed=1)
+    df = pd.DataFrame({"open": o, "high": h, "low": l, "close": c, "volume": v},
+                      index=pd.date_range("2024-01-01", periods=len(c), freq="30min"))
+
+    sig = strat.generate_signals(df)
+    calls = [len(strat.model_buy.calls), len(strat.model_sell.calls)]
+    assert max(calls) == 1                         # taraf başına tek predict
+
+    replay = [strat._live_signal(o[:i + 1], h[:i + 1], l[:i + 1], c[:i + 1], v[:i + 1])
+              for i in range(len(c))]
+    assert sig.tolist() == [int(s) if s else 0 for s in replay]
+    assert sig.abs().sum() > 0
@@ -0,0 +1,126 @@
+# tests/test_streamer.py
+from utils.bar_store import BarStore
+from live.streamer import Streamer
+
+
+class FakeClient:
+    tld = "com"
+    testnet = False
+    demo = False
+
+
+def _streamer(symbols=("BTCUSDT", "ETHUSDT"), intervals=("1m", "5m")):
+    return Streamer(FakeClient(), list(symbols), list(intervals), BarStore())
+
+
+def _frame(ts, ticks):
+    return [{"E": ts * 1000, "s": s, "c": str(c), "q": str(q)} for s, c, q in ticks]
+
+
+def _feed(st, ts, ticks):
+    idx, price, vol = st._frame_arrays(_frame(ts, ticks))
+    st._update_batch(idx, price, vol, ts)
+
+
+def _drain(st):
+    out = []
+    while not st.queue.empty():
+        out.append(st.queue.get_nowait())
+    return out
+
+
+def test_batch_aggregates_ohlcv_and_skips_unknown_symbols():
+    st = _streamer()
+    _feed(st, 0,  [("BTCUSDT", 10, 1), ("XRPUSDT", 1, 1), ("ETHUSDT", 5, 2)])
+    _feed(st, 10, [("BTCUSDT", 12, 1), ("ETHUSDT", 4, 2)])
+    _feed(st, 20, [("BTCUSDT", 9, 1)])
+    _feed(st, 61, [("BTCUSDT", 11, 1)])       # 1m sınırı + close_delay: açık barlar kapanır
+
+    events = _drain(st)
+    assert [e["i"] for e in events] == ["1m"]
+    bars = {b["s"]: b["k"] for b in events[0]["bars"]}
+    assert set(bars) == {"BTCUSDT", "ETHUSDT"}
+    k = bars["BTCUSDT"]
+    assert (k["o"], k["h"], k["l"], k["c"], k["v"]) == (10, 12, 9, 9, 3)
+    assert k["start"] == 0 and k["x"] is True
+    assert bars["ETHUSDT"]["c"] == 4 and bars["ETHUSDT"]["v"] == 4
+
+    assert list(st.bar_store.get_ohlcv("BTCUSDT", "1m")["close"]) == [9.0]
+    assert list(st.bar_store.get_ohlcv("ETHUSDT", "1m")["close"]) == [4.0]
+
+
+def test_clock_closes_without_ticks_and_drops_late_ticks():
+    st = _streamer()
+    _feed(st, 250, [("BTCUSDT", 1, 1), ("ETHUSDT", 2, 1)])
+    st._close_due(300)                        # zamanlayıcı: 1m ve 5m birlikte
+    events = _drain(st)
+    assert sorted(e["i"] for e in events) == ["1m", "5m"]
+    assert all(len(e["bars"]) == 2 for e in events)
+    assert {e["t"] for e in events} == {300_000}
+
+    _feed(st, 299, [("BTCUSDT", 99, 1)])      # kapanmış bara geç tick
+    st._close_due(360)
+    assert _drain(st) == []
+    assert list(st.bar_store.get_ohlcv("BTCUSDT", "1m")["close"]) == [1.0]
+
+
+def test_tick_path_waits_close_delay_and_keeps_late_ticks():
+    st = _streamer()
+    _feed(st, 10, [("BTCUSDT", 10, 1), ("ETHUSDT", 5, 1)])
+    _feed(st, 60, [("BTCUSDT", 20, 1)])       # yeni bar; eski henüz kapanmaz
+    assert _drain(st) == []
+    _feed(st, 59, [("BTCUSDT", 8, 2), ("ETHUSDT", 6, 1)])   # eski bara geç tick
+    _feed(st, 61, [("BTCUSDT", 21, 1)])       # pay doldu → 0. dakika kapanır
+
+    events = _drain(st)
+    assert [e["i"] for e in events] == ["1m"] and events[0]["t"] == 60_000
+    bars = {b["s"]: b["k"] for b in events[0]["bars"]}
+    b = bars["BTCUSDT"]
+    assert (b["o"], b["h"], b["l"], b["c"], b["v"], b["start"]) == (10, 10, 8, 8, 3, 0)
+    assert (bars["ETHUSDT"]["c"], bars["ETHUSDT"]["v"]) == (6, 2)
+
+    st._close_due(120)                        # yeni bar geç tick’ten etkilenmedi
+    k = _drain(st)[0]["bars"][0]["k"]
+    assert (k["o"], k["h"], k["l"], k["c"], k["v"], k["start"]) == (20, 21, 20, 21, 2, 60)
+
+
+def test_single_tick_path_matches_batch():
+    a, b = _streamer(), _streamer()
+    ticks = [(0, "BTCUSDT", 1, 1), (0, "ETHUSDT", 2, 1), (30, "BTCUSDT", 3, 1),
+             (61, "BTCUSDT", 2, 1), (61, "ETHUSDT", 1, 1), (301, "BTCUSDT", 5, 1)]
+    for ts, s, c, q in ticks:
+        a._update_partial(s, c, q, ts)
+    for ts in sorted({t[0] for t in ticks}):
+        _feed(b, ts, [(s, c, q) for t, s, c, q in ticks if t == ts])
+    assert _drain(a) == _drain(b)
+
+
+def test_preload_after_snapshot_fetches_only_missing_bars(tmp_path, monkeypatch):
+    import asyncio
+
+    class RestClient:
+        def __init__(self):
+            self.limits = []
+
+        async def futures_klines(self, symbol, interval, limit):
+            self.limits.append((symbol, limit))
+            return [[t, "1", "2", "0.5", "1.5", "10", t + 59_999]
+                    for t in range(10 * 60_000 - (limit - 1) * 60_000, 11 * 60_000, 60_000)]
+
+    old = BarStore()
+    for i in range(8):                                  # son kapanan bar: 7. dakika
+        old.add_bar("BTCUSDT", "1m", {"t": i * 60_000, "o": 1, "h": 2, "l": 0.5,
+                                      "c": 1, "v": 1, "x": True})
+    old.add_bar("ETHUSDT", "1m", {"t": 0, "o": 1, "h": 1, "l": 1, "c": 1, "v": 1, "x": True})
+    old.save_snapshot(tmp_path / "bars.npz")
+
+    monkeypatch.setattr("live.streamer.time.time", lambda: 10 * 60 + 30)   # 10. bar açık
+    st = Streamer.__new__(Streamer)
+    st.client, st.bar_store, st.store = RestClient(), BarStore(), None
+    assert st.bar_store.load_snapshot(tmp_path / "bars.npz") == 2
+    asyncio.run(st.preload_history(["BTCUSDT", "ETHUSDT"], ["1m"], limit=5))
+
+    assert dict(st.client.limits) == {"BTCUSDT": 3, "ETHUSDT": 5}   # ETH bayat → tam yük
+    # açık 10. bar ne BarStore’a ne anlık görüntüye girer
+    assert list(st.bar_store.get_times("BTCUSDT", "1m") // 60_000) == list(range(10))
+    assert list(st.bar_store.get_times("ETHUSDT", "1m") // 60_000) == [6, 7, 8, 9]
@@ -0,0 +1,67 @@
+# tests/test_walk_forward.py
+import numpy as np
+import pandas as pd
+import pytest
+
+from backtest.backtester import BacktestEngine
+from backtest.metrics import calculate_metrics
+from backtest.walk_forward import walk_forward, windows
+from strategies import load_strategy
+from utils.bar_store import BarStore
+
+SPACE = {"rsi_period": [7, 14], "rsi_overbought": [60, 70], "rsi_oversold": [30, 40]}
+
+
+def _df(n=3_000, seed=2):
+    rng = np.random.default_rng(seed)
+    c = 100 + np.cumsum(rng.normal(0, 1, n))
+    return pd.DataFrame({"open": c, "high": c + rng.random(n), "low": c - rng.random(n),
+                         "close": c, "volume": 1.0},
+                        index=pd.date_range("2024-01-01", periods=n, freq="1h"))
+
+
+def test_windows():
+    assert windows(100, 40, 20) == [(0, 40, 40, 60), (20, 60, 60, 80), (40, 80, 80, 100)]
+    assert windows(100, 40, 20, step=30) == [(0, 40, 40, 60), (30, 70, 70, 90)]
+    with pytest.raises(ValueError):
+        windows(100, 40, 20, step=10)
+
+
+def test_walk_forward():
+    df = _df()
+    kw = dict(train=1_000, test=400, objective="TotalProfit")
+    wf = walk_forward(df, "rsi_threshold_strategy", "1h", SPACE, workers=1, **kw)
+    win = wf["windows"]
+    assert len(win) == 5
+    eq = wf["equity_curve"]
+    assert len(eq) == 5 * 400 and eq.index.is_monotonic_increasing
+    assert wf["final_balance"] == pytest.approx(eq.iloc[-1])
+    assert wf["final_balance"] == pytest.approx(1000 + wf["trades"]["pnl"].sum())
+    # Sharpe / Sortino bar boyuna göre yıllıklaştırılır (1h → 8760)
+    assert wf["metrics"]["Sharpe"] == pytest.approx(
+        calculate_metrics(eq, wf["trades"], timeframe="1h")["Sharpe"])
+    assert wf["metrics"]["Sharpe"] != pytest.approx(calculate_metrics(eq, wf["trades"])["Sharpe"])
+
+    # seçilen parametre: tam geçmiş üzerinde hesaplanıp dilimlenen sinyallerle
+    # in‑sample en iyi TotalProfit
+    a, b = 0, 1_000
+    best = -np.inf
+    for rp in SPACE["rsi_period"]:
+        for ob in SPACE["rsi_overbought"]:
+            for os_ in SPACE["rsi_oversold"]:
+                params = {"rsi_period": rp, "rsi_overbought": ob, "rsi_oversold": os_}
+                strat = load_strategy({"name": "rsi_threshold_strategy", "params": params},
+                                      bar_store=BarStore(), symbol="X", timeframe="1h")
+                sig = strat.backtest_signals(df).iloc[a:b]
+
+                class S:
+                    def generate_signals(self, d, sig=sig):
+                        return sig
+
+                res = BacktestEngine(df.iloc[a:b], S()).run()
+                best = max(best, calculate_metrics(res["equity_curve"], res["trades"])["TotalProfit"])
+    assert win.loc[0, "is_TotalProfit"] == pytest.approx(best)
+
+    par = walk_forward(df, "rsi_threshold_strategy", "1h", SPACE, workers=2, **kw)
+    pd.testing.assert_series_equal(par["equity_curve"], eq)
+    assert par["windows"][list(SPACE)].equals(win[list(SPACE)])
@@ -1,39 +1,242 @@
 # utils/bar_store.py
-from collections import defaultdict
-from typing import Dict, List
+import os
+import zipfile
+from pathlib import Path
+from typing import Callable, Dict, List, Optional
+import numpy as np
+
+FIELDS = ("open", "high", "low", "close", "volume")
+
+
+class _Ring:
+    """
+    Tek (symbol, timeframe) için önceden ayrılmış OHLCV halkası.
+    Her bar hem `pos` hem `pos + maxlen` sütununa yazılır (çift yazım);
+    böylece son `size` bar her zaman [end - size, end) aralığında
+    kronolojik ve bitişik durur → kopyasız görünüm döndürülebilir.
+    """
+    __slots__ = ("maxlen", "buf", "ts", "pos", "size", "_view")
+
+    def __init__(self, maxlen: int):
+        self.maxlen = maxlen
+        self.buf  = np.zeros((len(FIELDS), 2 * maxlen), dtype=np.float64)
+        self.ts   = np.zeros(2 * maxlen, dtype=np.int64)
+        self.pos  = 0          # sıradaki yazım indeksi (0..maxlen-1)
+        self.size = 0
+        self._view = None
+
+    def append(self, row, t: int) -> None:
+        p, m = self.pos, self.maxlen
+        self.buf[:, p] = row
+        self.buf[:, p + m] = row
+        self.ts[p] = self.ts[p + m] = t
+        self.pos = (p + 1) % m
+        if self.size < m:
+            self.size += 1
+        self._view = None
+
+    def _span(self) -> tuple[int, int]:
+        end = self.pos + self.maxlen
+        return end - self.size, end
+
+    def view(self) -> dict[str, np.ndarray]:
+        if self._view is None:
+            s, e = self._span()
+            block = self.buf[:, s:e]
+            block.flags.writeable = False
+            self._view = {f: block[i] for i, f in enumerate(FIELDS)}
+        return self._view
+
+    def times(self) -> np.ndarray:
+        s, e = self._span()
+        out = self.ts[s:e]
+        out.flags.writeable = False
+        return out
+
+    def fill(self, block: np.ndarray, t: np.ndarray) -> None:
+        """Kronolojik (5 × n) blok + zamanlarla halkayı toptan doldurur."""
+        n, m = min(len(t), self.maxlen), self.maxlen
+        block, t = block[:, len(t) - n:], t[len(t) - n:]
+        self.buf[:, :n] = self.buf[:, m:m + n] = block
+        self.ts[:n] = self.ts[m:m + n] = t
+        self.pos, self.size = n % m, n
+        self._view = None
+
+
+SNAPSHOT_VERSION = 1
+
+
+def pack_snapshot(parts) -> dict:
+    """iter_snapshot parçaları → write_snapshot’ın yazdığı düz diziler."""
+    return {
+        "version": np.array(SNAPSHOT_VERSION),
+        "keys":  np.array([k for k, _, _ in parts], dtype=str),
+        "sizes": np.array([len(t) for _, t, _ in parts], dtype=np.int64),
+        "t":     np.concatenate([t for _, t, _ in parts] or [np.empty(0, np.int64)]),
+        "ohlcv": np.concatenate([b for _, _, b in parts]
+                                or [np.empty((len(FIELDS), 0))], axis=1),
+    }
+
+
+def write_snapshot(path, arrays: dict) -> None:
+    """
+    BarStore.snapshot() çıktısını tek .npz dosyasına atomik yazar: önce
+    geçici dosya + fsync, sonra os.replace – çökme anında eski anlık
+    görüntü sağlam kalır. Olay döngüsünü bloklamamak için executor’da
+    çağrılabilir (diziler zaten kopyadır).
+    """
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+    with open(tmp, "wb") as f:
+        np.savez(f, **arrays)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp, path)
+
+
+def _empty_view() -> dict[str, np.ndarray]:
+    out = {}
+    for f in FIELDS:
+        a = np.empty(0, dtype=np.float64)
+        a.flags.writeable = False
+        out[f] = a
+    return out
+
 
 class BarStore:
     """
     Tüm sembol‑timeframe kombinasyonları için ortak OHLCV tamponu.
     ▸ add_bar(...)   : Streamer içinden bar ekler
     ▸ get_ohlcv(...) : Stratejiler buradan veri çeker
+
+    Veri her anahtar için önceden ayrılmış NumPy halkasında tutulur;
+    get_ohlcv kronolojik sırada, salt‑okunur ve kopyasız görünümler döner.
     """
 
     def __init__(self, maxlen: int = 600):
         self._maxlen = maxlen
-        # data[(symbol, timeframe)] = {"open": [...], "high": [...], ...}
-        self._data: Dict[tuple[str, str], Dict[str, List[float]]] = defaultdict(
-            lambda: {"open": [], "high": [], "low": [], "close": [], "volume": []}
-        )
+        # data[(symbol, timeframe)] = _Ring
+        self._data: Dict[tuple[str, str], _Ring] = {}
+        # add_bar sonrası çağrılır: fn(symbol, tf, (o, h, l, c, v))
+        self._listeners: List[Callable] = []
+
+    def add_listener(self, fn: Callable) -> None:
+        """Kapanan her bar için fn(symbol, tf, row) çağrılır (ör. göstergeler)."""
+        self._listeners.append(fn)
+
+    @property
+    def maxlen(self) -> int:
+        return self._maxlen
 
     # ---------------- Streamer tarafından çağrılır -----------------
     def add_bar(self, symbol: str, tf: str, k: dict) -> None:
         """Binance kline JSON’dan kapanan mumu ekle."""
         if not k.get("x"):   # mum kapanmadı
             return
-        buf = self._data[(symbol, tf)]
-        buf["open"].append(float(k["o"]))
-        buf["high"].append(float(k["h"]))
-        buf["low"].append(float(k["l"]))
-        buf["close"].append(float(k["c"]))
-        buf["volume"].append(float(k["v"]))
-
-        # maxlen koruması
-        for arr in buf.values():
-            if len(arr) > self._maxlen:
-                del arr[: len(arr) - self._maxlen]
+        ring = self._data.get((symbol, tf))
+        if ring is None:
+            ring = self._data[(symbol, tf)] = _Ring(self._maxlen)
+
+        # açılış zamanı (ms): REST kline → "t", Streamer partial → "start" (sn)
+        t = k.get("t")
+        if t is None:
+            t = (k.get("start") or 0) * 1000
+        row = (float(k["o"]), float(k["h"]), float(k["l"]),
+               float(k["c"]), float(k["v"]))
+        ring.append(row, int(t))
+        for fn in self._listeners:
+            fn(symbol, tf, row)
 
     # ---------------- Stratejiler tarafından çağrılır --------------
-    def get_ohlcv(self, symbol: str, tf: str) -> dict[str, List[float]]:
-        """Kopya değil referans döner – strateji doğrudan kullanabilir."""
-        return self._data[(symbol, tf)]
+    def get_ohlcv(self, symbol: str, tf: str) -> dict[str, np.ndarray]:
+        """Kopya değil salt‑okunur görünüm döner – strateji doğrudan kullanabilir."""
+        ring = self._data.get((symbol, tf))
+        return ring.view() if ring is not None else _empty_view()
+
+    def get_times(self, symbol: str, tf: str) -> np.ndarray:
+        """Barların açılış zamanları (ms), get_ohlcv ile aynı sırada."""
+        ring = self._data.get((symbol, tf))
+        return ring.times() if ring is not None else np.empty(0, dtype=np.int64)
+
+    def get_matrices(self, symbols, tf: str) -> list[tuple[list[str], dict[str, np.ndarray]]]:
+        """
+        Kesitsel toplu değerlendirme için (sembol × bar) OHLCV matrisleri.
+        Tampon uzunluğu aynı olan semboller bir grupta toplanır; her grup
+        için ({field: 2‑D dizi}) döner. Kararlı durumda tüm semboller
+        maxlen’de olduğundan genellikle tek grup oluşur.
+        """
+        groups: Dict[int, List[str]] = {}
+        for sym in symbols:
+            ring = self._data.get((sym, tf))
+            if ring is not None and ring.size:
+                groups.setdefault(ring.size, []).append(sym)
+        out = []
+        for syms in groups.values():
+            views = [self._data[(s, tf)].view() for s in syms]
+            out.append((syms, {f: np.stack([v[f] for v in views]) for f in FIELDS}))
+        return out
+
+    def last_ts(self, symbol: str, tf: str) -> Optional[int]:
+        """Son kapanan barın açılış zamanı (ms); veri yoksa None."""
+        ring = self._data.get((symbol, tf))
+        if ring is None or ring.size == 0:
+            return None
+        return int(ring.ts[ring.pos + ring.maxlen - 1])
+
+    def drop(self, symbol: str, tf: str) -> None:
+        """Anahtarın tamponunu siler (ör. bayat anlık görüntü)."""
+        self._data.pop((symbol, tf), None)
+
+    # ---------------- Kalıcı anlık görüntü -------------------------
+    def iter_snapshot(self, chunk: int = 256):
+        """
+        Halkaların kronolojik kopyaları, `chunk` anahtarlık gruplar hâlinde:
+        [("SYM|tf", t, ohlcv), ...]. Gruplar arasında olay döngüsüne dönülebilir;
+        her halka kendi içinde tutarlı kopyalanır (anahtarlar bağımsızdır).
+        """
+        items = list(self._data.items())
+        for i in range(0, len(items), chunk):
+            part = []
+            for (sym, tf), ring in items[i:i + chunk]:
+                if ring.size:
+                    a, b = ring._span()
+                    part.append((f"{sym}|{tf}", ring.ts[a:b].copy(), ring.buf[:, a:b].copy()))
+            yield part
+
+    def snapshot(self) -> dict[str, np.ndarray]:
+        """
+        Tüm halkaların kronolojik içeriği, düz dizilerin kopyası olarak:
+        keys ("SYM|tf"), sizes, t (ms) ve ohlcv (5 × toplam bar).
+        """
+        return pack_snapshot([p for part in self.iter_snapshot() for p in part])
+
+    def save_snapshot(self, path) -> None:
+        write_snapshot(path, self.snapshot())
+
+    def load_snapshot(self, path) -> int:
+        """
+        Anlık görüntüyü tampona yükler; yüklenen anahtar sayısını döner.
+        Dosya yoksa / okunamıyorsa 0 (soğuk başlangıç). maxlen’den uzun
+        halkaların son maxlen barı alınır. Dinleyiciler çağrılmaz –
+        gösterge önbelleği last_ts’e bağlı olduğundan kendiliğinden tazelenir.
+        """
+        try:
+            with np.load(path, allow_pickle=False) as z:
+                if int(z["version"]) != SNAPSHOT_VERSION:
+                    return 0
+                keys, sizes, t, ohlcv = z["keys"], z["sizes"], z["t"], z["ohlcv"]
+        except (OSError, ValueError, KeyError, zipfile.BadZipFile):
+            return 0
+        ends = np.cumsum(sizes)
+        for key, a, b in zip(keys.tolist(), (ends - sizes).tolist(), ends.tolist()):
+            symbol, tf = key.rsplit("|", 1)
+            ring = self._data[(symbol, tf)] = _Ring(self._maxlen)
+            ring.fill(ohlcv[:, a:b], t[a:b])
+        return len(keys)
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def __contains__(self, key: tuple[str, str]) -> bool:
+        return key in self._data
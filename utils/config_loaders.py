@@ -56,6 +56,23 @@ class ConfigLoader:
     def get_preload_batch(self) -> int:
         return int(self.config.get("preload_batch", 50))
 
+    def get_rest_weight_limit(self) -> int:
+        """Dakikalık REST ağırlık sınırı (live.rest_scheduler)."""
+        return int(self.config.get("rest_weight_limit", 2400))
+
+    def get_store_dir(self) -> Path | None:
+        """Yerel OHLCV deposu (utils.ohlcv_store); tanımlı değilse None."""
+        d = self.config.get("store_dir")
+        return Path(d) if d else None
+
+    def get_snapshot_path(self) -> Path | None:
+        """BarStore anlık görüntü dosyası (.npz); tanımlı değilse None."""
+        p = self.config.get("snapshot_path")
+        return Path(p) if p else None
+
+    def get_snapshot_every(self) -> float:
+        return float(self.config.get("snapshot_every", 300))
+
     def get_expire_sec(self) -> int:
         ex = self.default_params.get("expire_sec", 300)
         return int(eval(ex)) if isinstance(ex, str) else int(ex)
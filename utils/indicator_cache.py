@@ -0,0 +1,144 @@
+# utils/indicator_cache.py
+"""
+Bar kapanışı başına gösterge önbelleği.
+
+Anahtar: (symbol, tf, gösterge, parametreler, son bar zamanı). Aynı
+(symbol, tf) üzerinde çalışan stratejiler aynı göstergeyi istediğinde
+hesap yalnızca bir kez yapılır. BarStore o anahtara yeni bar eklediğinde
+eski girdiler otomatik silinir.
+
+    cache = IndicatorCache.attach(bar_store)
+    atr = cache.get("BTCUSDT", "1h", "ATR", (("timeperiod", 10),), compute)
+    cache.stats()   # {"hits": .., "misses": .., "evictions": .., "entries": ..}
+
+Back‑test tarafında FrameMemo aynı veri bloğu üzerinde koşan parametre
+kombinasyonları arasında gösterge sonuçlarını paylaştırır (bkz.
+BaseStrategy.frame_indicator).
+"""
+from __future__ import annotations
+
+import weakref
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Tuple
+
+
+class IndicatorCache:
+    _caches: "weakref.WeakKeyDictionary" = weakref.WeakKeyDictionary()
+
+    def __init__(self, bar_store):
+        self.bar_store = bar_store
+        # _data[(symbol, tf)][(isim, parametreler, last_ts)] = sonuç
+        self._data: Dict[Tuple[str, str], Dict[tuple, Any]] = {}
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        bar_store.add_listener(self._on_bar)
+
+    @classmethod
+    def attach(cls, bar_store) -> "IndicatorCache":
+        """BarStore başına tek önbellek döndürür (yoksa yaratır)."""
+        cache = cls._caches.get(bar_store)
+        if cache is None:
+            cache = cls._caches[bar_store] = cls(bar_store)
+        return cache
+
+    def get(self, symbol: str, tf: str, name: str, params: tuple,
+            compute: Callable[[], Any]) -> Any:
+        """Önbellekte varsa döndür, yoksa compute() ile hesaplayıp sakla."""
+        key = (name, params, self.bar_store.last_ts(symbol, tf))
+        entries = self._data.setdefault((symbol, tf), {})
+        try:
+            out = entries[key]
+        except KeyError:
+            self.misses += 1
+            out = entries[key] = compute()
+        else:
+            self.hits += 1
+        return out
+
+    def _on_bar(self, symbol: str, tf: str, row: tuple) -> None:
+        entries = self._data.pop((symbol, tf), None)
+        if entries:
+            self.evictions += len(entries)
+
+    def stats(self) -> dict:
+        total = self.hits + self.misses
+        return {"hits": self.hits, "misses": self.misses,
+                "evictions": self.evictions,
+                "entries": sum(map(len, self._data.values())),
+                "hit_rate": self.hits / total if total else 0.0}
+
+
+class FrameMemo:
+    """
+    Süreç başına LRU gösterge önbelleği (back‑test / optimizasyon).
+
+    Anahtar: (df.attrs["memo_key"], uzunluk, ilk/son index, isim,
+    parametreler). memo_key’i olmayan DataFrame’ler önbelleğe alınmaz;
+    SharedFrame her bloğa kendi adını verir, böylece aynı RSI periyodunu
+    kullanan tüm kombinasyonlar tek hesabı paylaşır. pandas attrs’ı
+    dilimlere de kopyaladığından pencere (uzunluk + uçlar) anahtarın
+    parçasıdır: df.loc[:end] başka bir girdi olur.
+
+    Sınırlar: en fazla maxsize girdi ve max_bytes bayt (girdiler tam
+    uzunlukta dizilerdir; çok yıllık 1m serilerde sayı sınırı tek başına
+    yetmez). Aşılınca en eski kullanılan girdi düşer.
+    """
+
+    def __init__(self, maxsize: int = 128, max_bytes: int = 512 * 2**20):
+        self.maxsize = maxsize
+        self.max_bytes = max_bytes
+        self._data: "OrderedDict[tuple, Any]" = OrderedDict()
+        self._size: Dict[tuple, int] = {}
+        self.nbytes = 0
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, df, name: str, params: tuple, compute: Callable[[], Any]) -> Any:
+        memo_key = df.attrs.get("memo_key")
+        if memo_key is None or len(df) == 0:
+            return compute()
+        key = (memo_key, len(df), df.index[0], df.index[-1], name, params)
+        try:
+            out = self._data[key]
+        except KeyError:
+            self.misses += 1
+            out = self._data[key] = compute()
+            self._size[key] = _nbytes(out)
+            self.nbytes += self._size[key]
+            # giriş sayısı ve bayt bütçesi; en yeni girdi her zaman kalır
+            while len(self._data) > 1 and (len(self._data) > self.maxsize
+                                           or self.nbytes > self.max_bytes):
+                self._evict(next(iter(self._data)))
+        else:
+            self.hits += 1
+            self._data.move_to_end(key)
+        return out
+
+    def _evict(self, key: tuple) -> None:
+        del self._data[key]
+        self.nbytes -= self._size.pop(key)
+
+    def discard(self, memo_key: str) -> None:
+        """Serbest bırakılan bloğun (SharedFrame.close) tüm girdilerini siler."""
+        for key in [k for k in self._data if k[0] == memo_key]:
+            self._evict(key)
+
+    def clear(self) -> None:
+        self._data.clear()
+        self._size.clear()
+        self.nbytes = 0
+
+    def stats(self) -> dict:
+        total = self.hits + self.misses
+        return {"hits": self.hits, "misses": self.misses, "entries": len(self._data),
+                "bytes": self.nbytes,
+                "hit_rate": self.hits / total if total else 0.0}
+
+
+def _nbytes(out) -> int:
+    """Sonucun dizilerinin toplam boyutu (tuple dönen talib çıktıları dahil)."""
+    return sum(getattr(a, "nbytes", 0) for a in (out if isinstance(out, tuple) else (out,)))
+
+
+FRAME_MEMO = FrameMemo()
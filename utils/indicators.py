@@ -0,0 +1,338 @@
+# utils/indicators.py
+"""
+Artımlı (streaming) gösterge katmanı.
+
+Her gösterge (symbol, timeframe, isim, parametreler) başına bir durum
+nesnesidir; BarStore kapanan bar eklediğinde O(1) ilerler. İlk istekte
+BarStore’daki geçmişle bir kez tohumlanır. Hesaplar TA‑Lib’in
+(varsayılan uyumluluk modu) işlem sırasını izler; aynı girdide talib ile
+aynı değerleri üretir.
+
+    eng = IndicatorEngine.attach(bar_store)
+    rsi = eng.get("BTCUSDT", "1h", "RSI", period=14)
+    rsi.value          # son değer
+    rsi.tail(5)        # son 5 değer (eski → yeni)
+"""
+from __future__ import annotations
+
+import math
+import weakref
+from collections import deque
+from typing import Dict, Tuple
+
+from utils.kernels import supertrend_bands, supertrend_step
+
+NAN = float("nan")
+
+
+class Indicator:
+    """Ortak taban: son değerleri kısa bir tamponda tutar."""
+
+    def __init__(self, keep: int = 16):
+        self.n = 0                           # görülen bar sayısı
+        self.values: deque = deque(maxlen=keep)
+
+    @property
+    def value(self):
+        return self.values[-1] if self.values else NAN
+
+    def tail(self, k: int) -> list:
+        """Son k değer (eski → yeni); yeterli değer yoksa baş NaN doldurulur."""
+        vals = list(self.values)[-k:]
+        return [NAN] * (k - len(vals)) + vals
+
+    def seed(self, o, h, l, c, v) -> None:
+        for row in zip(o.tolist(), h.tolist(), l.tolist(), c.tolist(), v.tolist()):
+            self.update(*row)
+
+    def update(self, o: float, h: float, l: float, c: float, v: float):
+        out = self._step(o, h, l, c, v)
+        self.n += 1
+        self.values.append(out)
+        return out
+
+    def _step(self, o, h, l, c, v):
+        raise NotImplementedError
+
+
+def _true_range(h, l, yc):
+    out = h - l
+    t = abs(h - yc)
+    if t > out:
+        out = t
+    t = abs(l - yc)
+    if t > out:
+        out = t
+    return out
+
+
+class RSI(Indicator):
+    def __init__(self, period: int = 14, **kw):
+        super().__init__(**kw)
+        self.p = int(period)
+        self.prev = NAN
+        self.gain = self.loss = 0.0
+
+    def _step(self, o, h, l, c, v):
+        p = self.p
+        if self.n == 0:
+            self.prev = c
+            return NAN
+        diff, self.prev = c - self.prev, c
+        if self.n <= p:                       # ilk ‘period’ fark: toplam
+            if diff < 0:
+                self.loss -= diff
+            else:
+                self.gain += diff
+            if self.n < p:
+                return NAN
+            self.loss /= p
+            self.gain /= p
+        else:                                 # Wilder yumuşatma
+            self.loss *= (p - 1)
+            self.gain *= (p - 1)
+            if diff < 0:
+                self.loss -= diff
+            else:
+                self.gain += diff
+            self.loss /= p
+            self.gain /= p
+        tot = self.gain + self.loss
+        return 100.0 * (self.gain / tot) if tot != 0 else 0.0
+
+
+class EMA(Indicator):
+    def __init__(self, period: int = 20, **kw):
+        super().__init__(**kw)
+        self.p = int(period)
+        self.k = 2.0 / (self.p + 1)
+        self.acc = 0.0
+
+    def _step(self, o, h, l, c, v):
+        if self.n < self.p:                   # tohum: ilk ‘period’ SMA
+            self.acc += c
+            if self.n < self.p - 1:
+                return NAN
+            self.acc /= self.p
+        else:
+            self.acc = ((c - self.acc) * self.k) + self.acc
+        return self.acc
+
+
+class SMA(Indicator):
+    """Basit hareketli ortalama; src = "close" | "volume"."""
+
+    def __init__(self, period: int = 20, src: str = "close", **kw):
+        super().__init__(**kw)
+        self.p = int(period)
+        self.src = src
+        self.win: deque = deque(maxlen=self.p)
+        self.total = 0.0
+
+    def _push(self, x):
+        self.win.append(x)
+        self.total += x
+        if len(self.win) < self.p:
+            return NAN
+        out = self.total / self.p
+        self.total -= self.win[0]             # bir sonraki adımda pencereden düşer
+        return out
+
+    def _step(self, o, h, l, c, v):
+        return self._push(v if self.src == "volume" else c)
+
+
+class ATR(Indicator):
+    def __init__(self, period: int = 14, **kw):
+        super().__init__(**kw)
+        self.p = int(period)
+        self.prev_c = NAN
+        self.atr = 0.0
+
+    def _step(self, o, h, l, c, v):
+        if self.n == 0:
+            self.prev_c = c
+            return NAN
+        tr = _true_range(h, l, self.prev_c)
+        self.prev_c = c
+        p = self.p
+        if self.n <= p:
+            self.atr += tr
+            if self.n < p:
+                return NAN
+            self.atr /= p
+        else:
+            self.atr *= (p - 1)
+            self.atr += tr
+            self.atr /= p
+        return self.atr
+
+
+class BBANDS(Indicator):
+    """(upper, middle, lower) – SMA ± nbdev × popülasyon std."""
+
+    def __init__(self, period: int = 20, nbdevup: float = 2.0,
+                 nbdevdn: float = 2.0, **kw):
+        super().__init__(**kw)
+        self.p = int(period)
+        self.up, self.dn = float(nbdevup), float(nbdevdn)
+        self.ma = SMA(self.p)
+        self.win: deque = deque(maxlen=self.p)
+        self.sq = 0.0
+
+    @property
+    def value(self):
+        return self.values[-1] if self.values else (NAN, NAN, NAN)
+
+    def tail(self, k: int) -> list:
+        vals = list(self.values)[-k:]
+        return [(NAN, NAN, NAN)] * (k - len(vals)) + vals
+
+    def _step(self, o, h, l, c, v):
+        mid = self.ma._push(c)
+        self.win.append(c)
+        self.sq += c * c
+        if len(self.win) < self.p:
+            return (NAN, NAN, NAN)
+        var = self.sq / self.p
+        old = self.win[0]
+        self.sq -= old * old
+        var -= mid * mid
+        dev = math.sqrt(var) if var > 0 else 0.0
+        return (mid + dev * self.up, mid, mid - dev * self.dn)
+
+
+class MOM(Indicator):
+    def __init__(self, period: int = 10, **kw):
+        super().__init__(**kw)
+        self.p = int(period)
+        self.win: deque = deque(maxlen=self.p + 1)
+
+    def _step(self, o, h, l, c, v):
+        self.win.append(c)
+        if len(self.win) <= self.p:
+            return NAN
+        return c - self.win[0]
+
+
+class ADX(Indicator):
+    def __init__(self, period: int = 14, **kw):
+        super().__init__(**kw)
+        self.p = int(period)
+        self.ph = self.pl = self.pc = NAN
+        self.pdm = self.mdm = self.tr = 0.0
+        self.sum_dx = 0.0
+        self.adx = NAN
+
+    def _dm(self, h, l):
+        dp, dm = h - self.ph, self.pl - l
+        self.ph, self.pl = h, l
+        plus = minus = 0.0
+        if dm > 0 and dp < dm:
+            minus = dm
+        elif dp > 0 and dp > dm:
+            plus = dp
+        return plus, minus
+
+    def _dx(self):
+        if self.tr == 0:
+            return None
+        mdi = 100.0 * (self.mdm / self.tr)
+        pdi = 100.0 * (self.pdm / self.tr)
+        s = mdi + pdi
+        if s == 0:
+            return None
+        return 100.0 * (abs(mdi - pdi) / s)
+
+    def _step(self, o, h, l, c, v):
+        p, n = self.p, self.n
+        if n == 0:
+            self.ph, self.pl, self.pc = h, l, c
+            return NAN
+        plus, minus = self._dm(h, l)
+        tr = _true_range(h, l, self.pc)
+        self.pc = c
+        if n < p:                                     # 1) DM/TR toplamı
+            self.mdm += minus
+            self.pdm += plus
+            self.tr += tr
+            return NAN
+        self.mdm = self.mdm - self.mdm / p + minus    # Wilder toplamı
+        self.pdm = self.pdm - self.pdm / p + plus
+        self.tr = self.tr - (self.tr / p) + tr
+        dx = self._dx()
+        if n < 2 * p:                                 # 2) ilk ADX = DX ortalaması
+            if dx is not None:
+                self.sum_dx += dx
+            if n < 2 * p - 1:
+                return NAN
+            self.adx = self.sum_dx / p
+            return self.adx
+        if dx is not None:                            # 3) Wilder ADX
+            self.adx = ((self.adx * (p - 1)) + dx) / p
+        return self.adx
+
+
+class SUPERTREND(Indicator):
+    """Supertrend çizgisi; son bant durumunu taşır, bar başına O(1)."""
+
+    def __init__(self, period: int = 10, multiplier: float = 2.0, **kw):
+        super().__init__(**kw)
+        self.mult = float(multiplier)
+        self.atr = ATR(period, keep=1)
+        self.prev_c = NAN
+
+    def _step(self, o, h, l, c, v):
+        upper, lower = supertrend_bands(h, l, self.atr.update(o, h, l, c, v), self.mult)
+        st = upper if self.n == 0 else supertrend_step(self.value, self.prev_c, upper, lower)
+        self.prev_c = c
+        return st
+
+
+INDICATORS: Dict[str, type] = {
+    "RSI": RSI, "EMA": EMA, "SMA": SMA, "ATR": ATR,
+    "BBANDS": BBANDS, "MOM": MOM, "ADX": ADX, "SUPERTREND": SUPERTREND,
+}
+
+
+class IndicatorEngine:
+    """
+    BarStore’a bağlı artımlı gösterge kayıt defteri.
+    Aynı (symbol, tf, isim, parametre) için tek durum tutulur; stratejiler
+    aynı göstergeyi paylaşır. BarStore.add_bar her kapanışta engine’i
+    besler.
+    """
+    _engines: "weakref.WeakKeyDictionary" = weakref.WeakKeyDictionary()
+
+    def __init__(self, bar_store):
+        self.bar_store = bar_store
+        # _ind[(symbol, tf)][(isim, parametreler)] = Indicator
+        self._ind: Dict[Tuple[str, str], Dict[tuple, Indicator]] = {}
+        bar_store.add_listener(self._on_bar)
+
+    @classmethod
+    def attach(cls, bar_store) -> "IndicatorEngine":
+        """BarStore başına tek engine döndürür (yoksa yaratır)."""
+        eng = cls._engines.get(bar_store)
+        if eng is None:
+            eng = cls._engines[bar_store] = cls(bar_store)
+        return eng
+
+    def get(self, symbol: str, tf: str, name: str, keep: int = 16,
+            **params) -> Indicator:
+        key  = (name, tuple(sorted(params.items())))
+        inds = self._ind.setdefault((symbol, tf), {})
+        ind  = inds.get(key)
+        if ind is None or ind.values.maxlen < keep:
+            ind = INDICATORS[name](keep=keep, **params)
+            buf = self.bar_store.get_ohlcv(symbol, tf)
+            ind.seed(buf["open"], buf["high"], buf["low"],
+                     buf["close"], buf["volume"])
+            inds[key] = ind
+        return ind
+
+    def _on_bar(self, symbol: str, tf: str, row: tuple) -> None:
+        inds = self._ind.get((symbol, tf))
+        if inds:
+            for ind in inds.values():
+                ind.update(*row)
@@ -1,16 +1,66 @@
 # utils/io.py  (yeni dosya)
+import json
+import os
 from pathlib import Path
+
+import numpy as np
 import pandas as pd
 
-def load_ohlcv_csv(path: Path) -> pd.DataFrame:
-    """
-    Binance spot/futures veya kendi arşiv CSV’lerini içeri alır.
-    - Zaman kolonu olarak: timestamp | open_time | date | time ... ilk eşleşeni kullanır
-    - Metin ISO-8601 ise doğrudan parse edilir
-    - Sayısal (ms) ise unit="ms" ile dönüştürülür
-    - Gereksiz kolonları atar, sütun adlarını lowercase yapar
-    Dönen DF => datetime index + ['open','high','low','close','volume']
-    """
+KEEP = ["open", "high", "low", "close", "volume"]
+CACHE_VERSION = 1
+
+
+def _cache_dir(path: Path) -> Path:
+    """BTCUSDT_1m.csv → BTCUSDT_1m.csv.npcache/ (kaynağın yanında)."""
+    return path.with_name(path.name + ".npcache")
+
+
+def _source_key(path: Path) -> dict:
+    st = path.stat()
+    return {"version": CACHE_VERSION, "mtime_ns": st.st_mtime_ns, "size": st.st_size}
+
+
+def _read_cache(path: Path):
+    """Geçerli önbellek varsa kopyasız DataFrame, yoksa None."""
+    d = _cache_dir(path)
+    try:
+        meta = json.loads((d / "meta.json").read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return None
+    if {k: meta.get(k) for k in ("version", "mtime_ns", "size")} != _source_key(path):
+        return None
+    # mmap_mode="c": sayfalar süreçler arasında paylaşılır; yazan süreç
+    # yalnız kendi özel kopyasını değiştirir (dosya bozulmaz)
+    t = np.load(d / "index.npy", mmap_mode="c")
+    index = pd.DatetimeIndex(t.view(meta["index_dtype"]), name=meta["index_name"])
+    if meta.get("tz"):
+        index = index.tz_localize("UTC").tz_convert(meta["tz"])
+    cols = {k: np.load(d / f"{k}.npy", mmap_mode="c") for k in KEEP}
+    return pd.DataFrame(cols, index=index, copy=False)
+
+
+def _write_cache(path: Path, df: pd.DataFrame, key: dict) -> None:
+    """Kolonlar önce, meta.json en son (os.replace) – yarım önbellek geçersiz kalır."""
+    d = _cache_dir(path)
+    d.mkdir(exist_ok=True)
+    index = df.index
+    tz = str(index.tz) if index.tz is not None else None
+    if tz:
+        index = index.tz_convert("UTC").tz_localize(None)
+    arrays = {"index": index.to_numpy().view(np.int64),
+              **{k: df[k].to_numpy(dtype=np.float64) for k in KEEP}}
+    pid = os.getpid()
+    for name, arr in arrays.items():
+        tmp = d / f"{name}.{pid}.tmp.npy"
+        np.save(tmp, np.ascontiguousarray(arr))
+        os.replace(tmp, d / f"{name}.npy")
+    meta = {**key, "index_dtype": str(index.dtype), "index_name": index.name, "tz": tz}
+    tmp = d / f"meta.{pid}.tmp"
+    tmp.write_text(json.dumps(meta), encoding="utf-8")
+    os.replace(tmp, d / "meta.json")
+
+
+def _parse_csv(path: Path) -> pd.DataFrame:
     df = pd.read_csv(path)
     cols_lower = {c.lower(): c for c in df.columns}
 
@@ -31,9 +81,38 @@ def load_ohlcv_csv(path: Path) -> pd.DataFrame:
     rename_map = {c: c.lower() for c in df.columns}
     df = df.rename(columns=rename_map)
 
-    keep = ["open", "high", "low", "close", "volume"]
-    missing = [k for k in keep if k not in df.columns]
+    missing = [k for k in KEEP if k not in df.columns]
     if missing:
         raise ValueError(f"CSV eksik kolon(lar): {missing}")
 
-    return df[keep].astype(float)
+    return df[KEEP].astype(float)
+
+
+def load_ohlcv_csv(path: Path, cache: bool = True) -> pd.DataFrame:
+    """
+    Binance spot/futures veya kendi arşiv CSV’lerini içeri alır.
+    - Zaman kolonu olarak: timestamp | open_time | date | time ... ilk eşleşeni kullanır
+    - Metin ISO-8601 ise doğrudan parse edilir
+    - Sayısal (ms) ise unit="ms" ile dönüştürülür
+    - Gereksiz kolonları atar, sütun adlarını lowercase yapar
+    Dönen DF => datetime index + ['open','high','low','close','volume']
+
+    cache=True: ilk yüklemede yanına .npy kolon önbelleği yazılır (kaynağın
+    mtime + boyutuyla anahtarlanır); sonraki yüklemeler ayrıştırma yapmadan
+    bellek eşlemli kolonlardan kopyasız DataFrame kurar. Aynı dosyayı açan
+    worker’lar sayfaları paylaşır. Önbellek yazılamazsa (salt‑okunur dizin)
+    sessizce ayrıştırılmış sonuç döner.
+    """
+    path = Path(path)
+    if not cache:
+        return _parse_csv(path)
+    df = _read_cache(path)
+    if df is not None:
+        return df
+    key = _source_key(path)
+    df = _parse_csv(path)
+    try:
+        _write_cache(path, df, key)
+    except OSError:
+        pass
+    return df
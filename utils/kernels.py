@@ -0,0 +1,130 @@
+# utils/kernels.py
+"""
+Sıcak döngüler için derlenmiş çekirdekler.
+
+numba kuruluysa fonksiyonlar njit ile derlenir; değilse aynı kod saf
+Python olarak çalışır (dizi yerine liste üzerinde, NumPy skaler
+erişim maliyetinden kaçınmak için).
+"""
+from __future__ import annotations
+
+import numpy as np
+
+try:
+    from numba import njit
+    HAVE_NUMBA = True
+except ImportError:         # numba opsiyonel
+    HAVE_NUMBA = False
+
+    def njit(*args, **kw):
+        if args and callable(args[0]):
+            return args[0]
+        return lambda f: f
+
+
+# ─────────────────────────── Supertrend ────────────────────────────
+@njit(cache=True)
+def supertrend_step(prev_st, prev_c, upper, lower):
+    """
+    Tek bar bant güncellemesi. Python’un min/max davranışı (NaN dahil)
+    birebir korunur: min(a, b) → b < a ise b, max(a, b) → b > a ise b.
+    """
+    if prev_c <= prev_st:
+        return prev_st if prev_st < upper else upper
+    return prev_st if prev_st > lower else lower
+
+
+@njit(cache=True)
+def _supertrend_loop(upper, lower, c, out):
+    out[0] = upper[0]
+    for i in range(1, len(c)):
+        out[i] = supertrend_step(out[i - 1], c[i - 1], upper[i], lower[i])
+    return out
+
+
+def supertrend(h, l, c, atr, multiplier):
+    """
+    Tüm seri için supertrend çizgisi (canlı ve back‑test ortak çekirdeği).
+    h, l, c, atr: eşit uzunlukta float dizileri.
+    """
+    h, l, c, atr = (np.asarray(a, dtype=np.float64) for a in (h, l, c, atr))
+    upper = (h + l) / 2 + (multiplier * atr)
+    lower = (h + l) / 2 - (multiplier * atr)
+    if len(c) == 0:
+        return np.empty(0)
+    if HAVE_NUMBA:
+        return _supertrend_loop(upper, lower, c, np.empty_like(c))
+    out = _supertrend_loop(upper.tolist(), lower.tolist(), c.tolist(), [0.0] * len(c))
+    return np.asarray(out)
+
+
+def supertrend_bands(h, l, atr, multiplier):
+    """Tek bar için (upper, lower) – supertrend() ile aynı işlem sırası."""
+    hl2 = (h + l) / 2
+    return hl2 + (multiplier * atr), hl2 - (multiplier * atr)
+
+
+# ─────────────────── Kesitsel (sembol × bar) matrisler ─────────────────
+# Satır = sembol, sütun = bar. Zaman ekseninde döngü, semboller üzerinde
+# vektör işlem; her satır talib’in tek seri sonucuyla aynı işlem sırasını
+# izler.
+def rsi_matrix(c, period: int) -> np.ndarray:
+    c = np.asarray(c, dtype=np.float64)
+    out = np.full(c.shape, np.nan)
+    p = int(period)
+    if c.shape[1] <= p:
+        return out
+    d = np.diff(c, axis=1)
+    gain = np.where(d > 0, d, 0.0)
+    loss = np.where(d < 0, -d, 0.0)
+    g = np.zeros(c.shape[0])
+    ls = np.zeros(c.shape[0])
+    for k in range(p):
+        g = g + gain[:, k]
+        ls = ls + loss[:, k]
+    g, ls = g / p, ls / p
+    for t in range(p, c.shape[1]):
+        if t > p:
+            g = (g * (p - 1) + gain[:, t - 1]) / p
+            ls = (ls * (p - 1) + loss[:, t - 1]) / p
+        tot = g + ls
+        with np.errstate(invalid="ignore", divide="ignore"):
+            out[:, t] = np.where(tot != 0, 100.0 * (g / tot), 0.0)
+    return out
+
+
+def atr_matrix(h, l, c, period: int) -> np.ndarray:
+    h, l, c = (np.asarray(a, dtype=np.float64) for a in (h, l, c))
+    out = np.full(c.shape, np.nan)
+    p = int(period)
+    if c.shape[1] <= p:
+        return out
+    yc = c[:, :-1]
+    tr = np.maximum(np.maximum(h[:, 1:] - l[:, 1:], np.abs(h[:, 1:] - yc)),
+                    np.abs(l[:, 1:] - yc))
+    atr = np.zeros(c.shape[0])
+    for k in range(p):
+        atr = atr + tr[:, k]
+    atr = atr / p
+    out[:, p] = atr
+    for t in range(p + 1, c.shape[1]):
+        atr = (atr * (p - 1) + tr[:, t - 1]) / p
+        out[:, t] = atr
+    return out
+
+
+def supertrend_matrix(h, l, c, atr, multiplier) -> np.ndarray:
+    """supertrend()’in satır bazlı karşılığı (NaN davranışı dahil)."""
+    h, l, c, atr = (np.asarray(a, dtype=np.float64) for a in (h, l, c, atr))
+    upper = (h + l) / 2 + (multiplier * atr)
+    lower = (h + l) / 2 - (multiplier * atr)
+    out = np.empty_like(c)
+    if c.shape[1] == 0:
+        return out
+    out[:, 0] = upper[:, 0]
+    for i in range(1, c.shape[1]):
+        prev = out[:, i - 1]
+        out[:, i] = np.where(c[:, i - 1] <= prev,
+                             np.where(prev < upper[:, i], prev, upper[:, i]),
+                             np.where(prev > lower[:, i], prev, lower[:, i]))
+    return out
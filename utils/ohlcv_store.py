@@ -0,0 +1,217 @@
+# utils/ohlcv_store.py
+"""
+Yerel, sütunsal OHLCV deposu (back‑test ve canlı ısınma için).
+
+Düzen – sembol / timeframe / ay bölümleri, her sütun ayrı bir .npy:
+
+    root/BTCUSDT/1m/2024-01/{t,open,high,low,close,volume}.npy
+
+``t`` barın açılış zamanıdır (ms, int64, UTC); bölüm içinde artan ve
+tekrarsızdır. Okumalar ``np.load(mmap_mode="r")`` ile bellek eşlemlidir:
+tek bölümlük bir aralık kopyasız DataFrame olarak döner, zaman aralığı
+sorgusu önce ay adlarıyla bölüm eler (predicate pushdown), sonra bölüm
+içinde ikili aramayla keser.
+
+    store = OHLCVStore("data/store")
+    store.append("BTCUSDT", "1m", df)                      # datetime index + OHLCV
+    df = store.read("BTCUSDT", "1m", start="2024-03-01", end="2024-06-01")
+
+Bölüm yazımı atomiktir: yeni bölüm geçici dizine yazılır, sonra yerine
+taşınır; yarıda kalan bir yazım eski bölümü bozmaz.
+"""
+from __future__ import annotations
+
+import os
+import shutil
+from pathlib import Path
+from typing import Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+
+from utils.bar_store import FIELDS
+
+__all__ = ["OHLCVStore", "COLUMNS", "dedup", "to_ms"]
+
+COLUMNS = ("t",) + FIELDS
+
+
+def to_ms(x) -> Optional[int]:
+    """ms int | datetime benzeri → ms (tz’siz değerler UTC kabul edilir)."""
+    if x is None:
+        return None
+    if isinstance(x, (int, np.integer)):
+        return int(x)
+    ts = pd.Timestamp(x)
+    if ts.tzinfo is not None:
+        ts = ts.tz_convert("UTC").tz_localize(None)
+    return ts.value // 1_000_000                     # Timestamp.value: ns
+
+
+def _month(ms: int) -> str:
+    return str(np.datetime64(int(ms), "ms").astype("datetime64[M]"))
+
+
+def _columns(data) -> Dict[str, np.ndarray]:
+    """DataFrame (datetime index) veya {"t", OHLCV} sözlüğü → sıralı, tekrarsız diziler."""
+    if isinstance(data, pd.DataFrame):
+        t = data.index.to_numpy(dtype="datetime64[ms]").view(np.int64)
+        cols = {"t": t, **{f: data[f].to_numpy(dtype=np.float64) for f in FIELDS}}
+    else:
+        cols = {"t": np.asarray(data["t"], dtype=np.int64),
+                **{f: np.asarray(data[f], dtype=np.float64) for f in FIELDS}}
+    return dedup(cols)
+
+
+def _empty() -> Dict[str, np.ndarray]:
+    return {"t": np.empty(0, np.int64), **{f: np.empty(0) for f in FIELDS}}
+
+
+def dedup(cols: Dict[str, np.ndarray]) -> Dict[str, np.ndarray]:
+    """Zamana göre sıralar; aynı zaman damgasından sonuncusu kalır."""
+    t = cols["t"]
+    if len(t) and not (np.all(t[1:] > t[:-1])):
+        order = np.argsort(t, kind="stable")
+        t = t[order]
+        last = np.r_[t[1:] != t[:-1], True]          # eşitlerin sonuncusu
+        keep = order[last]
+        cols = {k: v[keep] for k, v in cols.items()}
+    return cols
+
+
+class OHLCVStore:
+    def __init__(self, root):
+        self.root = Path(root)
+
+    # ------------- keşif -------------
+    def _dir(self, symbol: str, tf: str) -> Path:
+        return self.root / symbol / tf
+
+    def partitions(self, symbol: str, tf: str) -> List[str]:
+        """Ay bölümleri ("YYYY-MM"), kronolojik."""
+        d = self._dir(symbol, tf)
+        if not d.is_dir():
+            return []
+        for old in d.glob("????-??.old"):            # yer değiştirirken çökme
+            part = old.with_suffix("")
+            if not part.exists():
+                os.replace(old, part)
+        return sorted(p.name for p in d.iterdir()
+                      if p.is_dir() and len(p.name) == 7 and p.name[4] == "-")
+
+    def symbols(self, tf: str) -> List[str]:
+        if not self.root.is_dir():
+            return []
+        return sorted(p.name for p in self.root.iterdir()
+                      if p.is_dir() and self.partitions(p.name, tf))
+
+    def has(self, symbol: str, tf: str) -> bool:
+        return bool(self.partitions(symbol, tf))
+
+    # ------------- yazma -------------
+    def _load(self, path: Path, mmap: bool = True) -> Dict[str, np.ndarray]:
+        mode = "r" if mmap else None
+        return {c: np.load(path / f"{c}.npy", mmap_mode=mode) for c in COLUMNS}
+
+    def _write(self, path: Path, cols: Dict[str, np.ndarray]) -> None:
+        tmp = path.with_name(f"{path.name}.tmp{os.getpid()}")
+        shutil.rmtree(tmp, ignore_errors=True)
+        tmp.mkdir(parents=True)
+        for c in COLUMNS:
+            np.save(tmp / f"{c}.npy", np.ascontiguousarray(cols[c]))
+        if path.exists():
+            old = path.with_name(path.name + ".old")
+            shutil.rmtree(old, ignore_errors=True)
+            os.replace(path, old)
+            os.replace(tmp, path)
+            shutil.rmtree(old, ignore_errors=True)
+        else:
+            os.replace(tmp, path)
+
+    def append(self, symbol: str, tf: str, data) -> int:
+        """
+        Barları ekler; mevcut barlarla çakışanlarda yeni değer kazanır.
+        Eklenen (yeni zaman damgalı) bar sayısını döner.
+        """
+        cols = _columns(data)
+        t = cols["t"]
+        if len(t) == 0:
+            return 0
+        months = t.astype("datetime64[ms]").astype("datetime64[M]")
+        cuts = np.flatnonzero(months[1:] != months[:-1]) + 1
+        added = 0
+        d = self._dir(symbol, tf)
+        for lo, hi in zip(np.r_[0, cuts], np.r_[cuts, len(t)]):
+            part = {k: v[lo:hi] for k, v in cols.items()}
+            path = d / str(months[lo])
+            if path.exists():
+                old = self._load(path, mmap=False)
+                n_old = len(old["t"])
+                if part["t"][0] > old["t"][-1]:      # saf ekleme (olağan yol)
+                    part = {k: np.concatenate([old[k], part[k]]) for k in COLUMNS}
+                else:
+                    part = dedup({k: np.concatenate([old[k], part[k]]) for k in COLUMNS})
+                added += len(part["t"]) - n_old
+            else:
+                added += hi - lo
+            self._write(path, part)
+        return added
+
+    # ------------- okuma -------------
+    def read_arrays(self, symbol: str, tf: str, start=None, end=None) -> Dict[str, np.ndarray]:
+        """
+        [start, end) aralığındaki sütunlar. Tek bölüme düşen aralıkta
+        salt‑okunur mmap görünümleri, aksi hâlde birleştirilmiş kopya.
+        """
+        lo, hi = to_ms(start), to_ms(end)
+        parts = self.partitions(symbol, tf)
+        if lo is not None:
+            parts = [p for p in parts if p >= _month(lo)]
+        if hi is not None:
+            parts = [p for p in parts if p <= _month(hi - 1)]
+        d = self._dir(symbol, tf)
+        chunks = []
+        for p in parts:
+            cols = self._load(d / p)
+            t = cols["t"]
+            a = 0 if lo is None else int(np.searchsorted(t, lo, "left"))
+            b = len(t) if hi is None else int(np.searchsorted(t, hi, "left"))
+            if b > a:
+                chunks.append({k: v[a:b] for k, v in cols.items()})
+        if not chunks:
+            return _empty()
+        if len(chunks) == 1:
+            return chunks[0]
+        return {k: np.concatenate([c[k] for c in chunks]) for k in COLUMNS}
+
+    def read(self, symbol: str, tf: str, start=None, end=None) -> pd.DataFrame:
+        """load_ohlcv_csv ile aynı biçim: datetime index + OHLCV (float64)."""
+        cols = self.read_arrays(symbol, tf, start, end)
+        index = pd.DatetimeIndex(np.asarray(cols["t"]).view("datetime64[ms]"), name="timestamp")
+        return pd.DataFrame({f: cols[f] for f in FIELDS}, index=index, copy=False)
+
+    def tail(self, symbol: str, tf: str, n: int) -> Dict[str, np.ndarray]:
+        """Son n bar (canlı ısınma); yalnız gereken son bölümler okunur."""
+        if n <= 0:
+            return _empty()
+        d = self._dir(symbol, tf)
+        chunks, have = [], 0
+        for p in reversed(self.partitions(symbol, tf)):
+            if have >= n:
+                break
+            cols = self._load(d / p)
+            chunks.append(cols)
+            have += len(cols["t"])
+        if not chunks:
+            return _empty()
+        if len(chunks) == 1:
+            return {k: v[-n:] for k, v in chunks[0].items()}
+        return {k: np.concatenate([c[k] for c in reversed(chunks)])[-n:] for k in COLUMNS}
+
+    def last_ts(self, symbol: str, tf: str) -> Optional[int]:
+        """Son barın açılış zamanı (ms); veri yoksa None."""
+        parts = self.partitions(symbol, tf)
+        if not parts:
+            return None
+        t = np.load(self._dir(symbol, tf) / parts[-1] / "t.npy", mmap_mode="r")
+        return int(t[-1]) if len(t) else None
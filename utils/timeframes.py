@@ -0,0 +1,6 @@
+# utils/timeframes.py
+"""Timeframe etiketi → saniye (canlı akış ve back‑test ortak tablosu)."""
+
+TF_SEC = {"1m":60, "5m":300, "15m":900, "30m":1800,
+          "1h":3600, "2h":7200, "4h":14400,
+          "6h":21600, "8h":28800, "12h":43200}